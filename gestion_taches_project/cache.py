@@ -0,0 +1,34 @@
+# gestion_taches_project/cache.py
+from django.core.cache.backends.locmem import LocMemCache
+
+from .metriques import lectures_cache
+
+_ABSENT = object()
+
+
+class CacheInstrumente(LocMemCache):
+    """LocMemCache qui compte ses succès et ses échecs (taux de réussite des fragments)."""
+
+    def __init__(self, name, params):
+        super().__init__(name, params)
+        self.nom = name
+        self.succes = 0
+        self.echecs = 0
+
+    def get(self, key, default=None, version=None):
+        valeur = super().get(key, _ABSENT, version)
+        if valeur is _ABSENT:
+            self.echecs += 1
+            lectures_cache.inc(self.nom, 'echec')
+            return default
+        self.succes += 1
+        lectures_cache.inc(self.nom, 'succes')
+        return valeur
+
+    def statistiques(self):
+        total = self.succes + self.echecs
+        return {
+            'succes': self.succes,
+            'echecs': self.echecs,
+            'taux_succes': round(self.succes / total, 4) if total else None,
+        }
@@ -0,0 +1,150 @@
+# gestion_taches_project/compression.py
+import gzip
+import re
+import secrets
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:  # optionnel : gzip seul
+    brotli = None
+
+TYPES_COMPRESSIBLES = (
+    'text/', 'application/json', 'application/javascript', 'application/xml',
+    'application/manifest+json', 'image/svg+xml',
+)
+NIVEAU_GZIP = 6
+QUALITE_BROTLI = 5          # 11 est bien plus lent pour un gain minime sur du HTML dynamique
+OCTETS_ALEATOIRES_MAX = 100  # comme GZipMiddleware : atténue BREACH
+_ENCODAGE = re.compile(r'\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?\s*')
+
+
+def encodages_acceptes(entete):
+    acceptes = set()
+    for element in entete.split(','):
+        match = _ENCODAGE.fullmatch(element)
+        if match is None:
+            continue
+        try:
+            q = float(match.group(2) or 1)
+        except ValueError:
+            continue
+        if q > 0:
+            acceptes.add(match.group(1).lower())
+    return acceptes
+
+
+def choisir_encodage(request, brotli_permis=True):
+    acceptes = encodages_acceptes(request.headers.get('Accept-Encoding', ''))
+    if brotli_permis and brotli is not None and 'br' in acceptes:
+        return 'br'
+    if 'gzip' in acceptes:
+        return 'gzip'
+    return None
+
+
+# === FLUX ===
+def _entete_gzip():
+    # Nom de fichier (FNAME) de longueur aléatoire, comme compress_string(max_random_bytes=...) : atténue BREACH
+    nom = b'a' * secrets.randbelow(OCTETS_ALEATOIRES_MAX) + b'\x00'
+    return b'\x1f\x8b\x08' + bytes([gzip.FNAME]) + b'\x00\x00\x00\x00\x00\xff' + nom
+
+
+def _compresseur(encodage):
+    """(compresser un morceau, terminer) ; chaque morceau est vidé aussitôt pour que le client le reçoive."""
+    if encodage == 'br':
+        compresseur = brotli.Compressor(quality=QUALITE_BROTLI)
+        return (lambda morceau: compresseur.process(morceau) + compresseur.flush()), compresseur.finish
+
+    # gzip écrit à la main (en-tête, deflate brut, CRC et taille) pour y placer le remplissage aléatoire
+    compresseur = zlib.compressobj(NIVEAU_GZIP, zlib.DEFLATED, -zlib.MAX_WBITS)
+    etat = {'crc': 0, 'taille': 0, 'entete': _entete_gzip()}
+
+    def compresser(morceau):
+        etat['crc'] = zlib.crc32(morceau, etat['crc'])
+        etat['taille'] += len(morceau)
+        entete, etat['entete'] = etat['entete'], b''
+        return entete + compresseur.compress(morceau) + compresseur.flush(zlib.Z_SYNC_FLUSH)
+
+    def terminer():
+        fin = etat['crc'].to_bytes(4, 'little') + (etat['taille'] & 0xFFFFFFFF).to_bytes(4, 'little')
+        return etat['entete'] + compresseur.flush() + fin
+
+    return compresser, terminer
+
+
+def compresser_flux(encodage, morceaux):
+    compresser, terminer = _compresseur(encodage)
+    for morceau in morceaux:
+        sortie = compresser(morceau)
+        if sortie:
+            yield sortie
+    yield terminer()
+
+
+async def acompresser_flux(encodage, morceaux):
+    compresser, terminer = _compresseur(encodage)
+    async for morceau in morceaux:
+        sortie = compresser(morceau)
+        if sortie:
+            yield sortie
+    yield terminer()
+
+
+# === MIDDLEWARE ===
+class CompressionMiddleware:
+    """
+    Compresse les réponses en brotli (si le module est installé) ou gzip, selon
+    Accept-Encoding, pour les types texte à partir de COMPRESSION_TAILLE_MIN octets.
+    HTML : gzip seul, avec remplissage aléatoire contre BREACH (brotli n'a pas de champ où le placer).
+    Les réponses en flux sont compressées morceau par morceau, sans attendre la fin.
+    À placer en tête de MIDDLEWARE, avant tout middleware qui lit ou modifie le corps.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.taille_min = settings.COMPRESSION_TAILLE_MIN
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        self.compresser(request, response)
+        return response
+
+    def compresser(self, request, response):
+        if response.has_header('Content-Encoding') or response.has_header('Content-Range'):
+            return
+        type_contenu = response.get('Content-Type', '')
+        if not type_contenu.startswith(TYPES_COMPRESSIBLES):
+            return
+        if not response.streaming and len(response.content) < self.taille_min:
+            return
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        # Le HTML reflète des saisies à côté de jetons (CSRF, session) : longueur à brouiller
+        encodage = choisir_encodage(request, brotli_permis=not type_contenu.startswith('text/html'))
+        if encodage is None:
+            return
+
+        if response.streaming:
+            flux = acompresser_flux if response.is_async else compresser_flux
+            response.streaming_content = flux(encodage, response.streaming_content)
+            del response.headers['Content-Length']
+        else:
+            if encodage == 'br':
+                compresse = brotli.compress(response.content, quality=QUALITE_BROTLI)
+            else:
+                compresse = compress_string(response.content, max_random_bytes=OCTETS_ALEATOIRES_MAX)
+            if len(compresse) >= len(response.content):
+                return
+            response.content = compresse
+            response.headers['Content-Length'] = str(len(compresse))
+
+        # Le corps n'est plus identique octet pour octet : ETag faible (comme GZipMiddleware)
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encodage
@@ -0,0 +1,28 @@
+# gestion_taches_project/hashers.py
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher,
+    PBKDF2PasswordHasher,
+    ScryptPasswordHasher,
+)
+
+# Mêmes noms d'algorithme que Django : les hachages existants restent reconnus,
+# et un changement de coût provoque une mise à jour transparente à la connexion
+# (must_update compare les paramètres stockés dans le hachage).
+
+
+class PBKDF2Configurable(PBKDF2PasswordHasher):
+    iterations = settings.PASSWORD_PBKDF2_ITERATIONS
+
+
+class ScryptConfigurable(ScryptPasswordHasher):
+    work_factor = settings.PASSWORD_SCRYPT_N
+    block_size = settings.PASSWORD_SCRYPT_R
+    parallelism = settings.PASSWORD_SCRYPT_P
+    maxmem = 256 * settings.PASSWORD_SCRYPT_N * settings.PASSWORD_SCRYPT_R  # marge au-delà des 128*N*r requis
+
+
+class Argon2Configurable(Argon2PasswordHasher):
+    time_cost = settings.PASSWORD_ARGON2_TIME_COST
+    memory_cost = settings.PASSWORD_ARGON2_MEMORY_KIB
+    parallelism = settings.PASSWORD_ARGON2_PARALLELISM
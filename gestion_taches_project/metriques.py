@@ -0,0 +1,275 @@
+# gestion_taches_project/metriques.py
+import atexit
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+
+BORNES_DUREE = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BORNES_REQUETES_SQL = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+METHODES = frozenset(('GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'))
+TYPE_CONTENU = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+# === MÉTRIQUES ===
+class _Metrique:
+    """
+    Valeurs réparties par thread : chaque thread n'écrit que dans son propre dict,
+    sans verrou (une incrémentation = un accès thread-local et un accès dict).
+    La lecture additionne les fragments ; ceux des threads terminés sont repliés dans `_base`.
+    """
+
+    def __init__(self, nom, aide, etiquettes=()):
+        self.nom, self.aide, self.etiquettes = nom, aide, tuple(etiquettes)
+        self.reinitialiser()
+
+    def reinitialiser(self):
+        self._local = threading.local()
+        self._fragments = []  # (thread, series)
+        self._base = {}
+        self._verrou = threading.Lock()  # protège la liste des fragments, pas les incrémentations
+
+    def _series(self):
+        try:
+            return self._local.series
+        except AttributeError:
+            series = self._local.series = {}
+            with self._verrou:
+                self._fragments.append((threading.current_thread(), series))
+            return series
+
+    def _ajouter(self, cumul, series):
+        for cle, valeur in series.items():
+            cumul[cle] = self.fusionner(cumul[cle], valeur) if cle in cumul else valeur
+
+    def valeurs(self):
+        with self._verrou:
+            vivants = []
+            for thread, series in self._fragments:
+                if thread.is_alive():
+                    vivants.append((thread, series))
+                else:
+                    self._ajouter(self._base, series)
+            self._fragments = vivants
+            cumul = {cle: self.copier(valeur) for cle, valeur in self._base.items()}
+            for _, series in vivants:
+                self._ajouter(cumul, {cle: self.copier(valeur) for cle, valeur in series.copy().items()})
+        return cumul
+
+    def exporter(self):
+        return [[list(cle), valeur] for cle, valeur in self.valeurs().items()]
+
+
+class Compteur(_Metrique):
+    """Compteur monotone par combinaison d'étiquettes."""
+    type = 'counter'
+
+    def inc(self, *valeurs, n=1):
+        series = self._series()
+        series[valeurs] = series.get(valeurs, 0) + n
+
+    @staticmethod
+    def copier(valeur):
+        return valeur
+
+    @staticmethod
+    def fusionner(a, b):
+        return a + b
+
+    def lignes(self, series):
+        for cle, valeur in series.items():
+            yield f'{self.nom}{_etiquettes(self.etiquettes, cle)} {_nombre(valeur)}'
+
+
+class Histogramme(_Metrique):
+    """Répartition par intervalles (bornes « le » de Prometheus) ; chaque série : comptes par intervalle puis somme."""
+    type = 'histogram'
+
+    def __init__(self, nom, aide, etiquettes=(), bornes=BORNES_DUREE):
+        self.bornes = tuple(sorted(bornes))
+        super().__init__(nom, aide, etiquettes)
+
+    def observer(self, valeur, *valeurs):
+        series = self._series()
+        serie = series.get(valeurs)
+        if serie is None:
+            serie = series[valeurs] = [0] * (len(self.bornes) + 1) + [0]
+        serie[bisect_left(self.bornes, valeur)] += 1  # premier intervalle tel que valeur <= borne ; dernier = +Inf
+        serie[-1] += valeur
+
+    @staticmethod
+    def copier(valeur):
+        return list(valeur)
+
+    @staticmethod
+    def fusionner(a, b):
+        return [x + y for x, y in zip(a, b)]
+
+    def lignes(self, series):
+        for cle, serie in series.items():
+            cumul = 0
+            for borne, compte in zip((*self.bornes, '+Inf'), serie):
+                cumul += compte
+                le = borne if borne == '+Inf' else _nombre(borne)
+                yield f'{self.nom}_bucket{_etiquettes((*self.etiquettes, "le"), (*cle, le))} {cumul}'
+            yield f'{self.nom}_sum{_etiquettes(self.etiquettes, cle)} {_nombre(serie[-1])}'
+            yield f'{self.nom}_count{_etiquettes(self.etiquettes, cle)} {cumul}'
+
+
+def _nombre(valeur):
+    return repr(float(valeur)) if isinstance(valeur, float) else str(valeur)
+
+
+def _echapper(valeur):
+    return str(valeur).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _etiquettes(noms, valeurs):
+    if not noms:
+        return ''
+    return '{' + ','.join(f'{nom}="{_echapper(valeur)}"' for nom, valeur in zip(noms, valeurs)) + '}'
+
+
+# === REGISTRE ===
+class Registre:
+    """
+    Métriques du processus. En mode multiprocessus (METRIQUES_DOSSIER), chaque worker
+    écrit périodiquement ses valeurs dans <dossier>/<pid>.json ; /metrics additionne
+    les fichiers de tous les workers (y compris ceux déjà arrêtés : les compteurs restent
+    monotones). Vider le dossier au déploiement, avant de lancer gunicorn.
+    """
+
+    def __init__(self):
+        self.metriques = {}
+        self._prochaine_ecriture = 0.0
+
+    def compteur(self, nom, aide, etiquettes=()):
+        return self._enregistrer(Compteur(nom, aide, etiquettes))
+
+    def histogramme(self, nom, aide, etiquettes=(), bornes=BORNES_DUREE):
+        return self._enregistrer(Histogramme(nom, aide, etiquettes, bornes))
+
+    def _enregistrer(self, metrique):
+        self.metriques[metrique.nom] = metrique
+        return metrique
+
+    def reinitialiser(self):
+        # Après un fork : le processus enfant repart de zéro (ses valeurs héritées sont celles du parent)
+        for metrique in self.metriques.values():
+            metrique.reinitialiser()
+        self._prochaine_ecriture = 0.0
+
+    # --- Mode multiprocessus ---
+    def dossier(self):
+        dossier = getattr(settings, 'METRIQUES_DOSSIER', '')
+        return Path(dossier) if dossier else None
+
+    def ecrire(self):
+        dossier = self.dossier()
+        if dossier is None:
+            return
+        dossier.mkdir(parents=True, exist_ok=True)
+        fichier = dossier / f'{os.getpid()}.json'
+        temporaire = fichier.with_suffix('.tmp')
+        temporaire.write_text(json.dumps({nom: m.exporter() for nom, m in self.metriques.items()}), encoding='utf-8')
+        os.replace(temporaire, fichier)  # atomique : un lecteur ne voit jamais un fichier à moitié écrit
+
+    def ecrire_si_du(self):
+        maintenant = time.monotonic()
+        if maintenant >= self._prochaine_ecriture:
+            self._prochaine_ecriture = maintenant + settings.METRIQUES_INTERVALLE_S
+            self.ecrire()
+
+    def _lire_tous(self):
+        """{nom: {cle: valeur}} : les valeurs vivantes de ce processus + les fichiers des autres."""
+        totaux = {nom: m.valeurs() for nom, m in self.metriques.items()}
+        exports = []
+        dossier = self.dossier()
+        if dossier is not None and dossier.is_dir():
+            propre = f'{os.getpid()}.json'
+            for fichier in dossier.glob('*.json'):
+                if fichier.name == propre:
+                    continue
+                try:
+                    exports.append(json.loads(fichier.read_text(encoding='utf-8')))
+                except (OSError, ValueError):
+                    continue  # fichier supprimé ou remplacé entre-temps
+        for export in exports:
+            for nom, series in export.items():
+                metrique = self.metriques.get(nom)
+                if metrique is None:
+                    continue
+                metrique._ajouter(totaux[nom], {tuple(cle): valeur for cle, valeur in series})
+        return totaux
+
+    # --- Exposition ---
+    def exposer(self):
+        """Format texte d'exposition Prometheus (version 0.0.4)."""
+        lignes = []
+        for nom, series in self._lire_tous().items():
+            metrique = self.metriques[nom]
+            lignes.append(f'# HELP {nom} {metrique.aide}')
+            lignes.append(f'# TYPE {nom} {metrique.type}')
+            lignes.extend(metrique.lignes(series))
+        return '\n'.join(lignes) + '\n'
+
+
+registre = Registre()
+os.register_at_fork(after_in_child=registre.reinitialiser)
+atexit.register(registre.ecrire)
+
+requetes_http = registre.compteur(
+    'http_requetes_total', "Requêtes HTTP traitées.", ('vue', 'methode', 'statut'))
+duree_requetes = registre.histogramme(
+    'http_requete_duree_secondes', "Durée de traitement des requêtes HTTP.", ('vue',))
+requetes_sql = registre.histogramme(
+    'db_requetes_par_requete', "Requêtes SQL exécutées par requête HTTP.", ('vue',), BORNES_REQUETES_SQL)
+lectures_cache = registre.compteur(
+    'cache_lectures_total', "Lectures dans les caches instrumentés.", ('cache', 'resultat'))
+
+
+# === MIDDLEWARE ===
+class _CompteurSQL:
+    __slots__ = ('nombre',)
+
+    def __init__(self):
+        self.nombre = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.nombre += 1
+        return execute(sql, params, many, context)
+
+
+class MetriquesMiddleware:
+    """
+    Compte requêtes, durée et requêtes SQL par vue (nom d'URL résolu, ex. « liste_taches »).
+    À placer en tête de MIDDLEWARE pour mesurer toute la chaîne.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        compteur = _CompteurSQL()
+        debut = time.perf_counter()
+        with ExitStack() as pile:
+            for alias in settings.DATABASES:
+                pile.enter_context(connections[alias].execute_wrapper(compteur))
+            response = self.get_response(request)
+        duree = time.perf_counter() - debut
+
+        correspondance = request.resolver_match
+        # Nombre d'étiquettes borné : vues connues de urls.py, méthodes standard
+        vue = correspondance.view_name if correspondance is not None else 'non_resolue'
+        methode = request.method if request.method in METHODES else 'autre'
+        requetes_http.inc(vue, methode, str(response.status_code))
+        duree_requetes.observer(duree, vue)
+        requetes_sql.observer(compteur.nombre, vue)
+        registre.ecrire_si_du()
+        return response
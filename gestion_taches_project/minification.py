@@ -0,0 +1,85 @@
+# gestion_taches_project/minification.py
+import re
+
+from django.conf import settings
+from django.template.loaders import app_directories, filesystem
+
+# Laissés tels quels : balises de template, texte préformaté, scripts
+_PROTEGES = re.compile(
+    r'\{%.*?%\}|\{\{.*?\}\}|\{#.*?#\}|<(pre|textarea|script)\b.*?</\1\s*>',
+    re.S | re.I,
+)
+_STYLE = re.compile(r'(<style\b[^>]*>)(.*?)(</style\s*>)', re.S | re.I)
+_COMMENTAIRE_HTML = re.compile(r'<!--(?!\[if).*?-->', re.S)
+# Chaînes CSS (« content: "a ; b" ») laissées telles quelles, commentaires retirés
+_CHAINE_OU_COMMENTAIRE_CSS = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|/\*.*?\*/', re.S)
+_ESPACES = re.compile(r'\s+')
+_ESPACES_CSS = re.compile(r'\s*([{};,])\s*')
+
+
+def _reduire_espaces(texte):
+    # Les sauts de ligne sont conservés : les numéros de ligne des erreurs de template restent justes
+    return _ESPACES.sub(lambda m: '\n' * m.group().count('\n') or ' ', texte)
+
+
+def _compacter_css(css):
+    css = _ESPACES_CSS.sub(lambda m: m.group(1) + '\n' * m.group().count('\n'), css)
+    return _reduire_espaces(css)
+
+
+def _minifier_css(match):
+    ouverture, css, fermeture = match.groups()
+    morceaux = []
+    debut = 0
+    for chaine in _CHAINE_OU_COMMENTAIRE_CSS.finditer(css):
+        morceaux.append(_compacter_css(css[debut:chaine.start()]))
+        morceaux.append(chaine.group(1) or '\n' * chaine.group().count('\n'))
+        debut = chaine.end()
+    morceaux.append(_compacter_css(css[debut:]))
+    return ouverture + ''.join(morceaux).strip(' ') + fermeture
+
+
+def _minifier_texte(texte):
+    texte = _COMMENTAIRE_HTML.sub(lambda m: '\n' * m.group().count('\n'), texte)
+    morceaux = []
+    debut = 0
+    for match in _STYLE.finditer(texte):
+        morceaux.append(_reduire_espaces(texte[debut:match.start()]))
+        morceaux.append(_minifier_css(match))
+        debut = match.end()
+    morceaux.append(_reduire_espaces(texte[debut:]))
+    return ''.join(morceaux)
+
+
+def minifier_html(source):
+    """
+    Réduit l'indentation et les blancs d'un template HTML, retire les commentaires
+    HTML et CSS. Les balises de template, <pre>, <textarea> et <script> sont intactes.
+    """
+    morceaux = []
+    debut = 0
+    for match in _PROTEGES.finditer(source):
+        morceaux.append(_minifier_texte(source[debut:match.start()]))
+        morceaux.append(match.group())
+        debut = match.end()
+    morceaux.append(_minifier_texte(source[debut:]))
+    return ''.join(morceaux)
+
+
+# === CHARGEURS ===
+class _Minification:
+    """Minifie la source avant compilation : sous le chargeur en cache, le coût est payé une fois par processus."""
+
+    def get_contents(self, origin):
+        contenu = super().get_contents(origin)
+        if settings.GABARITS_MINIFIES and str(origin.name).endswith('.html'):
+            return minifier_html(contenu)
+        return contenu
+
+
+class ChargeurFichiers(_Minification, filesystem.Loader):
+    pass
+
+
+class ChargeurApplications(_Minification, app_directories.Loader):
+    pass
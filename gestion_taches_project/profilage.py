@@ -0,0 +1,220 @@
+# gestion_taches_project/profilage.py
+import cProfile
+import io
+import json
+import pstats
+import random
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils import timezone
+
+ENTETE = 'HTTP_X_PROFILAGE'          # en-tête X-Profilage : jeton signé (voir generer_jeton)
+PARAMETRE = 'profiler'               # ?profiler=1 (ou =echantillonnage), réservé au staff
+SEL_JETON = 'profilage'
+DUREE_JETON = 60 * 60
+MODES = ('cprofile', 'echantillonnage')
+NOM_FICHIER = re.compile(r'^[\w.-]+$')
+
+# tracemalloc est global au processus : une seule requête mesure les allocations à la fois
+_verrou_allocations = threading.Lock()
+
+
+# === JETON ===
+def generer_jeton(mode='cprofile'):
+    return signing.TimestampSigner(salt=SEL_JETON).sign(mode)
+
+
+def lire_jeton(jeton):
+    try:
+        mode = signing.TimestampSigner(salt=SEL_JETON).unsign(jeton, max_age=DUREE_JETON)
+    except signing.BadSignature:
+        return None
+    return mode if mode in MODES else None
+
+
+# === ÉCHANTILLONNEUR DE PILE ===
+class Echantillonneur:
+    """Relève la pile du thread de la requête toutes les `intervalle` secondes (coût indépendant du nombre d'appels)."""
+
+    def __init__(self, intervalle=0.001):
+        self.intervalle = intervalle
+        self.propre = Counter()     # fonction en haut de pile
+        self.cumule = Counter()     # fonction présente dans la pile
+        self.echantillons = 0
+        self._arret = threading.Event()
+        self._cible = threading.get_ident()
+        self._thread = threading.Thread(target=self._boucle, daemon=True)
+
+    def _boucle(self):
+        while not self._arret.wait(self.intervalle):
+            frame = sys._current_frames().get(self._cible)
+            vues = set()
+            sommet = True
+            while frame is not None:
+                code = frame.f_code
+                cle = f'{code.co_filename}:{code.co_firstlineno}({code.co_name})'
+                if sommet:
+                    self.propre[cle] += 1
+                    sommet = False
+                vues.add(cle)
+                frame = frame.f_back
+            self.cumule.update(vues)
+            self.echantillons += 1
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._arret.set()
+        self._thread.join()
+
+    def points_chauds(self, n):
+        return [
+            {'fonction': cle, 'propre': self.propre[cle] * self.intervalle, 'cumule': cumule * self.intervalle}
+            for cle, cumule in self.cumule.most_common(n)
+        ]
+
+
+# === MIDDLEWARE ===
+class ProfilageMiddleware:
+    """
+    Profile une requête à la demande (jeton signé en en-tête, ?profiler=1 pour le staff)
+    ou par échantillonnage aléatoire (PROFILAGE_TAUX), et enregistre dans PROFILAGE_DOSSIER
+    le profil et ses N points chauds. À placer après AuthenticationMiddleware.
+    Désactivé (PROFILAGE_ACTIF = False) : retiré de la chaîne au démarrage, aucun coût.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILAGE_ACTIF:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.taux = settings.PROFILAGE_TAUX
+        self.dossier = Path(settings.PROFILAGE_DOSSIER)
+        self.top = settings.PROFILAGE_TOP
+        self.max_fichiers = settings.PROFILAGE_MAX_FICHIERS
+        self.allocations = settings.PROFILAGE_ALLOCATIONS
+
+    def mode_demande(self, request):
+        jeton = request.META.get(ENTETE)
+        if jeton:
+            return lire_jeton(jeton)
+        # Test sur la chaîne brute d'abord : request.GET et request.user ne sont évalués que si besoin
+        if PARAMETRE in request.META.get('QUERY_STRING', '') and PARAMETRE in request.GET:
+            if getattr(request, 'user', None) is not None and request.user.is_staff:
+                mode = request.GET[PARAMETRE]
+                return mode if mode in MODES else 'cprofile'
+        if self.taux and random.random() < self.taux:
+            return 'cprofile'
+        return None
+
+    def __call__(self, request):
+        mode = self.mode_demande(request)
+        if mode is None:
+            return self.get_response(request)
+        return self.profiler(request, mode)
+
+    def profiler(self, request, mode):
+        allocations = self.allocations and not tracemalloc.is_tracing() and _verrou_allocations.acquire(blocking=False)
+        if allocations:
+            tracemalloc.start()
+        debut = time.perf_counter()
+        try:
+            if mode == 'echantillonnage':
+                with Echantillonneur() as echantillonneur:
+                    response = self.get_response(request)
+                profil, points_chauds = None, echantillonneur.points_chauds(self.top)
+            else:
+                profil = cProfile.Profile()
+                response = profil.runcall(self.get_response, request)
+                points_chauds = None
+            duree = time.perf_counter() - debut
+            # Allocations encore vivantes en fin de requête, et pic pendant la requête
+            instantane = tracemalloc.take_snapshot() if allocations else None
+            pic = tracemalloc.get_traced_memory()[1] if allocations else None
+        finally:
+            if allocations:
+                tracemalloc.stop()
+                _verrou_allocations.release()
+
+        self.enregistrer(request, response, mode, duree, profil, points_chauds, instantane, pic)
+        return response
+
+    # === ENREGISTREMENT ===
+    def enregistrer(self, request, response, mode, duree, profil, points_chauds, instantane, pic):
+        self.dossier.mkdir(parents=True, exist_ok=True)
+        chemin = re.sub(r'[^\w-]+', '_', request.path).strip('_')[:60] or 'racine'
+        nom = f"{timezone.now():%Y%m%d-%H%M%S-%f}_{request.method}_{chemin}"
+
+        if profil is not None:
+            profil.dump_stats(self.dossier / f'{nom}.prof')  # lisible par snakeviz / pstats
+            points_chauds = self._points_chauds_cprofile(profil)
+        resume = {
+            'nom': nom,
+            'date': timezone.now().isoformat(),
+            'methode': request.method,
+            'chemin': request.get_full_path(),
+            'statut': response.status_code,
+            'duree': duree,
+            'mode': mode,
+            'points_chauds': points_chauds,
+            'memoire_pic': pic,
+            'allocations': self._allocations(instantane) if instantane else None,
+        }
+        (self.dossier / f'{nom}.json').write_text(json.dumps(resume, indent=1), encoding='utf-8')
+        self._elaguer()
+
+    def _points_chauds_cprofile(self, profil):
+        stats = pstats.Stats(profil, stream=io.StringIO())
+        lignes = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:self.top]
+        return [
+            {
+                'fonction': f'{fichier}:{ligne}({fonction})',
+                'appels': nb_appels,
+                'propre': temps_propre,
+                'cumule': temps_cumule,
+            }
+            for (fichier, ligne, fonction), (_, nb_appels, temps_propre, temps_cumule, _) in lignes
+        ]
+
+    def _allocations(self, instantane):
+        # Sans les allocations du profileur lui-même (échantillonneur, tracemalloc)
+        instantane = instantane.filter_traces([tracemalloc.Filter(False, __file__), tracemalloc.Filter(False, tracemalloc.__file__)])
+        return [
+            {'ligne': str(stat.traceback), 'octets': stat.size, 'blocs': stat.count}
+            for stat in instantane.statistics('lineno')[:self.top]
+        ]
+
+    def _elaguer(self):
+        resumes = sorted(self.dossier.glob('*.json'))
+        for resume in resumes[:max(0, len(resumes) - self.max_fichiers)]:
+            resume.unlink(missing_ok=True)
+            resume.with_suffix('.prof').unlink(missing_ok=True)
+
+
+# === CONSULTATION ===
+def lister_profils(limite=100):
+    dossier = Path(settings.PROFILAGE_DOSSIER)
+    if not dossier.is_dir():
+        return []
+    fichiers = sorted(dossier.glob('*.json'), reverse=True)[:limite]
+    return [json.loads(fichier.read_text(encoding='utf-8')) for fichier in fichiers]
+
+
+def lire_profil(nom):
+    """None si le nom est invalide ou le profil absent (pas de chemin arbitraire)."""
+    if not NOM_FICHIER.match(nom):
+        return None
+    fichier = Path(settings.PROFILAGE_DOSSIER) / f'{nom}.json'
+    if not fichier.is_file():
+        return None
+    return json.loads(fichier.read_text(encoding='utf-8'))
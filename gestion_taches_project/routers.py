@@ -0,0 +1,83 @@
+# gestion_taches_project/routers.py
+import random
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+
+COOKIE_EPINGLE = 'primaire_jusqu_a'
+METHODES_SURES = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+# État de la requête en cours ; None hors requête HTTP (commandes, workers) => tout sur le primaire
+_etat_requete = ContextVar('etat_requete', default=None)
+
+
+class EtatRequete:
+    __slots__ = ('epingle', 'ecrit')
+
+    def __init__(self, epingle):
+        self.epingle = epingle
+        self.ecrit = False
+
+
+def replicas():
+    return [alias for alias in settings.DATABASES if alias.startswith('replica')]
+
+
+# === ROUTEUR ===
+class RouteurReplicas:
+    """
+    Lectures vers un réplica tiré au hasard, écritures vers 'default'.
+    Une requête qui vient d'écrire (ou dont le client a écrit il y a moins de
+    REPLICA_EPINGLE_SECONDES) reste sur le primaire : on lit ce qu'on a écrit.
+    """
+
+    def db_for_read(self, model, **hints):
+        etat = _etat_requete.get()
+        pool = replicas()
+        if etat is None or etat.epingle or not pool:
+            return 'default'
+        return random.choice(pool)
+
+    def db_for_write(self, model, **hints):
+        etat = _etat_requete.get()
+        if etat is not None:
+            etat.epingle = etat.ecrit = True
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        pool = {'default', *replicas()}
+        if obj1._state.db in pool and obj2._state.db in pool:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
+
+
+# === MIDDLEWARE ===
+class EpinglagePrimaireMiddleware:
+    """À placer en tête de MIDDLEWARE pour couvrir aussi les sessions."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            epingle_jusqu_a = float(request.COOKIES.get(COOKIE_EPINGLE, 0))
+        except ValueError:
+            epingle_jusqu_a = 0
+        etat = EtatRequete(request.method not in METHODES_SURES or epingle_jusqu_a > time.time())
+        jeton = _etat_requete.set(etat)
+        try:
+            response = self.get_response(request)
+        finally:
+            _etat_requete.reset(jeton)
+
+        if etat.ecrit:
+            delai = settings.REPLICA_EPINGLE_SECONDES
+            response.set_cookie(
+                COOKIE_EPINGLE, str(time.time() + delai),
+                max_age=delai, httponly=True, samesite='Lax',
+            )
+        return response
@@ -0,0 +1,119 @@
+# gestion_taches_project/statiques.py
+import gzip
+import mimetypes
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from .compression import brotli, encodages_acceptes
+
+EXTENSIONS_COMPRESSIBLES = ('.css', '.js', '.svg', '.json', '.map', '.txt', '.xml', '.html', '.ico')
+TAILLE_MIN = 256
+NOM_EMPREINTE = re.compile(r'\.[0-9a-f]{12}\.\w+$')  # nom.<hash md5 tronqué>.ext produit par le manifeste
+CACHE_IMMUABLE = 'public, max-age=31536000, immutable'
+CACHE_COURT = 'public, max-age=60'
+
+
+# === STOCKAGE (collectstatic) ===
+class StockageStatiques(ManifestStaticFilesStorage):
+    """
+    Noms à empreinte (bootstrap.min.5f2b….css) puis, à côté de chaque fichier texte,
+    ses versions .gz et .br (compression maximale, payée une fois au déploiement).
+    """
+
+    def stored_name(self, name):
+        # Pas encore de manifeste (collectstatic non lancé : tests, développement) : noms d'origine
+        if not self.hashed_files:
+            return name
+        return super().stored_name(name)
+
+    def post_process(self, paths, dry_run=False, **options):
+        produits = set()
+        for nom, nom_empreinte, traite in super().post_process(paths, dry_run, **options):
+            if nom_empreinte and not isinstance(traite, Exception):
+                produits.add(nom_empreinte)
+            yield nom, nom_empreinte, traite
+        if dry_run:
+            return
+        for nom in sorted(produits | set(paths)):
+            if nom.endswith(EXTENSIONS_COMPRESSIBLES):
+                self.precompresser(nom)
+
+    def precompresser(self, nom):
+        chemin = Path(self.path(nom))
+        contenu = chemin.read_bytes()
+        if len(contenu) < TAILLE_MIN:
+            return
+        variantes = {'.gz': gzip.compress(contenu, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variantes['.br'] = brotli.compress(contenu, quality=11)
+        for suffixe, compresse in variantes.items():
+            if len(compresse) < len(contenu) * 0.95:
+                chemin.with_name(chemin.name + suffixe).write_bytes(compresse)
+
+
+# === SERVICE (sans serveur web devant) ===
+class StatiquesMiddleware:
+    """
+    Sert STATIC_URL depuis STATIC_ROOT, juste après SecurityMiddleware (nosniff, HSTS…) et
+    avant le reste de la chaîne : variante .br/.gz précompressée selon Accept-Encoding,
+    cache d'un an « immutable » pour les noms à empreinte (une visite suivante ne
+    retélécharge aucun CSS), 60 s sinon. HEAD : en-têtes seuls, sans ouvrir le fichier.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefixe = settings.STATIC_URL if settings.STATIC_URL.startswith('/') else '/' + settings.STATIC_URL
+        self.racine = settings.STATIC_ROOT
+
+    def __call__(self, request):
+        if request.path.startswith(self.prefixe) and request.method in ('GET', 'HEAD'):
+            response = self.servir(request, request.path[len(self.prefixe):])
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    def servir(self, request, nom):
+        try:
+            chemin = Path(safe_join(self.racine, nom))
+        except SuspiciousFileOperation:  # hors de STATIC_ROOT
+            return None
+        if not chemin.is_file():
+            return None
+
+        empreinte = NOM_EMPREINTE.search(nom) is not None
+        stat = chemin.stat()
+        if not empreinte and not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), stat.st_mtime):
+            return HttpResponseNotModified()
+
+        type_contenu, _ = mimetypes.guess_type(chemin.name)
+        fichier, encodage = chemin, None
+        if chemin.name.endswith(EXTENSIONS_COMPRESSIBLES):
+            acceptes = encodages_acceptes(request.headers.get('Accept-Encoding', ''))
+            for code, suffixe in (('br', '.br'), ('gzip', '.gz')):
+                variante = chemin.with_name(chemin.name + suffixe)
+                if code in acceptes and variante.is_file():
+                    fichier, encodage = variante, code
+                    break
+
+        type_contenu = type_contenu or 'application/octet-stream'
+        if request.method == 'HEAD':
+            response = HttpResponse(content_type=type_contenu)
+            response.headers['Content-Length'] = str(fichier.stat().st_size)
+        else:
+            response = FileResponse(fichier.open('rb'), content_type=type_contenu)
+        if encodage:
+            response.headers['Content-Encoding'] = encodage
+        if chemin.name.endswith(EXTENSIONS_COMPRESSIBLES):
+            patch_vary_headers(response, ('Accept-Encoding',))
+        response.headers['Last-Modified'] = http_date(stat.st_mtime)
+        response.headers['Cache-Control'] = CACHE_IMMUABLE if empreinte else CACHE_COURT
+        return response
@@ -21,6 +21,22 @@ urlpatterns = [
     path('utilisateurs-par-foyer/', views.liste_utilisateurs_par_foyer, name='liste_utilisateurs_par_foyer'),
     path('foyer/<int:foyer_id>/', views.detail_foyer, name='detail_foyer'),
     path('supprimer-membre/<int:user_id>/', views.supprimer_membre, name='supprimer_membre'),
+    path('demarrer-tache/<int:tache_id>/', views.demarrer_tache, name='demarrer_tache'),
     path('terminer-tache/<int:tache_id>/', views.terminer_tache, name='terminer_tache'),
+    path('terminer-taches/', views.terminer_taches_selection, name='terminer_taches'),
     path('inscription/', views.inscription, name='inscription'),
+    path('calendrier/', views.calendrier, name='calendrier'),
+    path('api/calendrier/', views.calendrier_api, name='calendrier_api'),
+    path('courses/', views.listes_courses, name='listes_courses'),
+    path('courses/<int:liste_id>/', views.detail_liste_courses, name='detail_liste_courses'),
+    path('courses/<int:liste_id>/achetee/', views.liste_courses_achetee, name='liste_courses_achetee'),
+    path('courses/<int:liste_id>/completer/', views.completer_liste_courses, name='completer_liste_courses'),
+    path('inventaire/', views.inventaire, name='inventaire'),
+    path('api/courses/<int:liste_id>/', views.liste_courses_api, name='liste_courses_api'),
+    path('depenses/', views.depenses, name='depenses'),
+    path('stats/cache/', views.statistiques_cache, name='statistiques_cache'),
+    path('metrics', views.metriques, name='metriques'),
+    path('profils/', views.profils, name='profils'),
+    path('profils/<str:nom>/', views.detail_profil, name='detail_profil'),
+    path('foyer/<int:foyer_id>/membres/import/', views.provisionner_membres_foyer, name='provisionner_membres'),
 ]
\ No newline at end of file
@@ -1,12 +1,15 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+
+from .annuaire import rechercher
 from .models import (
     Foyer, Utilisateur, Piece, Animal, StatutTache, Tache,
     TacheAssignee, TacheRecurrente, ListeCourses, Aliment,
     ChatMessage, Recompense, Statistique, Tuto, Inventaire,
     UtilisationRessource, Evenement, TacheEvenement, Dispositif,
     ActionDispositif, Depense, Budget, HistoriqueTache,
-    SuggestionTache, PreferenceUtilisateur, InteractionIa, Invitation
+    SuggestionTache, PreferenceUtilisateur, InteractionIa, Invitation,
+    TacheArchivee, EvenementJournal
 )
 
 # === UTILISATEUR (personnalisé) ===
@@ -14,7 +17,14 @@ from .models import (
 class UtilisateurAdmin(UserAdmin):
     list_display = ('email', 'username', 'role', 'id_foyer', 'is_staff')
     list_filter = ('role', 'is_staff')
-    search_fields = ('email', 'username')
+    search_fields = ('email', 'nom')
+    list_select_related = ('id_foyer',)
+    show_full_result_count = False  # pas de second COUNT(*) sur toute la table
+    ordering = ('email',)
+
+    def get_search_results(self, request, queryset, search_term):
+        # Recherche par préfixe sur les index lower(email) / lower(nom) plutôt qu'un LIKE '%...%'
+        return rechercher(queryset, search_term), False
 
 # === PIÈCE (UNE SEULE FOIS) ===
 @admin.register(Piece)
@@ -23,6 +33,13 @@ class PieceAdmin(admin.ModelAdmin):
     list_filter = ('id_foyer',)
     search_fields = ('nom',)
 
+# === JOURNAL D'AUDIT ===
+@admin.register(EvenementJournal)
+class EvenementJournalAdmin(admin.ModelAdmin):
+    list_display = ('date', 'type', 'acteur_id', 'foyer_id', 'objet_id')
+    list_filter = ('type',)
+    date_hierarchy = 'date'
+
 # === AUTRES MODÈLES (enregistrement simple) ===
 admin.site.register(Foyer)
 admin.site.register(Animal)
@@ -48,4 +65,5 @@ admin.site.register(HistoriqueTache)
 admin.site.register(SuggestionTache)
 admin.site.register(PreferenceUtilisateur)
 admin.site.register(InteractionIa)
-admin.site.register(Invitation)
\ No newline at end of file
+admin.site.register(Invitation)
+admin.site.register(TacheArchivee)
\ No newline at end of file
@@ -0,0 +1,72 @@
+# maison_app/annuaire.py
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Lower
+
+from .models import Tache, TacheAssignee, Utilisateur
+
+PAR_PAGE = 50
+# Borne haute d'une recherche par préfixe : tout texte commençant par le préfixe est < préfixe + ce caractère.
+# Vrai seulement en ordre des points de code (BINARY de SQLite), pas sous une collation linguistique.
+FIN_PREFIXE = '\U0010ffff'
+
+
+# === RECHERCHE PAR PRÉFIXE ===
+def filtre_prefixe(prefixe, champs=('email', 'nom'), vendor='sqlite'):
+    """
+    Préfixe insensible à la casse sur lower(champ), servi par un index fonctionnel :
+    - SQLite : intervalle [préfixe, préfixe + FIN_PREFIXE[ (utilisateur_*_lower_idx) ;
+    - PostgreSQL et autres : LIKE 'préfixe%' (index text_pattern_ops, migration 0019),
+      correct quelle que soit la collation de la base (fr_FR.UTF-8…).
+    """
+    prefixe = prefixe.strip().lower()
+    filtre = Q()
+    for champ in champs:
+        if vendor == 'sqlite':
+            filtre |= Q(**{f'{champ}_min__gte': prefixe, f'{champ}_min__lt': prefixe + FIN_PREFIXE})
+        else:
+            filtre |= Q(**{f'{champ}_min__startswith': prefixe})
+    return filtre
+
+
+def rechercher(utilisateurs, prefixe, champs=('email', 'nom')):
+    if not prefixe or not prefixe.strip():
+        return utilisateurs
+    vendor = connections[utilisateurs.db].vendor
+    return (
+        utilisateurs
+        .alias(**{f'{champ}_min': Lower(champ) for champ in champs})
+        .filter(filtre_prefixe(prefixe, champs, vendor))
+    )
+
+
+# === ANNUAIRE ===
+def _compte(sous_requete, colonne):
+    # Sous-requête corrélée : évaluée pour les seules lignes de la page, sans multiplier les jointures
+    return Coalesce(
+        Subquery(sous_requete.order_by().values(colonne).annotate(n=Count('pk')).values('n'), output_field=IntegerField()),
+        0,
+    )
+
+
+def annuaire(recherche='', foyer=None):
+    """Membres avec foyer et compteurs de tâches (terminées par eux, ouvertes qui leur sont assignées)."""
+    utilisateurs = (
+        Utilisateur.objects
+        .select_related('id_foyer')
+        .only('email', 'nom', 'role', 'id_foyer__nom')
+        .annotate(
+            taches_terminees=_compte(Tache.objects.filter(complete_par=OuterRef('pk')), 'complete_par'),
+            taches_ouvertes=_compte(
+                TacheAssignee.objects.filter(id_user=OuterRef('pk'), id_tache__terminee=False), 'id_user',
+            ),
+        )
+    )
+    if foyer is not None:
+        utilisateurs = utilisateurs.filter(id_foyer=foyer)
+    return rechercher(utilisateurs, recherche)
+
+
+def page_annuaire(utilisateurs, numero, par_page=PAR_PAGE):
+    return Paginator(utilisateurs, par_page).get_page(numero)
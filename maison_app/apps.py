@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class MaisonAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'maison_app'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,83 @@
+# maison_app/archivage.py
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from .calendrier import invalider_calendrier
+from .models import (
+    ActionDispositif, Animal, ChatMessage, ChatMessageArchive, HistoriqueTache,
+    HistoriqueTacheArchive, Piece, Tache, TacheArchivee, TacheAssignee,
+    TacheAssigneeArchivee, TacheEvenement, TacheRecurrente, UtilisationRessource,
+)
+from .suppression import supprimer_ensemble, supprimer_lignes
+
+TAILLE_LOT = 500
+
+# Dépendances déplacées avec la tâche : (modèle chaud, modèle d'archive)
+DEPENDANCES = [
+    (TacheAssignee, TacheAssigneeArchivee),
+    (HistoriqueTache, HistoriqueTacheArchive),
+    (ChatMessage, ChatMessageArchive),
+]
+# Une tâche encore référencée par ces tables reste dans la table chaude
+# (récurrence, événement, action planifiée, consommation de stock)
+BLOQUANTES = [TacheRecurrente, TacheEvenement, ActionDispositif, UtilisationRessource]
+
+
+def taches_archivables(jours):
+    limite = timezone.now() - timedelta(days=jours)
+    taches = Tache.objects.filter(terminee=True, date_completion__lt=limite)
+    for modele in BLOQUANTES:
+        taches = taches.filter(~Exists(modele.objects.filter(id_tache=OuterRef('pk'))))
+    return taches
+
+
+def _copier(archive, lignes):
+    champs = {f.attname for f in archive._meta.concrete_fields}
+    archive.objects.bulk_create(
+        [archive(**{cle: valeur for cle, valeur in ligne.items() if cle in champs}) for ligne in lignes],
+        batch_size=TAILLE_LOT,
+    )
+
+
+def archiver_lot(ids):
+    """Déplace un lot de tâches et leurs dépendances vers les archives, en une transaction."""
+    with transaction.atomic():
+        # Relecture verrouillée : une tâche rouverte entre-temps n'est pas archivée
+        taches = list(Tache.objects.select_for_update().filter(id__in=ids, terminee=True).values())
+        ids = [tache['id'] for tache in taches]
+        if not ids:
+            return 0, set()
+
+        _copier(TacheArchivee, taches)
+        for modele, archive in DEPENDANCES:
+            lignes = modele.objects.filter(id_tache_id__in=ids)
+            _copier(archive, lignes.values().iterator())
+            # Les messages sont en SET_NULL : sans ce DELETE ils resteraient orphelins dans la table chaude
+            supprimer_lignes(lignes)
+
+        # Suppression ensembliste : autres liens (tutos, IA) détachés
+        supprimer_ensemble(Tache, Tache.objects.filter(id__in=ids), {})
+
+        # DELETE sans signaux : versions des fragments avancées explicitement (calendrier : archiver_taches)
+        maintenant = timezone.now()
+        Piece.objects.filter(id__in={t['id_piece_id'] for t in taches if t['id_piece_id']}).update(date_modification=maintenant)
+        Animal.objects.filter(id__in={t['id_animal_id'] for t in taches if t['id_animal_id']}).update(date_modification=maintenant)
+    return len(ids), {tache['id_foyer_id'] for tache in taches}
+
+
+def archiver_taches(jours=30, taille_lot=TAILLE_LOT):
+    """Archive par lots les tâches terminées depuis plus de `jours` jours."""
+    total, foyers = 0, set()
+    while True:
+        ids = list(taches_archivables(jours).order_by('id').values_list('id', flat=True)[:taille_lot])
+        if not ids:
+            break
+        n, foyers_lot = archiver_lot(ids)
+        total += n
+        foyers |= foyers_lot
+    for foyer_id in foyers:
+        invalider_calendrier(foyer_id)
+    return total
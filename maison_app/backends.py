@@ -0,0 +1,38 @@
+# maison_app/backends.py
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+from .models import Utilisateur
+
+
+def cle_utilisateur(user_id):
+    return f'auth:utilisateur:{user_id}'
+
+
+def invalider_utilisateurs(ids):
+    cache.delete_many([cle_utilisateur(user_id) for user_id in ids])
+
+
+class UtilisateurFoyerBackend(ModelBackend):
+    """
+    Charge request.user avec son foyer (select_related) : request.user.id_foyer
+    ne déclenche plus de requête. Avec AUTH_CACHE_UTILISATEUR_TTL > 0, l'utilisateur
+    est aussi gardé en cache quelques secondes, par id (partagé entre ses sessions).
+    """
+
+    def get_user(self, user_id):
+        ttl = settings.AUTH_CACHE_UTILISATEUR_TTL
+        if ttl:
+            utilisateur = cache.get(cle_utilisateur(user_id))
+            if utilisateur is not None:
+                return utilisateur if self.user_can_authenticate(utilisateur) else None
+
+        try:
+            utilisateur = Utilisateur._default_manager.select_related('id_foyer').get(pk=user_id)
+        except Utilisateur.DoesNotExist:
+            return None
+
+        if ttl:
+            cache.set(cle_utilisateur(user_id), utilisateur, ttl)
+        return utilisateur if self.user_can_authenticate(utilisateur) else None
@@ -0,0 +1,169 @@
+# maison_app/calendrier.py
+import calendar
+import heapq
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.db.models import Q
+
+from .models import Evenement, Tache, TacheRecurrente
+
+CACHE_TIMEOUT = 60 * 60  # 1 heure
+PAS_RECURRENCE = {
+    'Quotidien': timedelta(days=1),
+    'Hebdo': timedelta(weeks=1),
+}
+
+
+# === ENTRÉE DE CALENDRIER ===
+@dataclass(frozen=True, order=True)
+class EntreeCalendrier:
+    date: date
+    type: str  # 'evenement', 'echeance' ou 'recurrence'
+    titre: str
+    objet_id: int
+    date_fin: date = None
+
+    def as_dict(self):
+        return {
+            'date': self.date.isoformat(),
+            'date_fin': self.date_fin.isoformat() if self.date_fin else None,
+            'type': self.type,
+            'titre': self.titre,
+            'id': self.objet_id,
+        }
+
+
+# === SOURCES (GÉNÉRATEURS) ===
+def iter_evenements(foyer_id, debut, fin):
+    """Événements qui chevauchent [debut, fin] (date_fin nulle = un seul jour)."""
+    evenements = (
+        Evenement.objects
+        .filter(id_foyer_id=foyer_id, date_debut__lte=fin)
+        .filter(Q(date_fin__gte=debut) | Q(date_fin__isnull=True, date_debut__gte=debut))
+        .order_by('date_debut', 'id')
+        .values_list('id', 'titre', 'date_debut', 'date_fin')
+    )
+    for pk, titre, date_debut, date_fin in evenements.iterator():
+        yield EntreeCalendrier(date_debut, 'evenement', titre, pk, date_fin)
+
+
+def iter_echeances(foyer_id, debut, fin):
+    taches = (
+        Tache.objects
+        .filter(id_foyer_id=foyer_id, date_limite__range=(debut, fin))
+        .order_by('date_limite', 'id')
+        .values_list('id', 'titre', 'date_limite')
+    )
+    for pk, titre, date_limite in taches.iterator():
+        yield EntreeCalendrier(date_limite, 'echeance', titre, pk)
+
+
+def _ajouter_mois(jour, nb_mois, jour_ancre):
+    mois = jour.month - 1 + nb_mois
+    annee = jour.year + mois // 12
+    mois = mois % 12 + 1
+    return date(annee, mois, min(jour_ancre, calendar.monthrange(annee, mois)[1]))
+
+
+def iter_occurrences(frequence, ancre, debut, fin, inclure_ancre=True):
+    """
+    Occurrences d'une récurrence à partir de `ancre`, limitées à [debut, fin].
+    inclure_ancre=False : l'ancre est une exécution passée, la première occurrence est la suivante.
+    """
+    premier = 0 if inclure_ancre else 1
+    if frequence in PAS_RECURRENCE:
+        pas = PAS_RECURRENCE[frequence]
+        jour = ancre + pas * premier
+        if jour < debut:
+            # Saut direct à la première occurrence de la fenêtre
+            jour += pas * -(-(debut - jour).days // pas.days)
+        while jour <= fin:
+            yield jour
+            jour += pas
+    elif frequence == 'Mensuel':
+        nb_mois = max(premier, (debut.year - ancre.year) * 12 + debut.month - ancre.month - 1)
+        jour = _ajouter_mois(ancre, nb_mois, ancre.day)
+        while jour <= fin:
+            if jour >= debut:
+                yield jour
+            nb_mois += 1
+            jour = _ajouter_mois(ancre, nb_mois, ancre.day)
+
+
+def iter_recurrences(foyer_id, debut, fin):
+    recurrences = (
+        TacheRecurrente.objects
+        .filter(id_tache__id_foyer_id=foyer_id, id_tache__terminee=False)
+        .filter(Q(dernier_execution__isnull=False) | Q(id_tache__date_limite__isnull=False))
+        .values_list('id_tache_id', 'id_tache__titre', 'frequence', 'dernier_execution', 'id_tache__date_limite')
+    )
+    flux = []
+    for tache_id, titre, frequence, dernier_execution, date_limite in recurrences.iterator():
+        # Dernière exécution connue : déjà faite, seules les suivantes sont à venir ; sinon l'échéance compte
+        ancre = dernier_execution or date_limite
+        flux.append(
+            EntreeCalendrier(jour, 'recurrence', titre, tache_id)
+            for jour in iter_occurrences(frequence, ancre, debut, fin, inclure_ancre=dernier_execution is None)
+        )
+    return heapq.merge(*flux)
+
+
+def iter_calendrier(foyer_id, debut, fin):
+    """Fusionne paresseusement toutes les sources, triées par date."""
+    return heapq.merge(
+        iter_evenements(foyer_id, debut, fin),
+        iter_echeances(foyer_id, debut, fin),
+        iter_recurrences(foyer_id, debut, fin),
+    )
+
+
+# === CACHE PAR MOIS ===
+def _cle_version(foyer_id):
+    return f'calendrier:{foyer_id}:version'
+
+
+def invalider_calendrier(foyer_id):
+    if foyer_id is None:
+        return
+    try:
+        cache.incr(_cle_version(foyer_id))
+    except ValueError:
+        cache.set(_cle_version(foyer_id), 2, None)
+
+
+def bornes_du_mois(annee, mois):
+    return date(annee, mois, 1), date(annee, mois, calendar.monthrange(annee, mois)[1])
+
+
+def calendrier_du_mois(foyer_id, annee, mois):
+    version = cache.get_or_set(_cle_version(foyer_id), 1, None)
+    cle = f'calendrier:{foyer_id}:{annee}-{mois:02d}:v{version}'
+    entrees = cache.get(cle)
+    if entrees is None:
+        entrees = list(iter_calendrier(foyer_id, *bornes_du_mois(annee, mois)))
+        cache.set(cle, entrees, CACHE_TIMEOUT)
+    return entrees
+
+
+def mois_couverts(debut, fin):
+    annee, mois = debut.year, debut.month
+    while (annee, mois) <= (fin.year, fin.month):
+        yield annee, mois
+        annee, mois = (annee + 1, 1) if mois == 12 else (annee, mois + 1)
+
+
+def entrees_fenetre(foyer_id, debut, fin):
+    """Entrées de [debut, fin], servies mois par mois depuis le cache."""
+    vus = set()
+    for annee, mois in mois_couverts(debut, fin):
+        for entree in calendrier_du_mois(foyer_id, annee, mois):
+            # Un événement à cheval sur deux mois apparaît dans chacun
+            if entree.type == 'evenement':
+                if entree.objet_id in vus:
+                    continue
+                vus.add(entree.objet_id)
+            if entree.date > fin or (entree.date_fin or entree.date) < debut:
+                continue
+            yield entree
@@ -0,0 +1,139 @@
+# maison_app/courses.py
+import unicodedata
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Aliment, ListeCourses
+
+
+# === NORMALISATION ===
+def normaliser(texte):
+    """'  Pâtes ' et 'pates' désignent le même article."""
+    texte = unicodedata.normalize('NFKD', (texte or '').strip().lower())
+    return ' '.join(''.join(c for c in texte if not unicodedata.combining(c)).split())
+
+
+def cle_aliment(nom, unite):
+    return normaliser(nom), normaliser(unite)
+
+
+def additionner(a, b):
+    if a is None and b is None:
+        return None
+    return (a or Decimal('0')) + (b or Decimal('0'))
+
+
+QUANTITE_MAX = Decimal('1e8')  # DecimalField(max_digits=10, decimal_places=2) : 8 chiffres avant la virgule
+CENTIEME = Decimal('0.01')
+
+
+def lire_quantite(valeur):
+    """Decimal arrondi au centième ; ValueError si illisible, infini, NaN ou trop grand pour la colonne."""
+    if valeur in (None, ''):
+        return None
+    try:
+        quantite = Decimal(str(valeur).replace(',', '.'))
+    except InvalidOperation:
+        raise ValueError(f"Quantité invalide : {valeur}")
+    if not quantite.is_finite() or abs(quantite) >= QUANTITE_MAX:
+        raise ValueError(f"Quantité invalide : {valeur}")
+    quantite = quantite.quantize(CENTIEME)
+    if abs(quantite) >= QUANTITE_MAX:  # 99999999,999 arrondi à 100000000,00
+        raise ValueError(f"Quantité invalide : {valeur}")
+    return quantite
+
+
+# === ÉDITION GROUPÉE ===
+def enregistrer_lignes(liste, ajouts=(), modifications=(), suppressions=()):
+    """
+    Applique en une transaction les ajouts, modifications et suppressions d'une liste.
+    `ajouts` : dicts {nom, quantite, unite} ; `modifications` : mêmes dicts avec `id`.
+    Les doublons (nom et unité normalisés) sont fusionnés en additionnant les quantités.
+    Coût : 1 SELECT, puis au plus 1 DELETE, 1 bulk_update et 1 bulk_create.
+    """
+    suppressions = {int(pk) for pk in suppressions}
+    modifications = {int(ligne['id']): ligne for ligne in modifications if int(ligne['id']) not in suppressions}
+
+    with transaction.atomic():
+        existants = {
+            aliment.id: aliment
+            for aliment in Aliment.objects.select_for_update().filter(id_liste=liste, archive=False).order_by('id')
+        }
+        suppressions &= existants.keys()
+
+        # Lignes conservées, indexées par clé normalisée
+        par_cle = {}
+        a_modifier = set()
+        for pk, aliment in existants.items():
+            if pk in suppressions:
+                continue
+            if pk in modifications:
+                ligne = modifications[pk]
+                if not (ligne.get('nom') or '').strip():
+                    suppressions.add(pk)
+                    continue
+                aliment.nom = ligne['nom'].strip()
+                aliment.quantite = lire_quantite(ligne.get('quantite'))
+                aliment.unite = (ligne.get('unite') or '').strip() or None
+                a_modifier.add(pk)
+            cle = cle_aliment(aliment.nom, aliment.unite)
+            if cle in par_cle:
+                # Une modification a créé un doublon : on fusionne dans la ligne la plus ancienne
+                cible = par_cle[cle]
+                cible.quantite = additionner(cible.quantite, aliment.quantite)
+                a_modifier.add(cible.id)
+                suppressions.add(pk)
+            else:
+                par_cle[cle] = aliment
+
+        nouveaux = []
+        for ligne in ajouts:
+            nom = (ligne.get('nom') or '').strip()
+            if not nom:
+                continue
+            unite = (ligne.get('unite') or '').strip() or None
+            quantite = lire_quantite(ligne.get('quantite'))
+            cle = cle_aliment(nom, unite)
+            if cle in par_cle:
+                cible = par_cle[cle]
+                cible.quantite = additionner(cible.quantite, quantite)
+                if cible.id:
+                    a_modifier.add(cible.id)
+            else:
+                par_cle[cle] = Aliment(nom=nom, quantite=quantite, unite=unite, id_liste=liste)
+                nouveaux.append(par_cle[cle])
+
+        # Chaque quantité lue est bornée, mais la somme de doublons fusionnés peut dépasser la colonne
+        for aliment in par_cle.values():
+            if aliment.quantite is not None and abs(aliment.quantite) >= QUANTITE_MAX:
+                raise ValueError(f"Quantité trop grande : {aliment.nom}")
+
+        if suppressions:
+            Aliment.objects.filter(id__in=suppressions).delete()
+        a_modifier -= suppressions
+        if a_modifier:
+            Aliment.objects.bulk_update([existants[pk] for pk in a_modifier], ['nom', 'quantite', 'unite'])
+        if nouveaux:
+            Aliment.objects.bulk_create(nouveaux)
+
+    return {'ajoutes': len(nouveaux), 'modifies': len(a_modifier), 'supprimes': len(suppressions)}
+
+
+def consolider_liste(liste):
+    """Fusionne les doublons déjà présents dans une liste."""
+    return enregistrer_lignes(liste)
+
+
+# === ACHAT ===
+def marquer_achetee(liste):
+    """Clôt la liste et archive ses articles : 2 UPDATE dans une transaction, quel que soit le nombre d'articles."""
+    with transaction.atomic():
+        fermee = ListeCourses.objects.filter(id=liste.id, statut='En cours').update(
+            statut='Acheté',
+            date_achat=timezone.now(),
+        )
+        if fermee:
+            Aliment.objects.filter(id_liste_id=liste.id, archive=False).update(archive=True)
+    return bool(fermee)
@@ -0,0 +1,202 @@
+# maison_app/dispositifs.py
+import asyncio
+import heapq
+import logging
+import random
+from collections import deque, namedtuple
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import ActionDispositif, Dispositif
+
+logger = logging.getLogger(__name__)
+
+TAILLE_LOT = 500
+
+ActionPlanifiee = namedtuple('ActionPlanifiee', 'id dispositif_id type action date_prevue')
+Resultat = namedtuple('Resultat', 'action_id dispositif_id succes etat message date_execution')
+
+
+# === PILOTES ===
+class ErreurPilote(Exception):
+    pass
+
+
+class PiloteDispositif:
+    """Interface d'un pilote : exécute une action et renvoie le nouvel état du dispositif."""
+
+    async def executer(self, action):
+        raise NotImplementedError
+
+
+class PiloteFactice(PiloteDispositif):
+    """Pilote local pour le développement et les tests : ne contacte aucun matériel."""
+
+    def __init__(self, latence=0.0, taux_echec=0.0, taille_journal=1000):
+        self.latence = latence
+        self.taux_echec = taux_echec
+        self.journal = deque(maxlen=taille_journal)  # dernières actions seulement : le planificateur tourne sans fin
+
+    async def executer(self, action):
+        if self.latence:
+            await asyncio.sleep(self.latence)
+        if self.taux_echec and random.random() < self.taux_echec:
+            raise ErreurPilote(f"Dispositif {action.dispositif_id} injoignable")
+        self.journal.append(action)
+        return action.action == 'allumer'
+
+
+TYPES_DISPOSITIF = ('capteur', 'lampe', 'thermostat')
+
+
+def charger_pilotes():
+    """
+    Pilotes par type de dispositif, déclarés dans settings.DISPOSITIF_PILOTES.
+    Hors DEBUG, pas de repli sur le pilote factice : un type sans pilote n'est pas
+    exécuté et ses actions restent en attente.
+    """
+    chemins = getattr(settings, 'DISPOSITIF_PILOTES', {})
+    pilote_defaut = PiloteFactice() if settings.DEBUG else None
+    pilotes = {}
+    for type_dispositif in TYPES_DISPOSITIF:
+        if type_dispositif in chemins:
+            pilotes[type_dispositif] = import_string(chemins[type_dispositif])()
+        elif pilote_defaut is not None:
+            pilotes[type_dispositif] = pilote_defaut
+        else:
+            logger.warning("Aucun pilote pour le type '%s' (DISPOSITIF_PILOTES) : ses actions restent en attente", type_dispositif)
+    return pilotes
+
+
+# === ACCÈS BASE (SYNCHRONE) ===
+def actions_en_attente(limite, types=None, jusqu_a=None):
+    actions = ActionDispositif.objects.filter(statut='en_attente')
+    if types is not None:
+        actions = actions.filter(id_dispositif__type__in=types)
+    if jusqu_a is not None:
+        actions = actions.filter(date_prevue__lte=jusqu_a)
+    actions = (
+        actions
+        .order_by('date_prevue')
+        .values_list('id', 'id_dispositif_id', 'id_dispositif__type', 'action', 'date_prevue')[:limite]
+    )
+    return [ActionPlanifiee(*ligne) for ligne in actions]
+
+
+def _par_tranches(valeurs, taille=TAILLE_LOT):
+    valeurs = list(valeurs)
+    for i in range(0, len(valeurs), taille):
+        yield valeurs[i:i + taille]
+
+
+def enregistrer_resultats(resultats):
+    """Écrit les résultats d'un lot : un bulk_update des actions, un UPDATE par état de dispositif."""
+    etats = {}
+    for resultat in sorted(resultats, key=lambda r: r.date_execution):
+        if resultat.succes:
+            etats[resultat.dispositif_id] = resultat.etat
+
+    actions = [
+        ActionDispositif(
+            id=resultat.action_id,
+            statut='executee' if resultat.succes else 'echec',
+            resultat=resultat.message,
+            date_execution=resultat.date_execution,
+        )
+        for resultat in resultats
+    ]
+    with transaction.atomic():
+        ActionDispositif.objects.bulk_update(actions, ['statut', 'resultat', 'date_execution'], batch_size=TAILLE_LOT)
+        for etat in (True, False):
+            ids = [dispositif_id for dispositif_id, e in etats.items() if e is etat]
+            for tranche in _par_tranches(ids):
+                Dispositif.objects.filter(id__in=tranche).update(etat=etat)
+
+
+# === PLANIFICATEUR ===
+class Planificateur:
+    """
+    File de priorité (tas trié par date prévue) des actions en attente,
+    exécutées en parallèle par les pilotes et enregistrées par lots.
+    """
+
+    def __init__(self, pilotes=None, concurrence=200, taille_lot=TAILLE_LOT, intervalle=1.0):
+        self.pilotes = charger_pilotes() if pilotes is None else pilotes
+        self.concurrence = concurrence
+        self.taille_lot = taille_lot
+        self.intervalle = intervalle
+        self._tas = []
+        self._en_file = set()
+
+    def planifier(self, action):
+        if action.id in self._en_file:
+            return
+        self._en_file.add(action.id)
+        heapq.heappush(self._tas, (action.date_prevue, action.id, action))
+
+    def prochaine_echeance(self):
+        return self._tas[0][0] if self._tas else None
+
+    async def charger(self, jusqu_a=None):
+        # Les actions déjà dans le tas sont ignorées par planifier() ; celles sans pilote restent en base
+        actions = await sync_to_async(actions_en_attente)(
+            len(self._tas) + self.taille_lot * 10, list(self.pilotes), jusqu_a,
+        )
+        for action in actions:
+            self.planifier(action)
+        return len(self._tas)
+
+    def _extraire_dues(self, maintenant):
+        dues = []
+        while self._tas and self._tas[0][0] <= maintenant and len(dues) < self.taille_lot:
+            dues.append(heapq.heappop(self._tas)[2])
+        return dues
+
+    async def _executer(self, action, semaphore):
+        async with semaphore:
+            pilote = self.pilotes.get(action.type)
+            try:
+                if pilote is None:
+                    raise ErreurPilote(f"Aucun pilote pour le type '{action.type}'")
+                etat = await pilote.executer(action)
+                return Resultat(action.id, action.dispositif_id, True, etat, '', timezone.now())
+            except Exception as exc:
+                logger.warning("Échec de l'action %s : %s", action.id, exc)
+                return Resultat(action.id, action.dispositif_id, False, None, str(exc), timezone.now())
+
+    async def executer_dues(self):
+        """Exécute toutes les actions échues et renvoie le nombre traité."""
+        semaphore = asyncio.Semaphore(self.concurrence)
+        total = 0
+        while True:
+            dues = self._extraire_dues(timezone.now())
+            if not dues:
+                return total
+            resultats = await asyncio.gather(*(self._executer(action, semaphore) for action in dues))
+            await sync_to_async(enregistrer_resultats)(resultats)
+            self._en_file.difference_update(action.id for action in dues)
+            total += len(dues)
+
+    async def tourner(self, arret=None):
+        arret = arret or asyncio.Event()
+        while not arret.is_set():
+            if len(self._tas) < self.taille_lot:
+                await self.charger()
+            else:
+                # Tas rempli d'actions lointaines : on relève tout de même celles créées depuis
+                # et dues avant le prochain tour (sinon elles attendraient que le tas se vide)
+                await self.charger(jusqu_a=timezone.now() + timedelta(seconds=self.intervalle))
+            await self.executer_dues()
+            attente = self.intervalle
+            echeance = self.prochaine_echeance()
+            if echeance is not None:
+                attente = min(attente, max(0.0, (echeance - timezone.now()).total_seconds()))
+            try:
+                await asyncio.wait_for(arret.wait(), timeout=attente)
+            except asyncio.TimeoutError:
+                pass
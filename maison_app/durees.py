@@ -0,0 +1,117 @@
+# maison_app/durees.py
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .calendrier import invalider_calendrier
+from .models import Animal, DureeMoyenne, HistoriqueTache, Piece, Tache
+
+
+class TacheDejaTerminee(Exception):
+    pass
+
+
+# === MOYENNES GLISSANTES ===
+def _ajouter_a_la_moyenne(foyer_id, piece_id, somme, nombre=1):
+    # Un seul UPDATE : à droite du SET, nombre et moyenne valent encore leurs anciennes valeurs
+    lignes = DureeMoyenne.objects.filter(id_foyer_id=foyer_id, id_piece_id=piece_id)
+    if lignes.update(
+        nombre=F('nombre') + nombre,
+        moyenne_secondes=F('moyenne_secondes')
+        + (somme - nombre * F('moyenne_secondes')) / (F('nombre') + float(nombre)),
+    ):
+        return
+    try:
+        with transaction.atomic():
+            DureeMoyenne.objects.create(
+                id_foyer_id=foyer_id, id_piece_id=piece_id, nombre=nombre, moyenne_secondes=somme / nombre,
+            )
+    except IntegrityError:
+        # Ligne créée en parallèle : on retombe sur l'UPDATE
+        _ajouter_a_la_moyenne(foyer_id, piece_id, somme, nombre)
+
+
+def enregistrer_durees(durees):
+    """
+    `durees` : triplets (foyer_id, piece_id, timedelta). Met à jour la moyenne de
+    chaque foyer et de chaque pièce en un UPDATE par groupe, sans relire l'historique.
+    """
+    groupes = defaultdict(lambda: [0.0, 0])
+    for foyer_id, piece_id, duree in durees:
+        if foyer_id is None or duree is None:
+            continue
+        cles = [(foyer_id, None)] + ([(foyer_id, piece_id)] if piece_id else [])
+        for cle in cles:
+            groupes[cle][0] += duree.total_seconds()
+            groupes[cle][1] += 1
+    for (foyer_id, piece_id), (somme, nombre) in groupes.items():
+        _ajouter_a_la_moyenne(foyer_id, piece_id, somme, nombre)
+
+
+def enregistrer_duree(foyer_id, piece_id, duree):
+    enregistrer_durees([(foyer_id, piece_id, duree)])
+
+
+# === DÉBUT ET FIN D'UNE TÂCHE ===
+def demarrer_tache(tache):
+    """Renvoie False si la tâche est déjà démarrée ou terminée."""
+    with transaction.atomic():
+        tache = Tache.objects.select_for_update().get(id=tache.id)
+        if tache.terminee or tache.date_debut:
+            return False
+        tache.date_debut = timezone.now()
+        tache.save(update_fields=['date_debut', 'date_modification'])
+    return True
+
+
+def terminer_taches(ids, utilisateur, foyer_id=None, commentaire=''):
+    """
+    Termine les tâches encore ouvertes parmi `ids` par un seul UPDATE conditionnel
+    (WHERE terminee = false) : en cas de clics simultanés, seule la requête dont
+    l'UPDATE touche la ligne la termine. Les gagnantes sont relues grâce au
+    marqueur (complete_par, date_completion) posé par cet UPDATE, puis leur
+    historique est écrit par bulk_create dans la même transaction.
+    Renvoie la liste des HistoriqueTache créés (vide si rien n'a été terminé).
+    `foyer_id=None` ne filtre pas : les vues doivent refuser un utilisateur sans foyer.
+    """
+    taches = Tache.objects.filter(id__in=ids, terminee=False)
+    if foyer_id is not None:
+        taches = taches.filter(id_foyer_id=foyer_id)
+    maintenant = timezone.now()
+
+    with transaction.atomic():
+        if not taches.update(
+            terminee=True, complete_par=utilisateur, date_completion=maintenant, date_modification=maintenant,
+        ):
+            return []
+        gagnantes = list(
+            Tache.objects
+            .filter(id__in=ids, terminee=True, complete_par=utilisateur, date_completion=maintenant)
+            .values_list('id', 'id_foyer_id', 'id_piece_id', 'id_animal_id', 'date_debut')
+        )
+        historiques = HistoriqueTache.objects.bulk_create([
+            HistoriqueTache(
+                id_tache_id=tache_id,
+                id_user=utilisateur,
+                duree=maintenant - debut if debut else None,
+                commentaire=commentaire,
+            )
+            for tache_id, _, _, _, debut in gagnantes
+        ])
+        enregistrer_durees((foyer, piece, h.duree) for (_, foyer, piece, _, _), h in zip(gagnantes, historiques))
+
+        # UPDATE sans signaux : versions des fragments et calendrier avancées explicitement
+        Piece.objects.filter(id__in={piece for _, _, piece, _, _ in gagnantes if piece}).update(date_modification=maintenant)
+        Animal.objects.filter(id__in={animal for _, _, _, animal, _ in gagnantes if animal}).update(date_modification=maintenant)
+        for foyer in {foyer for _, foyer, _, _, _ in gagnantes}:
+            invalider_calendrier(foyer)
+    return historiques
+
+
+def terminer_tache(tache, utilisateur, commentaire=''):
+    historiques = terminer_taches([tache.id], utilisateur, commentaire=commentaire)
+    if not historiques:
+        raise TacheDejaTerminee("Tâche déjà terminée.")
+    return historiques[0]
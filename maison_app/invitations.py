@@ -0,0 +1,82 @@
+# maison_app/invitations.py
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import DUREE_VALIDITE_INVITATION, Invitation, Utilisateur
+
+TAILLE_LOT = 1000
+MOT_DE_PASSE_TEMPORAIRE = 'temporary123'
+
+
+class InvitationInvalide(Exception):
+    pass
+
+
+class EmailDejaUtilise(Exception):
+    pass
+
+
+def limite_validite():
+    return timezone.now() - DUREE_VALIDITE_INVITATION
+
+
+# === UTILISATION ===
+def utiliser_invitation(code, email, nom):
+    """
+    Réclame le code par un UPDATE conditionnel (un seul gagnant en cas de
+    concurrence) et crée le membre dans la même transaction.
+    """
+    try:
+        invitation = Invitation.objects.select_related('foyer').filter(code=code).first()
+    except ValidationError:
+        invitation = None
+    if invitation is None:
+        raise InvitationInvalide("Code invalide.")
+
+    try:
+        with transaction.atomic():
+            if Utilisateur.objects.filter(email=email).exists():
+                raise EmailDejaUtilise("Cet email est déjà utilisé.")
+
+            reclamee = Invitation.objects.filter(
+                id=invitation.id,
+                utilise=False,
+                date_creation__gte=limite_validite(),
+            ).update(utilise=True)
+            if not reclamee:
+                raise InvitationInvalide("Code expiré ou déjà utilisé.")
+
+            utilisateur = Utilisateur(
+                username=email,
+                email=email,
+                nom=nom,
+                role=invitation.role,
+                id_foyer=invitation.foyer,
+            )
+            utilisateur.set_password(MOT_DE_PASSE_TEMPORAIRE)  # Mot de passe temporaire
+            utilisateur.save()
+    except IntegrityError:
+        # Même email inscrit en parallèle : la réclamation est annulée avec la transaction
+        raise EmailDejaUtilise("Cet email est déjà utilisé.")
+    return utilisateur, invitation
+
+
+# === GÉNÉRATION ET PURGE ===
+def generer_invitations(foyer, cree_par, role='membre', nombre=1):
+    invitations = [Invitation(foyer=foyer, role=role, cree_par=cree_par) for _ in range(nombre)]
+    return Invitation.objects.bulk_create(invitations, batch_size=TAILLE_LOT)
+
+
+def purger_invitations_expirees(taille_lot=TAILLE_LOT):
+    """Supprime par lots les invitations expirées, sans verrouiller toute la table."""
+    limite = limite_validite()
+    total = 0
+    while True:
+        ids = list(
+            Invitation.objects.filter(date_creation__lt=limite).values_list('id', flat=True)[:taille_lot]
+        )
+        if not ids:
+            return total
+        Invitation.objects.filter(id__in=ids).delete()
+        total += len(ids)
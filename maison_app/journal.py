@@ -0,0 +1,148 @@
+# maison_app/journal.py
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+from django.utils import timezone
+
+from .models import EvenementJournal
+
+logger = logging.getLogger(__name__)
+
+
+def _identifiant(valeur):
+    return getattr(valeur, 'pk', valeur)
+
+
+# === JOURNAL TAMPONNÉ ===
+class Journal:
+    """
+    Tampon borné en mémoire vidé par un thread d'arrière-plan : `enregistrer`
+    ne touche pas la base, le thread écrit par bulk_create tous les
+    `intervalle_ms` ou tous les `taille_lot` événements.
+    File pleine : l'événement est abandonné (et compté) plutôt que de bloquer la requête.
+    """
+
+    def __init__(self, taille_lot=200, intervalle_ms=500, taille_file=10000):
+        self.taille_lot = taille_lot
+        self.intervalle = intervalle_ms / 1000
+        self.taille_file = taille_file
+        self.ecrits = 0
+        self.perdus = 0
+        self._verrou = threading.Lock()
+        self._file = None
+        self._thread = None
+        self._pid = None
+
+    @property
+    def synchrone(self):
+        return self.intervalle <= 0
+
+    def _demarrer(self):
+        # Après un fork (workers gunicorn), le thread du parent n'existe pas dans l'enfant
+        if self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._verrou:
+            if self._pid == os.getpid() and self._thread.is_alive():
+                return
+            if self._pid is None:
+                atexit.register(self.vider, 2)
+            self._file = queue.Queue(maxsize=self.taille_file)
+            self._thread = threading.Thread(target=self._boucle, name='journal', daemon=True)
+            self._pid = os.getpid()
+            self._thread.start()
+
+    def enregistrer(self, type, acteur=None, foyer=None, objet=None, **donnees):
+        evenement = EvenementJournal(
+            type=type,
+            acteur_id=_identifiant(acteur),
+            foyer_id=_identifiant(foyer),
+            objet_id=_identifiant(objet),
+            donnees=donnees,
+            date=timezone.now(),
+        )
+        if self.synchrone:
+            self._ecrire([evenement])
+            return
+        self._demarrer()
+        try:
+            self._file.put_nowait(evenement)
+        except queue.Full:
+            with self._verrou:
+                self.perdus += 1
+                perdus = self.perdus
+            if perdus == 1 or perdus % 1000 == 0:
+                logger.warning("Journal saturé : %s événement(s) abandonné(s)", perdus)
+
+    def vider(self, timeout=5):
+        """Attend l'écriture de tous les événements enregistrés avant l'appel."""
+        if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+            return True
+        signal = threading.Event()
+        try:
+            self._file.put(signal, timeout=timeout)
+        except queue.Full:
+            return False
+        return signal.wait(timeout)
+
+    def statistiques(self):
+        return {
+            'en_attente': self._file.qsize() if self._file else 0,
+            'ecrits': self.ecrits,
+            'perdus': self.perdus,
+        }
+
+    # === THREAD D'ÉCRITURE ===
+    def _boucle(self):
+        while True:
+            lot, signaux = [], []
+            element = self._file.get()
+            echeance = time.monotonic() + self.intervalle
+            while True:
+                if isinstance(element, threading.Event):
+                    signaux.append(element)
+                    break  # vider() : on écrit sans attendre l'échéance
+                lot.append(element)
+                reste = echeance - time.monotonic()
+                if len(lot) >= self.taille_lot or reste <= 0:
+                    break
+                try:
+                    element = self._file.get(timeout=reste)
+                except queue.Empty:
+                    break
+            if lot:
+                self._ecrire(lot)
+            for signal in signaux:
+                signal.set()
+
+    def _ecrire(self, lot):
+        try:
+            EvenementJournal.objects.bulk_create(lot, batch_size=self.taille_lot)
+        except Exception:
+            # Un journal en échec ne doit ni faire échouer les requêtes ni s'accumuler
+            logger.exception("Écriture du journal impossible : %s événement(s) perdu(s)", len(lot))
+            with self._verrou:
+                self.perdus += len(lot)
+            if not self.synchrone:
+                connections.close_all()
+            return
+        with self._verrou:
+            self.ecrits += len(lot)
+        if not self.synchrone:
+            close_old_connections()
+
+
+journal = Journal(
+    taille_lot=getattr(settings, 'JOURNAL_TAILLE_LOT', 200),
+    intervalle_ms=getattr(settings, 'JOURNAL_INTERVALLE_MS', 500),
+    taille_file=getattr(settings, 'JOURNAL_TAILLE_FILE', 10000),
+)
+
+
+def journaliser(type, acteur=None, foyer=None, objet=None, **donnees):
+    journal.enregistrer(type, acteur=acteur, foyer=foyer, objet=objet, **donnees)
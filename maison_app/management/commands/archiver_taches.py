@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from maison_app.archivage import TAILLE_LOT, archiver_taches
+
+
+class Command(BaseCommand):
+    help = "Déplace vers les tables d'archive les tâches terminées depuis plus de N jours."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jours', type=int, default=30)
+        parser.add_argument('--taille-lot', type=int, default=TAILLE_LOT)
+
+    def handle(self, *args, **options):
+        total = archiver_taches(options['jours'], options['taille_lot'])
+        self.stdout.write(self.style.SUCCESS(f"{total} tâche(s) archivée(s)."))
@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = "Mesure le coût d'ouverture d'une connexion comparé à une connexion persistante."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200)
+        parser.add_argument('--database', default='default')
+
+    def _requete(self, connexion):
+        with connexion.cursor() as curseur:
+            curseur.execute('SELECT 1')
+            curseur.fetchone()
+
+    def handle(self, *args, **options):
+        alias, n = options['database'], options['iterations']
+
+        # Nouvelle connexion à chaque « requête » (comportement avec CONN_MAX_AGE=0)
+        debut = time.perf_counter()
+        for _ in range(n):
+            connexion = connections.create_connection(alias)
+            self._requete(connexion)
+            connexion.close()
+        par_connexion = (time.perf_counter() - debut) / n
+
+        # Connexion persistante réutilisée (CONN_MAX_AGE > 0 ou pool)
+        connexion = connections[alias]
+        self._requete(connexion)
+        debut = time.perf_counter()
+        for _ in range(n):
+            self._requete(connexion)
+        persistante = (time.perf_counter() - debut) / n
+
+        moteur = connexion.settings_dict['ENGINE'].rsplit('.', 1)[-1]
+        self.stdout.write(f"Base '{alias}' ({moteur}), {n} itérations")
+        self.stdout.write(f"  connexion neuve       : {par_connexion * 1000:.3f} ms / requête")
+        self.stdout.write(f"  connexion persistante : {persistante * 1000:.3f} ms / requête")
+        self.stdout.write(self.style.SUCCESS(
+            f"  gain par requête      : {(par_connexion - persistante) * 1000:.3f} ms"
+        ))
@@ -0,0 +1,41 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Mesure le coût des hacheurs de mots de passe et propose des paramètres pour une durée cible."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cible-ms', type=float, default=250.0, help="Durée visée par hachage.")
+        parser.add_argument('--iterations', type=int, default=5)
+
+    def _mesurer(self, hacheur, n):
+        debut = time.perf_counter()
+        for _ in range(n):
+            hacheur.encode('mot-de-passe-de-test', hacheur.salt())
+        return (time.perf_counter() - debut) / n * 1000
+
+    def handle(self, *args, **options):
+        cible, n = options['cible_ms'], options['iterations']
+        self.stdout.write(f"Hacheur actif : {settings.PASSWORD_HASHER} — cible {cible:.0f} ms")
+
+        for algorithme in ('pbkdf2_sha256', 'scrypt', 'argon2'):
+            try:
+                hacheur = get_hasher(algorithme)
+                duree = self._mesurer(hacheur, n)
+            except (ValueError, ImportError) as exc:
+                self.stdout.write(f"  {algorithme:<14} indisponible ({exc})")
+                continue
+
+            facteur = cible / duree
+            if algorithme == 'pbkdf2_sha256':
+                conseil = f"PASSWORD_PBKDF2_ITERATIONS={int(hacheur.iterations * facteur)}"
+            elif algorithme == 'scrypt':
+                # N doit rester une puissance de 2 : on ajuste plutôt p (coût linéaire)
+                conseil = f"PASSWORD_SCRYPT_P={max(1, round(hacheur.parallelism * facteur))}"
+            else:
+                conseil = f"PASSWORD_ARGON2_TIME_COST={max(1, round(hacheur.time_cost * facteur))}"
+            self.stdout.write(f"  {algorithme:<14} {duree:8.1f} ms  → {conseil}")
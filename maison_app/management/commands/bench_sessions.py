@@ -0,0 +1,58 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from maison_app.models import Utilisateur
+
+MOTEURS = [
+    'django.contrib.sessions.backends.db',
+    'django.contrib.sessions.backends.cached_db',
+    'django.contrib.sessions.backends.signed_cookies',
+]
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Compare les requêtes SQL de session par requête HTTP authentifiée selon le moteur de session."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requetes', type=int, default=100)
+        parser.add_argument('--url', default=None, help="Vue @login_required à appeler (défaut : liste_taches).")
+
+    def handle(self, *args, **options):
+        url = options['url'] or reverse('liste_taches')
+        n = options['requetes']
+        self.stdout.write(f"{n} requêtes GET {url}")
+        try:
+            # Utilisateur de test créé puis annulé avec la transaction
+            with transaction.atomic():
+                utilisateur = Utilisateur.objects.create_user(
+                    email='bench-sessions@exemple.invalid', username='bench-sessions', password=None,
+                )
+                for moteur in MOTEURS:
+                    self._mesurer(moteur, utilisateur, url, n)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def _mesurer(self, moteur, utilisateur, url, n):
+        with override_settings(SESSION_ENGINE=moteur, ALLOWED_HOSTS=['*']):
+            client = Client()
+            client.force_login(utilisateur)
+            with CaptureQueriesContext(connection) as requetes:
+                debut = time.perf_counter()
+                for _ in range(n):
+                    client.get(url)
+                duree = (time.perf_counter() - debut) / n * 1000
+        sessions = sum('django_session' in q['sql'] for q in requetes.captured_queries)
+        self.stdout.write(
+            f"  {moteur.rsplit('.', 1)[-1]:<15} {sessions / n:5.2f} requête(s) session / req. "
+            f"{len(requetes.captured_queries) / n:5.2f} au total  {duree:6.2f} ms / req."
+        )
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from maison_app.previsions import FENETRE_JOURS, calculer_previsions
+
+
+class Command(BaseCommand):
+    help = "Recalcule les prévisions d'épuisement de l'inventaire (à lancer périodiquement, ex. cron quotidien)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fenetre', type=int, default=FENETRE_JOURS, help="Jours d'historique de consommation.")
+
+    def handle(self, *args, **options):
+        total = calculer_previsions(options['fenetre'])
+        self.stdout.write(self.style.SUCCESS(f"{total} prévision(s) calculée(s)."))
@@ -0,0 +1,41 @@
+import asyncio
+
+from django.core.management.base import BaseCommand
+
+from maison_app.dispositifs import Planificateur
+
+
+class Command(BaseCommand):
+    help = "Exécute les actions planifiées des dispositifs (lampes, thermostats, capteurs)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--une-fois', action='store_true', help="Traite les actions échues puis s'arrête.")
+        parser.add_argument('--concurrence', type=int, default=200, help="Actions exécutées en parallèle.")
+        parser.add_argument('--taille-lot', type=int, default=500, help="Résultats enregistrés par écriture groupée.")
+        parser.add_argument('--intervalle', type=float, default=1.0, help="Secondes entre deux rechargements.")
+
+    def handle(self, *args, **options):
+        planificateur = Planificateur(
+            concurrence=options['concurrence'],
+            taille_lot=options['taille_lot'],
+            intervalle=options['intervalle'],
+        )
+        if options['une_fois']:
+            total = asyncio.run(self._une_fois(planificateur))
+            self.stdout.write(self.style.SUCCESS(f"{total} action(s) exécutée(s)."))
+            return
+
+        self.stdout.write("Planificateur démarré (Ctrl+C pour arrêter).")
+        try:
+            asyncio.run(planificateur.tourner())
+        except KeyboardInterrupt:
+            self.stdout.write("Planificateur arrêté.")
+
+    async def _une_fois(self, planificateur):
+        total = 0
+        while await planificateur.charger():
+            traitees = await planificateur.executer_dues()
+            if not traitees:
+                break
+            total += traitees
+        return total
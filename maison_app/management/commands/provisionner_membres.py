@@ -0,0 +1,31 @@
+import csv
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from maison_app.models import ROLE_CHOICES, Foyer
+from maison_app.provisionnement import provisionner_membres
+
+
+class Command(BaseCommand):
+    help = "Crée en masse les membres d'un foyer depuis un CSV (colonnes : email, nom, mot_de_passe)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('fichier')
+        parser.add_argument('--foyer', type=int, required=True)
+        parser.add_argument('--role', default='membre', choices=[role for role, _ in ROLE_CHOICES])
+        parser.add_argument('--processus', type=int, default=os.cpu_count() or 1, help="Processus de hachage (défaut : nb de CPU).")
+
+    def handle(self, *args, **options):
+        try:
+            foyer = Foyer.objects.get(id=options['foyer'])
+        except Foyer.DoesNotExist:
+            raise CommandError(f"Foyer {options['foyer']} introuvable.")
+
+        with open(options['fichier'], newline='', encoding='utf-8') as fichier:
+            membres = list(csv.DictReader(fichier))
+
+        bilan = provisionner_membres(membres, foyer, options['role'], options['processus'])
+        self.stdout.write(self.style.SUCCESS(
+            f"{bilan['crees']} membre(s) créé(s), {bilan['ignores']} ignoré(s) dans '{foyer.nom}'."
+        ))
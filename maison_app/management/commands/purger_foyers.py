@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from maison_app.suppression import purger_foyers_supprimes
+
+
+class Command(BaseCommand):
+    help = "Termine la suppression physique des foyers marqués comme supprimés."
+
+    def handle(self, *args, **options):
+        total = purger_foyers_supprimes()
+        self.stdout.write(self.style.SUCCESS(f"{total} foyer(s) supprimé(s)."))
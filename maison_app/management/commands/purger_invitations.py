@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from maison_app.invitations import TAILLE_LOT, purger_invitations_expirees
+
+
+class Command(BaseCommand):
+    help = "Supprime les invitations expirées (plus de 7 jours), par lots."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--taille-lot', type=int, default=TAILLE_LOT)
+
+    def handle(self, *args, **options):
+        total = purger_invitations_expirees(options['taille_lot'])
+        self.stdout.write(self.style.SUCCESS(f"{total} invitation(s) supprimée(s)."))
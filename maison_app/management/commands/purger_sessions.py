@@ -0,0 +1,35 @@
+import time
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = "Supprime les sessions expirées par petits lots, sans verrouiller la table django_session."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--taille-lot', type=int, default=1000)
+        parser.add_argument('--pause', type=float, default=0.05, help="Secondes entre deux lots.")
+
+    def handle(self, *args, **options):
+        if settings.SESSION_ENGINE.endswith(('.signed_cookies', '.cache')):
+            self.stdout.write("Sessions hors base de données : rien à purger.")
+            return
+
+        maintenant = timezone.now()
+        total = 0
+        while True:
+            # expire_date est indexé : chaque lot est une lecture d'index puis un DELETE par clé primaire
+            cles = list(
+                Session.objects.filter(expire_date__lt=maintenant)
+                .values_list('session_key', flat=True)[:options['taille_lot']]
+            )
+            if not cles:
+                break
+            Session.objects.filter(session_key__in=cles).delete()
+            total += len(cles)
+            time.sleep(options['pause'])
+
+        self.stdout.write(self.style.SUCCESS(f"{total} session(s) expirée(s) supprimée(s)."))
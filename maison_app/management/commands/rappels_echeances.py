@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from maison_app.rappels import HORIZON_JOURS, SORTIES, TAILLE_LOT, envoyer_rappels
+
+
+class Command(BaseCommand):
+    help = "Envoie à chaque membre le récapitulatif de ses tâches en retard ou proches de l'échéance."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sortie', choices=sorted(SORTIES), default='console')
+        parser.add_argument('--dossier', help="Dossier des messages pour --sortie fichier.")
+        parser.add_argument('--horizon', type=int, default=HORIZON_JOURS, help="Jours à venir inclus.")
+        parser.add_argument('--taille-lot', type=int, default=TAILLE_LOT)
+
+    def handle(self, *args, **options):
+        options_sortie = {}
+        if options['sortie'] == 'fichier':
+            if not options['dossier']:
+                raise CommandError("--dossier est requis avec --sortie fichier.")
+            options_sortie['file_path'] = options['dossier']
+        total = envoyer_rappels(options['sortie'], options['horizon'], options['taille_lot'], **options_sortie)
+        self.stderr.write(self.style.SUCCESS(f"{total} récapitulatif(s) envoyé(s)."))
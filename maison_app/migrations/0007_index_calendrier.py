@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('maison_app', '0006_tache_complete_par_tache_terminee'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='evenement',
+            index=models.Index(fields=['id_foyer', 'date_debut', 'date_fin'], name='evenement_foyer_periode_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='evenement',
+            index=models.Index(fields=['id_foyer', 'date_fin'], name='evenement_foyer_fin_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tache',
+            index=models.Index(fields=['id_foyer', 'date_limite'], name='tache_foyer_limite_idx'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:49
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+
+
+def marquer_actions_existantes(apps, schema_editor):
+    # Les actions antérieures au planificateur sont considérées comme déjà exécutées
+    ActionDispositif = apps.get_model('maison_app', 'ActionDispositif')
+    ActionDispositif.objects.update(statut='executee', date_prevue=F('date_execution'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('maison_app', '0007_index_calendrier'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='actiondispositif',
+            name='date_prevue',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='actiondispositif',
+            name='resultat',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='actiondispositif',
+            name='statut',
+            field=models.CharField(choices=[('en_attente', 'En attente'), ('executee', 'Exécutée'), ('echec', 'Échec')], default='en_attente', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='actiondispositif',
+            name='date_execution',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(marquer_actions_existantes, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='actiondispositif',
+            index=models.Index(fields=['statut', 'date_prevue'], name='action_statut_prevue_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('maison_app', '0008_planification_dispositifs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aliment',
+            name='archive',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='listecourses',
+            name='date_achat',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='listecourses',
+            name='statut',
+            field=models.CharField(choices=[('En cours', 'En cours'), ('Acheté', 'Acheté')], default='En cours', max_length=20),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('maison_app', '0010_date_modification'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='invitation',
+            index=models.Index(fields=['date_creation'], name='invitation_creation_idx'),
+        ),
+    ]
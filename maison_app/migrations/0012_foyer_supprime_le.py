@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('maison_app', '0011_index_invitation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='foyer',
+            name='supprime_le',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
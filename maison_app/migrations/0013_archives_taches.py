@@ -0,0 +1,146 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def dater_taches_terminees(apps, schema_editor):
+    # Meilleure approximation disponible pour les tâches terminées avant ce champ
+    Tache = apps.get_model('maison_app', 'Tache')
+    Tache.objects.filter(terminee=True, date_completion__isnull=True).update(date_completion=F('date_modification'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('maison_app', '0012_foyer_supprime_le'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChatMessageArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('contenu', models.TextField()),
+                ('date_envoi', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'chat_message_archive',
+            },
+        ),
+        migrations.CreateModel(
+            name='HistoriqueTacheArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('date_execution', models.DateTimeField()),
+                ('duree', models.TimeField(null=True)),
+                ('commentaire', models.TextField(blank=True)),
+            ],
+            options={
+                'db_table': 'historique_tache_archive',
+            },
+        ),
+        migrations.CreateModel(
+            name='TacheArchivee',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('titre', models.CharField(max_length=100)),
+                ('description', models.TextField(blank=True)),
+                ('date_limite', models.DateField(blank=True, null=True)),
+                ('priorite', models.CharField(blank=True, max_length=20, null=True)),
+                ('terminee', models.BooleanField(default=True)),
+                ('date_completion', models.DateTimeField(blank=True, null=True)),
+                ('date_modification', models.DateTimeField()),
+                ('date_archivage', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'tache_archive',
+            },
+        ),
+        migrations.CreateModel(
+            name='TacheAssigneeArchivee',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('date_assignation', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'tache_assignee_archive',
+            },
+        ),
+        migrations.AddField(
+            model_name='tache',
+            name='date_completion',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='tache',
+            index=models.Index(fields=['terminee', 'date_completion'], name='tache_terminee_completion_idx'),
+        ),
+        migrations.AddField(
+            model_name='chatmessagearchive',
+            name='id_user',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='historiquetachearchive',
+            name='id_user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='tachearchivee',
+            name='complete_par',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='tachearchivee',
+            name='id_animal',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='maison_app.animal'),
+        ),
+        migrations.AddField(
+            model_name='tachearchivee',
+            name='id_foyer',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='maison_app.foyer'),
+        ),
+        migrations.AddField(
+            model_name='tachearchivee',
+            name='id_piece',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='maison_app.piece'),
+        ),
+        migrations.AddField(
+            model_name='tachearchivee',
+            name='id_statut',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='maison_app.statuttache'),
+        ),
+        migrations.AddField(
+            model_name='historiquetachearchive',
+            name='id_tache',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='historique', to='maison_app.tachearchivee'),
+        ),
+        migrations.AddField(
+            model_name='chatmessagearchive',
+            name='id_tache',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='messages', to='maison_app.tachearchivee'),
+        ),
+        migrations.AddField(
+            model_name='tacheassigneearchivee',
+            name='id_piece',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='maison_app.piece'),
+        ),
+        migrations.AddField(
+            model_name='tacheassigneearchivee',
+            name='id_tache',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='assignations', to='maison_app.tachearchivee'),
+        ),
+        migrations.AddField(
+            model_name='tacheassigneearchivee',
+            name='id_user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='tachearchivee',
+            index=models.Index(fields=['id_foyer', 'date_completion'], name='tache_archive_foyer_idx'),
+        ),
+        migrations.RunPython(dater_taches_terminees, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:04
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('maison_app', '0013_archives_taches'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EvenementJournal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('type', models.CharField(choices=[('tache_creee', 'Tâche créée'), ('tache_terminee', 'Tâche terminée'), ('tache_supprimee', 'Tâche supprimée'), ('membre_supprime', 'Membre supprimé'), ('invitation_utilisee', 'Invitation utilisée')], max_length=30)),
+                ('acteur_id', models.BigIntegerField(null=True)),
+                ('foyer_id', models.BigIntegerField(null=True)),
+                ('objet_id', models.BigIntegerField(null=True)),
+                ('donnees', models.JSONField(blank=True, default=dict)),
+                ('date', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'journal_evenement',
+                'indexes': [models.Index(fields=['foyer_id', '-date'], name='journal_foyer_date_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('maison_app', '0014_journal_evenement'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tache',
+            name='date_debut',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='tachearchivee',
+            name='date_debut',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='historiquetache',
+            name='duree',
+            field=models.DurationField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='historiquetachearchive',
+            name='duree',
+            field=models.DurationField(null=True),
+        ),
+        migrations.CreateModel(
+            name='DureeMoyenne',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.PositiveIntegerField(default=0)),
+                ('moyenne_secondes', models.FloatField(default=0)),
+                ('id_foyer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='durees_moyennes', to='maison_app.foyer')),
+                ('id_piece', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='durees_moyennes', to='maison_app.piece')),
+            ],
+            options={
+                'db_table': 'duree_moyenne',
+                'constraints': [models.UniqueConstraint(fields=('id_foyer', 'id_piece'), name='duree_moyenne_piece_unique'), models.UniqueConstraint(condition=models.Q(('id_piece__isnull', True)), fields=('id_foyer',), name='duree_moyenne_foyer_unique')],
+            },
+        ),
+    ]
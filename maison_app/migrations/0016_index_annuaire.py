@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:07
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('maison_app', '0015_durees_taches'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='utilisateur',
+            index=models.Index(django.db.models.functions.text.Lower('email'), name='utilisateur_email_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='utilisateur',
+            index=models.Index(django.db.models.functions.text.Lower('nom'), name='utilisateur_nom_lower_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('maison_app', '0016_index_annuaire'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PrevisionInventaire',
+            fields=[
+                ('id_inventaire', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='prevision', serialize=False, to='maison_app.inventaire')),
+                ('consommation_journaliere', models.FloatField(default=0)),
+                ('jours_restants', models.FloatField(null=True)),
+                ('date_epuisement', models.DateField(null=True)),
+                ('nb_utilisations', models.PositiveIntegerField(default=0)),
+                ('date_calcul', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'prevision_inventaire',
+                'indexes': [models.Index(fields=['date_epuisement'], name='prevision_epuisement_idx')],
+            },
+        ),
+    ]
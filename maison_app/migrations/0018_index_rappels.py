@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('maison_app', '0017_previsions_inventaire'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tache',
+            index=models.Index(condition=models.Q(('terminee', False)), fields=['id_foyer', 'date_limite'], name='tache_ouverte_echeance_idx'),
+        ),
+    ]
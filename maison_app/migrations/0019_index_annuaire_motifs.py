@@ -0,0 +1,33 @@
+from django.db import migrations
+
+# PostgreSQL : sous une collation linguistique, LIKE 'préfixe%' n'utilise un index
+# que s'il est déclaré avec text_pattern_ops (voir maison_app.annuaire.filtre_prefixe)
+INDEX = (
+    ('utilisateur_email_lower_motif_idx', 'email'),
+    ('utilisateur_nom_lower_motif_idx', 'nom'),
+)
+
+
+def creer_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for nom, colonne in INDEX:
+        schema_editor.execute(f'CREATE INDEX IF NOT EXISTS {nom} ON utilisateur (lower({colonne}) text_pattern_ops)')
+
+
+def supprimer_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for nom, _ in INDEX:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {nom}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('maison_app', '0018_index_rappels'),
+    ]
+
+    operations = [
+        migrations.RunPython(creer_index, supprimer_index),
+    ]
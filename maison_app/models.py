@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.db import models
+from django.db.models.functions import Lower
 import uuid
 from django.utils import timezone
 from datetime import timedelta
@@ -38,6 +39,7 @@ class Utilisateur(AbstractUser):
     nom = models.CharField(max_length=100, blank=True)  # ← NOM AFFICHÉ
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='membre')
     id_foyer = models.ForeignKey('Foyer', on_delete=models.SET_NULL, null=True, blank=True)
+    date_modification = models.DateTimeField(auto_now=True)  # ← version des fragments en cache
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username']
@@ -46,16 +48,33 @@ class Utilisateur(AbstractUser):
 
     class Meta:
         db_table = 'utilisateur'
+        indexes = [
+            # Recherche par préfixe de l'annuaire (maison_app.annuaire) ; PostgreSQL : + index text_pattern_ops (0019)
+            models.Index(Lower('email'), name='utilisateur_email_lower_idx'),
+            models.Index(Lower('nom'), name='utilisateur_nom_lower_idx'),
+        ]
 
     def __str__(self):
         return self.nom or self.email
 
 # === FOYER ===
+class FoyerManager(models.Manager):
+    # Les foyers en cours de suppression (arrière-plan) n'apparaissent plus
+    def get_queryset(self):
+        return super().get_queryset().filter(supprime_le__isnull=True)
+
 class Foyer(models.Model):
     nom = models.CharField(max_length=100)
     photo = models.ImageField(upload_to='foyers/', null=True, blank=True)  # ← NOUVEAU
     description = models.TextField(blank=True)  # ← NOUVEAU
+    date_modification = models.DateTimeField(auto_now=True)
+    supprime_le = models.DateTimeField(null=True, blank=True)
+
+    objects = FoyerManager()
+    tous = models.Manager()
 # === INVITATION ===
+DUREE_VALIDITE_INVITATION = timedelta(days=7)
+
 class Invitation(models.Model):
     code = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
     foyer = models.ForeignKey('Foyer', on_delete=models.CASCADE)
@@ -65,10 +84,13 @@ class Invitation(models.Model):
     utilise = models.BooleanField(default=False)
 
     def est_valide(self):
-        return not self.utilise and self.date_creation >= timezone.now() - timedelta(days=7)
+        return not self.utilise and self.date_creation >= timezone.now() - DUREE_VALIDITE_INVITATION
 
     class Meta:
         db_table = 'invitation'
+        indexes = [
+            models.Index(fields=['date_creation'], name='invitation_creation_idx'),
+        ]
 
     def __str__(self):
         return str(self.code)
@@ -77,6 +99,7 @@ class Invitation(models.Model):
 class Piece(models.Model):
     nom = models.CharField(max_length=100)
     id_foyer = models.ForeignKey(Foyer, on_delete=models.CASCADE, related_name='pieces')  # ← AJOUTÉ
+    date_modification = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = 'piece'
@@ -88,6 +111,7 @@ class Animal(models.Model):
     nom = models.CharField(max_length=100)
     id_foyer = models.ForeignKey(Foyer, on_delete=models.SET_NULL, null=True, related_name='animaux')  # ← AJOUTÉ
     id_piece = models.ForeignKey(Piece, on_delete=models.SET_NULL, null=True)
+    date_modification = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = 'animal'
@@ -111,6 +135,16 @@ class StatutTache(models.Model):
         return self.libelle
 
 # === TÂCHE ===
+class TacheManager(models.Manager):
+    # Tâches actives (table chaude) par défaut ; les archivées restent accessibles
+    def archivees(self):
+        return TacheArchivee.objects.all()
+
+    def toutes(self, *champs, **filtres):
+        """Actives et archivées, mêmes filtres et mêmes champs (valeurs, via UNION ALL)."""
+        actives = self.filter(**filtres).values(*champs)
+        return actives.union(TacheArchivee.objects.filter(**filtres).values(*champs), all=True)
+
 class Tache(models.Model):
     titre = models.CharField(max_length=100)
     description = models.TextField(blank=True)
@@ -126,9 +160,50 @@ class Tache(models.Model):
     id_animal = models.ForeignKey(Animal, on_delete=models.SET_NULL, null=True, blank=True)
     complete_par = models.ForeignKey(Utilisateur, on_delete=models.SET_NULL, null=True, blank=True, related_name='taches_completees')
     terminee = models.BooleanField(default=False)
+    date_debut = models.DateTimeField(null=True, blank=True)
+    date_completion = models.DateTimeField(null=True, blank=True)
+    date_modification = models.DateTimeField(auto_now=True)
+
+    objects = TacheManager()
 
     class Meta:
         db_table = 'tache'
+        indexes = [
+            models.Index(fields=['id_foyer', 'date_limite'], name='tache_foyer_limite_idx'),
+            models.Index(fields=['terminee', 'date_completion'], name='tache_terminee_completion_idx'),
+            # Rappels d'échéance : tâches ouvertes seulement, parcourues par foyer
+            models.Index(
+                fields=['id_foyer', 'date_limite'], condition=models.Q(terminee=False), name='tache_ouverte_echeance_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return self.titre
+
+# === ARCHIVES DES TÂCHES TERMINÉES ===
+# Mêmes colonnes que les tables chaudes (mêmes identifiants), remplies par maison_app.archivage
+class TacheArchivee(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    titre = models.CharField(max_length=100)
+    description = models.TextField(blank=True)
+    date_limite = models.DateField(null=True, blank=True)
+    priorite = models.CharField(max_length=20, null=True, blank=True)
+    id_statut = models.ForeignKey(StatutTache, on_delete=models.SET_NULL, null=True, related_name='+')
+    id_foyer = models.ForeignKey(Foyer, on_delete=models.SET_NULL, null=True, related_name='+')
+    id_piece = models.ForeignKey(Piece, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    id_animal = models.ForeignKey(Animal, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    complete_par = models.ForeignKey(Utilisateur, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    terminee = models.BooleanField(default=True)
+    date_debut = models.DateTimeField(null=True, blank=True)
+    date_completion = models.DateTimeField(null=True, blank=True)
+    date_modification = models.DateTimeField()
+    date_archivage = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'tache_archive'
+        indexes = [
+            models.Index(fields=['id_foyer', 'date_completion'], name='tache_archive_foyer_idx'),
+        ]
 
     def __str__(self):
         return self.titre
@@ -146,6 +221,16 @@ class TacheAssignee(models.Model):
     def __str__(self):
         return f"{self.id_tache.titre} - {self.id_user.email}"
 
+class TacheAssigneeArchivee(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    id_tache = models.ForeignKey(TacheArchivee, on_delete=models.CASCADE, related_name='assignations')
+    id_user = models.ForeignKey(Utilisateur, on_delete=models.CASCADE, related_name='+')
+    id_piece = models.ForeignKey(Piece, on_delete=models.SET_NULL, null=True, related_name='+')
+    date_assignation = models.DateTimeField()
+
+    class Meta:
+        db_table = 'tache_assignee_archive'
+
 # === TÂCHE RÉCURRENTE ===
 class TacheRecurrente(models.Model):
     id_tache = models.ForeignKey(Tache, on_delete=models.CASCADE)
@@ -170,7 +255,8 @@ class ListeCourses(models.Model):
     statut = models.CharField(max_length=20, choices=[
         ('En cours', 'En cours'),
         ('Acheté', 'Acheté')
-    ])
+    ], default='En cours')
+    date_achat = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         db_table = 'liste_courses'
@@ -184,6 +270,7 @@ class Aliment(models.Model):
     id_liste = models.ForeignKey(ListeCourses, on_delete=models.CASCADE)
     quantite = models.DecimalField(max_digits=10, decimal_places=2, null=True)
     unite = models.CharField(max_length=20, null=True)
+    archive = models.BooleanField(default=False)
 
     class Meta:
         db_table = 'aliment'
@@ -204,6 +291,16 @@ class ChatMessage(models.Model):
     def __str__(self):
         return f"{self.id_user.email if self.id_user else 'Anonyme'} - {self.date_envoi}"
 
+class ChatMessageArchive(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    id_user = models.ForeignKey(Utilisateur, on_delete=models.SET_NULL, null=True, related_name='+')
+    contenu = models.TextField()
+    date_envoi = models.DateTimeField()
+    id_tache = models.ForeignKey(TacheArchivee, on_delete=models.CASCADE, related_name='messages')
+
+    class Meta:
+        db_table = 'chat_message_archive'
+
 # === RÉCOMPENSE ===
 class Recompense(models.Model):
     id_user = models.ForeignKey(Utilisateur, on_delete=models.CASCADE)
@@ -255,6 +352,25 @@ class Inventaire(models.Model):
     def __str__(self):
         return self.nom
 
+# === PRÉVISION D'ÉPUISEMENT ===
+# Recalculée en bloc par `manage.py calculer_previsions` (maison_app.previsions), lue telle quelle par les vues
+class PrevisionInventaire(models.Model):
+    id_inventaire = models.OneToOneField(Inventaire, on_delete=models.CASCADE, primary_key=True, related_name='prevision')
+    consommation_journaliere = models.FloatField(default=0)
+    jours_restants = models.FloatField(null=True)  # nul : aucune consommation observée
+    date_epuisement = models.DateField(null=True)
+    nb_utilisations = models.PositiveIntegerField(default=0)
+    date_calcul = models.DateTimeField()
+
+    class Meta:
+        db_table = 'prevision_inventaire'
+        indexes = [
+            models.Index(fields=['date_epuisement'], name='prevision_epuisement_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.id_inventaire_id} : {self.date_epuisement or '—'}"
+
 # === UTILISATION RESSOURCE ===
 class UtilisationRessource(models.Model):
     id_inventaire = models.ForeignKey(Inventaire, on_delete=models.CASCADE)
@@ -278,6 +394,11 @@ class Evenement(models.Model):
 
     class Meta:
         db_table = 'evenement'
+        indexes = [
+            # Requêtes de chevauchement : date_debut <= fin AND date_fin >= debut
+            models.Index(fields=['id_foyer', 'date_debut', 'date_fin'], name='evenement_foyer_periode_idx'),
+            models.Index(fields=['id_foyer', 'date_fin'], name='evenement_foyer_fin_idx'),
+        ]
 
     def __str__(self):
         return self.titre
@@ -319,10 +440,20 @@ class ActionDispositif(models.Model):
         ('allumer', 'Allumer'),
         ('eteindre', 'Éteindre')
     ])
-    date_execution = models.DateTimeField(auto_now_add=True)
+    date_prevue = models.DateTimeField(default=timezone.now)
+    statut = models.CharField(max_length=20, choices=[
+        ('en_attente', 'En attente'),
+        ('executee', 'Exécutée'),
+        ('echec', 'Échec')
+    ], default='en_attente')
+    resultat = models.TextField(blank=True)
+    date_execution = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         db_table = 'action_dispositif'
+        indexes = [
+            models.Index(fields=['statut', 'date_prevue'], name='action_statut_prevue_idx'),
+        ]
 
     def __str__(self):
         return f"{self.id_dispositif.nom} - {self.action}"
@@ -362,7 +493,7 @@ class HistoriqueTache(models.Model):
     id_tache = models.ForeignKey(Tache, on_delete=models.CASCADE)
     id_user = models.ForeignKey(Utilisateur, on_delete=models.CASCADE)
     date_execution = models.DateTimeField(auto_now_add=True)
-    duree = models.TimeField(null=True)
+    duree = models.DurationField(null=True)
     commentaire = models.TextField(blank=True)
 
     class Meta:
@@ -371,6 +502,42 @@ class HistoriqueTache(models.Model):
     def __str__(self):
         return f"{self.id_tache.titre} - {self.id_user.email}"
 
+class HistoriqueTacheArchive(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    id_tache = models.ForeignKey(TacheArchivee, on_delete=models.CASCADE, related_name='historique')
+    id_user = models.ForeignKey(Utilisateur, on_delete=models.CASCADE, related_name='+')
+    date_execution = models.DateTimeField()
+    duree = models.DurationField(null=True)
+    commentaire = models.TextField(blank=True)
+
+    class Meta:
+        db_table = 'historique_tache_archive'
+
+# === DURÉES MOYENNES ===
+# Moyenne glissante des durées d'exécution, tenue à jour à chaque tâche terminée
+# (id_piece nul : toutes pièces confondues pour le foyer)
+class DureeMoyenne(models.Model):
+    id_foyer = models.ForeignKey(Foyer, on_delete=models.CASCADE, related_name='durees_moyennes')
+    id_piece = models.ForeignKey(Piece, on_delete=models.CASCADE, null=True, blank=True, related_name='durees_moyennes')
+    nombre = models.PositiveIntegerField(default=0)
+    moyenne_secondes = models.FloatField(default=0)
+
+    class Meta:
+        db_table = 'duree_moyenne'
+        constraints = [
+            models.UniqueConstraint(fields=['id_foyer', 'id_piece'], name='duree_moyenne_piece_unique'),
+            models.UniqueConstraint(
+                fields=['id_foyer'], condition=models.Q(id_piece__isnull=True), name='duree_moyenne_foyer_unique',
+            ),
+        ]
+
+    @property
+    def moyenne(self):
+        return timedelta(seconds=self.moyenne_secondes)
+
+    def __str__(self):
+        return f"Foyer {self.id_foyer_id} / pièce {self.id_piece_id or '*'} : {self.moyenne} ({self.nombre})"
+
 # === SUGGESTION TÂCHE ===
 class SuggestionTache(models.Model):
     titre = models.CharField(max_length=100)
@@ -431,4 +598,33 @@ class InteractionIa(models.Model):
         db_table = 'interaction_ia'
 
     def __str__(self):
-        return f"{self.id_user.email} - {self.date_interaction}"
\ No newline at end of file
+        return f"{self.id_user.email} - {self.date_interaction}"
+
+# === JOURNAL D'AUDIT ===
+TYPES_EVENEMENT_JOURNAL = [
+    ('tache_creee', 'Tâche créée'),
+    ('tache_terminee', 'Tâche terminée'),
+    ('tache_supprimee', 'Tâche supprimée'),
+    ('membre_supprime', 'Membre supprimé'),
+    ('invitation_utilisee', 'Invitation utilisée'),
+]
+
+
+class EvenementJournal(models.Model):
+    # Identifiants bruts, sans clé étrangère : l'entrée survit à la suppression de l'objet
+    # et peut être écrite après coup par le thread du journal
+    type = models.CharField(max_length=30, choices=TYPES_EVENEMENT_JOURNAL)
+    acteur_id = models.BigIntegerField(null=True)
+    foyer_id = models.BigIntegerField(null=True)
+    objet_id = models.BigIntegerField(null=True)
+    donnees = models.JSONField(default=dict, blank=True)
+    date = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'journal_evenement'
+        indexes = [
+            models.Index(fields=['foyer_id', '-date'], name='journal_foyer_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.date:%Y-%m-%d %H:%M} {self.type} ({self.objet_id})"
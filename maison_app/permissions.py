@@ -0,0 +1,72 @@
+# maison_app/permissions.py
+from enum import IntFlag, auto
+from functools import lru_cache, wraps
+
+from django.contrib import messages
+from django.shortcuts import redirect
+
+from .models import ROLE_CHOICES
+
+
+# === CAPACITÉS ===
+class Capacite(IntFlag):
+    GERER_FOYER = auto()        # créer / supprimer un foyer
+    GERER_PIECES = auto()
+    GERER_ANIMAUX = auto()
+    AJOUTER_TACHES = auto()
+    TERMINER_TACHES = auto()
+    SUPPRIMER_TACHES = auto()
+    INVITER = auto()
+    GERER_MEMBRES = auto()
+    VOIR_MEMBRES = auto()       # annuaire des membres par foyer
+    GERER_COURSES = auto()
+    VOIR_BUDGET = auto()
+    GERER_BUDGET = auto()       # dépenses et budgets du foyer
+
+
+TOUTES = Capacite(sum(Capacite))
+PARTICIPANT = Capacite.AJOUTER_TACHES | Capacite.TERMINER_TACHES | Capacite.GERER_COURSES
+
+ROLE_CAPACITES = {
+    'admin': TOUTES,
+    'superviseur': PARTICIPANT | Capacite.SUPPRIMER_TACHES | Capacite.VOIR_MEMBRES | Capacite.VOIR_BUDGET,
+    'tresorier': PARTICIPANT | Capacite.VOIR_BUDGET | Capacite.GERER_BUDGET,
+    'membre': PARTICIPANT | Capacite.VOIR_BUDGET,
+    'junior': Capacite.TERMINER_TACHES | Capacite.GERER_COURSES,
+    'invite': Capacite.TERMINER_TACHES,
+    'observateur': Capacite(0),
+}
+assert set(ROLE_CAPACITES) == {role for role, _ in ROLE_CHOICES}
+
+
+# === RÉSOLUTION ===
+@lru_cache(maxsize=None)
+def capacites_du_role(role):
+    return int(ROLE_CAPACITES.get(role, 0))
+
+
+@lru_cache(maxsize=None)
+def capacite_par_nom(nom):
+    return int(Capacite[nom.upper()])
+
+
+def a_permission(user, capacite):
+    """Aucune requête : le rôle est déjà chargé avec l'utilisateur."""
+    if not user.is_authenticated:
+        return False
+    if isinstance(capacite, str):
+        capacite = capacite_par_nom(capacite)
+    return capacites_du_role(user.role) & capacite == capacite
+
+
+def permission_requise(capacite, message="Accès refusé.", redirection='liste_foyers'):
+    """Décorateur de vue : à placer sous @login_required."""
+    def decorateur(vue):
+        @wraps(vue)
+        def vue_protegee(request, *args, **kwargs):
+            if not a_permission(request.user, capacite):
+                messages.error(request, message)
+                return redirect(redirection)
+            return vue(request, *args, **kwargs)
+        return vue_protegee
+    return decorateur
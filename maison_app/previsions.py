@@ -0,0 +1,121 @@
+# maison_app/previsions.py
+import math
+from datetime import timedelta
+
+import numpy as np
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .courses import enregistrer_lignes, normaliser
+from .models import Aliment, Inventaire, PrevisionInventaire, UtilisationRessource
+
+FENETRE_JOURS = 60     # historique de consommation pris en compte
+HORIZON_ACHAT = 7      # articles épuisés d'ici là : proposés pour les courses
+COUVERTURE_JOURS = 14  # quantité proposée : de quoi tenir ce nombre de jours
+JOURS_MAX = 3650       # au-delà, pas de date d'épuisement
+TAILLE_LOT = 2000
+
+
+# === CALCUL (VECTORISÉ) ===
+def estimer(ids, stocks, ajouts, utilisations, debut, maintenant):
+    """
+    Débit journalier et jours restants de tous les articles d'un coup.
+    `ids` (triés), `stocks`, `ajouts` (timestamps) : un élément par article ;
+    `utilisations` : tableau (n, 2) de (id_inventaire, quantité) sur la fenêtre.
+    Le débit est la consommation observée rapportée à la période d'observation
+    (depuis le début de la fenêtre, ou depuis l'ajout de l'article s'il est plus récent).
+    """
+    rangs = np.searchsorted(ids, utilisations[:, 0].astype(np.int64))
+    consommees = np.bincount(rangs, weights=utilisations[:, 1], minlength=len(ids))
+    nombres = np.bincount(rangs, minlength=len(ids))
+
+    periodes = np.maximum((maintenant - np.maximum(ajouts, debut)) / 86400.0, 1.0)
+    debits = consommees / periodes
+    with np.errstate(divide='ignore', invalid='ignore'):
+        jours = np.where(debits > 0, np.maximum(stocks, 0.0) / debits, np.nan)
+    return debits, jours, nombres
+
+
+def calculer_previsions(fenetre_jours=FENETRE_JOURS, maintenant=None):
+    """Recalcule les prévisions de tous les articles : 2 SELECT, puis des upserts par lots."""
+    maintenant = maintenant or timezone.now()
+    debut = maintenant - timedelta(days=fenetre_jours)
+
+    articles = list(Inventaire.objects.order_by('id').values_list('id', 'quantite', 'date_ajout'))
+    if not articles:
+        return 0
+    ids = np.array([article[0] for article in articles], dtype=np.int64)
+    stocks = np.array([article[1] for article in articles], dtype=float)
+    ajouts = np.array([article[2].timestamp() for article in articles], dtype=float)
+
+    utilisations = np.array(
+        list(
+            UtilisationRessource.objects
+            .filter(date_utilisation__gte=debut)
+            .values_list('id_inventaire_id', 'quantite_utilisee')
+            .iterator(chunk_size=TAILLE_LOT)
+        ),
+        dtype=float,
+    ).reshape(-1, 2)
+
+    debits, jours, nombres = estimer(ids, stocks, ajouts, utilisations, debut.timestamp(), maintenant.timestamp())
+
+    aujourd_hui = timezone.localdate(maintenant)
+    previsions = [
+        PrevisionInventaire(
+            id_inventaire_id=int(article_id),
+            consommation_journaliere=float(debit),
+            jours_restants=None if math.isnan(reste) else float(reste),
+            date_epuisement=aujourd_hui + timedelta(days=int(reste)) if reste <= JOURS_MAX else None,
+            nb_utilisations=int(nombre),
+            date_calcul=maintenant,
+        )
+        for article_id, debit, reste, nombre in zip(ids, debits, jours, nombres)
+    ]
+    with transaction.atomic():
+        PrevisionInventaire.objects.bulk_create(
+            previsions,
+            batch_size=TAILLE_LOT,
+            update_conflicts=True,
+            unique_fields=['id_inventaire'],
+            update_fields=['consommation_journaliere', 'jours_restants', 'date_epuisement', 'nb_utilisations', 'date_calcul'],
+        )
+    return len(previsions)
+
+
+# === LECTURE ===
+def previsions_du_foyer(foyer_id):
+    return (
+        Inventaire.objects
+        .filter(id_foyer_id=foyer_id)
+        .select_related('prevision', 'id_piece')
+        .order_by(F('prevision__date_epuisement').asc(nulls_last=True), 'nom')
+    )
+
+
+def quantite_a_acheter(prevision, stock, couverture=COUVERTURE_JOURS):
+    manque = prevision.consommation_journaliere * couverture - float(stock)
+    return math.ceil(manque * 100) / 100 if manque > 0 else None
+
+
+def completer_liste(liste, horizon=HORIZON_ACHAT):
+    """
+    Ajoute à la liste les articles du foyer qui seront épuisés d'ici `horizon` jours,
+    d'après les prévisions déjà calculées ; ceux déjà présents sur la liste sont ignorés.
+    """
+    limite = timezone.localdate() + timedelta(days=horizon)
+    a_racheter = (
+        PrevisionInventaire.objects
+        .filter(id_inventaire__id_foyer_id=liste.id_foyer_id, date_epuisement__lte=limite)
+        .select_related('id_inventaire')
+    )
+    deja = {normaliser(nom) for nom in Aliment.objects.filter(id_liste=liste, archive=False).values_list('nom', flat=True)}
+    ajouts = [
+        {'nom': prevision.id_inventaire.nom, 'quantite': quantite_a_acheter(prevision, prevision.id_inventaire.quantite)}
+        for prevision in a_racheter
+        if normaliser(prevision.id_inventaire.nom) not in deja
+    ]
+    if not ajouts:
+        return 0
+    return enregistrer_lignes(liste, ajouts=ajouts)['ajoutes']
@@ -0,0 +1,93 @@
+# maison_app/provisionnement.py
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+
+from .models import Utilisateur
+
+TAILLE_LOT = 1000
+# Hachage PBKDF2 ≈ 0,5 s par mot de passe : au-delà, passer par `manage.py provisionner_membres`
+MAX_MEMBRES_REQUETE = 50
+
+
+def _initialiser_processus():
+    # En mode « spawn » (macOS, Windows) le processus fils doit configurer Django lui-même
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+
+
+def hacher_mots_de_passe(mots_de_passe, processus=1):
+    """
+    Hache en parallèle sur plusieurs processus (le hachage est lié au CPU, le GIL bloquerait des threads).
+    Réservé aux commandes : dans une requête web, pas de fork d'un worker multithread
+    aux connexions ouvertes, on hache sur place (processus=1).
+    """
+    mots_de_passe = list(mots_de_passe)
+    if processus <= 1 or len(mots_de_passe) < 2 * processus:
+        return [make_password(mdp) for mdp in mots_de_passe]
+    with ProcessPoolExecutor(max_workers=processus, initializer=_initialiser_processus) as pool:
+        return list(pool.map(make_password, mots_de_passe, chunksize=max(1, len(mots_de_passe) // (processus * 4))))
+
+
+def provisionner_membres(membres, foyer, role='membre', processus=1):
+    """
+    Crée en masse les membres d'un foyer. `membres` : dicts {email, nom, mot_de_passe}.
+    Les emails déjà inscrits ou en double sont ignorés. Sans mot de passe fourni, le
+    compte reçoit un mot de passe inutilisable (à définir par un admin) plutôt qu'un secret partagé.
+    """
+    par_email = {}
+    for membre in membres:
+        email = Utilisateur.objects.normalize_email((membre.get('email') or '').strip())
+        if email and email.lower() not in par_email:
+            par_email[email.lower()] = dict(membre, email=email)
+
+    emails = [membre['email'] for membre in par_email.values()]
+    existants = set()
+    for i in range(0, len(emails), TAILLE_LOT):
+        existants.update(
+            email.lower() for email in
+            Utilisateur.objects.filter(email__in=emails[i:i + TAILLE_LOT]).values_list('email', flat=True)
+        )
+    nouveaux = [membre for cle, membre in par_email.items() if cle not in existants]
+
+    hachages = hacher_mots_de_passe(
+        (membre.get('mot_de_passe') or None for membre in nouveaux),  # None : make_password() => inutilisable
+        processus,
+    )
+    utilisateurs = [
+        Utilisateur(
+            username=membre['email'],
+            email=membre['email'],
+            nom=(membre.get('nom') or '').strip(),
+            role=role,
+            id_foyer=foyer,
+            password=hachage,
+        )
+        for membre, hachage in zip(nouveaux, hachages)
+    ]
+    crees = 0
+    for i in range(0, len(utilisateurs), TAILLE_LOT):
+        crees += _inserer(utilisateurs[i:i + TAILLE_LOT])
+    return {'crees': crees, 'ignores': len(membres) - crees}
+
+
+def _inserer(lot):
+    """Insère un lot ; un email inscrit entre la vérification et l'insertion est ignoré, pas une erreur 500."""
+    try:
+        with transaction.atomic():
+            Utilisateur.objects.bulk_create(lot)
+        return len(lot)
+    except IntegrityError:
+        pass
+    crees = 0
+    for utilisateur in lot:  # ligne par ligne : seuls les doublons sont écartés
+        try:
+            with transaction.atomic():
+                utilisateur.save(force_insert=True)
+            crees += 1
+        except IntegrityError:
+            continue
+    return crees
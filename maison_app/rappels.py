@@ -0,0 +1,112 @@
+# maison_app/rappels.py
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.template.loader import get_template
+from django.utils import timezone
+
+from .models import Tache, TacheAssignee, Utilisateur
+
+HORIZON_JOURS = 3
+TAILLE_LOT = 2000
+TAILLE_ID_IN = 900  # sous la limite de paramètres de SQLite
+
+# Sorties disponibles : des backends e-mail Django (envoi par lots sur une seule connexion)
+SORTIES = {
+    'console': 'django.core.mail.backends.console.EmailBackend',
+    'fichier': 'django.core.mail.backends.filebased.EmailBackend',
+    'smtp': 'django.core.mail.backends.smtp.EmailBackend',  # EMAIL_HOST/EMAIL_PORT, ex. serveur SMTP local de test
+}
+
+
+@dataclass
+class Recapitulatif:
+    membre: Utilisateur
+    en_retard: list = field(default_factory=list)
+    a_venir: list = field(default_factory=list)
+
+
+# === LECTURE EN FLUX ===
+def _tranches(valeurs, taille=TAILLE_ID_IN):
+    valeurs = list(valeurs)
+    for i in range(0, len(valeurs), taille):
+        yield valeurs[i:i + taille]
+
+
+def taches_a_rappeler(limite):
+    """
+    Tâches ouvertes échues ou à échéance d'ici `limite`, tous foyers confondus,
+    en un seul parcours de l'index partiel tache_ouverte_echeance_idx (foyer, échéance).
+    """
+    return (
+        Tache.objects
+        .filter(terminee=False, date_limite__lte=limite, id_foyer__isnull=False)
+        .order_by('id_foyer_id', 'date_limite', 'id')
+        .values_list('id', 'id_foyer_id', 'titre', 'date_limite')
+        .iterator(chunk_size=TAILLE_LOT)
+    )
+
+
+def lots_par_foyer(taches, taille_lot=TAILLE_LOT):
+    """Regroupe le flux en lots d'au moins `taille_lot` tâches, sans jamais couper un foyer."""
+    lot, foyer_courant = [], None
+    for tache in taches:
+        if tache[1] != foyer_courant and len(lot) >= taille_lot:
+            yield lot
+            lot = []
+        foyer_courant = tache[1]
+        lot.append(tache)
+    if lot:
+        yield lot
+
+
+# === REGROUPEMENT PAR MEMBRE ===
+def recapitulatifs(lot, aujourd_hui):
+    """Un récapitulatif par membre : ses tâches assignées, ou toutes celles non assignées de son foyer."""
+    ids = [tache[0] for tache in lot]
+    assignations = defaultdict(list)
+    for tranche in _tranches(ids):
+        for tache_id, user_id in TacheAssignee.objects.filter(id_tache_id__in=tranche).values_list('id_tache_id', 'id_user_id'):
+            assignations[tache_id].append(user_id)
+
+    membres_par_foyer = defaultdict(list)
+    membres = {}
+    for tranche in _tranches({tache[1] for tache in lot}):
+        for membre in Utilisateur.objects.filter(id_foyer_id__in=tranche, is_active=True).only('email', 'nom', 'id_foyer_id'):
+            membres_par_foyer[membre.id_foyer_id].append(membre)
+            membres[membre.id] = membre
+
+    resultat = {}
+    for tache_id, foyer_id, titre, date_limite in lot:
+        destinataires = [membres[i] for i in assignations.get(tache_id, ()) if i in membres]
+        for membre in destinataires or membres_par_foyer.get(foyer_id, ()):
+            recap = resultat.setdefault(membre.id, Recapitulatif(membre))
+            entree = {'titre': titre, 'date_limite': date_limite}
+            (recap.en_retard if date_limite < aujourd_hui else recap.a_venir).append(entree)
+    return resultat.values()
+
+
+# === ENVOI ===
+def envoyer_rappels(sortie='console', horizon=HORIZON_JOURS, taille_lot=TAILLE_LOT, **options_sortie):
+    """Parcourt les échéances en flux et envoie un récapitulatif par membre, lot par lot."""
+    aujourd_hui = timezone.localdate()
+    gabarit = get_template('maison_app/rappel_echeances.txt')  # compilé une fois (chargeur en cache)
+    connexion = get_connection(SORTIES.get(sortie, sortie), **options_sortie)
+    envoyes = 0
+    with connexion:
+        for lot in lots_par_foyer(taches_a_rappeler(aujourd_hui + timedelta(days=horizon)), taille_lot):
+            messages = [
+                EmailMessage(
+                    subject=f"{len(recap.en_retard)} tâche(s) en retard, {len(recap.a_venir)} à venir",
+                    body=gabarit.render({'recap': recap, 'aujourd_hui': aujourd_hui}),
+                    from_email=settings.DEFAULT_FROM_EMAIL,
+                    to=[recap.membre.email],
+                    connection=connexion,
+                )
+                for recap in recapitulatifs(lot, aujourd_hui)
+            ]
+            envoyes += connexion.send_messages(messages) or 0
+    return envoyes
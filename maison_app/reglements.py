@@ -0,0 +1,103 @@
+# maison_app/reglements.py
+import heapq
+from dataclasses import dataclass
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db.models import Sum
+
+from .models import Depense, Utilisateur
+
+CACHE_TIMEOUT = 60 * 60  # 1 heure
+CENTIME = Decimal('0.01')
+
+
+@dataclass(frozen=True)
+class Virement:
+    debiteur_id: int
+    creancier_id: int
+    montant: Decimal
+
+
+# === SOLDES ===
+def soldes_en_centimes(payes, membres):
+    """
+    `payes` : {user_id: centimes payés}. Le total est partagé à parts égales entre
+    les `membres` (ids triés) ; les centimes restants vont aux premiers membres,
+    pour que la somme des soldes soit exactement nulle. Un ancien membre qui a payé
+    est remboursé sans supporter de part.
+    """
+    total = sum(payes.values())
+    soldes = dict(payes)
+    if not membres:
+        return soldes
+    part, reste = divmod(total, len(membres))
+    for rang, membre_id in enumerate(membres):
+        soldes[membre_id] = soldes.get(membre_id, 0) - part - (1 if rang < reste else 0)
+    return soldes
+
+
+# === VIREMENTS ===
+def virements_minimaux(soldes):
+    """
+    Glouton sur deux tas : le plus gros débiteur rembourse le plus gros créancier,
+    le reliquat retourne dans son tas. Au plus n - 1 virements, O(n log n).
+    """
+    creanciers = [(-solde, membre_id) for membre_id, solde in soldes.items() if solde > 0]
+    debiteurs = [(solde, membre_id) for membre_id, solde in soldes.items() if solde < 0]
+    heapq.heapify(creanciers)
+    heapq.heapify(debiteurs)
+
+    virements = []
+    while creanciers and debiteurs:
+        du, creancier_id = heapq.heappop(creanciers)
+        doit, debiteur_id = heapq.heappop(debiteurs)
+        montant = min(-du, -doit)
+        virements.append((debiteur_id, creancier_id, montant))
+        if -du > montant:
+            heapq.heappush(creanciers, (du + montant, creancier_id))
+        if -doit > montant:
+            heapq.heappush(debiteurs, (doit + montant, debiteur_id))
+    return virements
+
+
+# === RÈGLEMENT D'UN FOYER ===
+def _cle(foyer_id):
+    return f'reglement:{foyer_id}'
+
+
+def invalider_reglement(foyer_id):
+    if foyer_id is not None:
+        cache.delete(_cle(foyer_id))
+
+
+def calculer_reglement(foyer_id):
+    # Un GROUP BY sur les dépenses, une lecture des membres ; le reste en mémoire, en centimes
+    payes = {
+        user_id: int(total / CENTIME)
+        for user_id, total in Depense.objects
+        .filter(id_foyer_id=foyer_id, id_user__isnull=False)
+        .order_by()
+        .values('id_user')
+        .annotate(total=Sum('montant'))
+        .values_list('id_user', 'total')
+    }
+    membres = sorted(Utilisateur.objects.filter(id_foyer_id=foyer_id).values_list('id', flat=True))
+    soldes = soldes_en_centimes(payes, membres)
+    return {
+        'total': sum(payes.values()) * CENTIME,
+        'soldes': {membre_id: solde * CENTIME for membre_id, solde in soldes.items()},
+        'virements': [
+            Virement(debiteur_id, creancier_id, montant * CENTIME)
+            for debiteur_id, creancier_id, montant in virements_minimaux(soldes)
+        ],
+    }
+
+
+def reglement_du_foyer(foyer_id):
+    """Soldes et virements du foyer, en cache jusqu'à la prochaine écriture d'une dépense."""
+    reglement = cache.get(_cle(foyer_id))
+    if reglement is None:
+        reglement = calculer_reglement(foyer_id)
+        cache.set(_cle(foyer_id), reglement, CACHE_TIMEOUT)
+    return reglement
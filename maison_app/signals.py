@@ -0,0 +1,65 @@
+# maison_app/signals.py
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .backends import invalider_utilisateurs
+from .calendrier import invalider_calendrier
+from .models import Animal, Depense, Evenement, Foyer, Piece, Tache, TacheRecurrente, Utilisateur
+from .reglements import invalider_reglement
+
+
+# === INVALIDATION DU CALENDRIER ===
+@receiver([post_save, post_delete], sender=Evenement)
+@receiver([post_save, post_delete], sender=Tache)
+def invalider_calendrier_foyer(sender, instance, **kwargs):
+    invalider_calendrier(instance.id_foyer_id)
+
+
+@receiver([post_save, post_delete], sender=TacheRecurrente)
+def invalider_calendrier_recurrence(sender, instance, **kwargs):
+    foyer_id = Tache.objects.filter(id=instance.id_tache_id).values_list('id_foyer_id', flat=True).first()
+    invalider_calendrier(foyer_id)
+
+
+# === VERSIONS DES FRAGMENTS EN CACHE ===
+# Les cartes affichent des données de leurs enfants (tâches d'une pièce, pièces d'un foyer) :
+# on avance la date_modification du parent par un UPDATE, sans déclencher d'autres signaux.
+@receiver([post_save, post_delete], sender=Tache)
+def toucher_parents_tache(sender, instance, **kwargs):
+    maintenant = timezone.now()
+    if instance.id_piece_id:
+        Piece.objects.filter(id=instance.id_piece_id).update(date_modification=maintenant)
+    if instance.id_animal_id:
+        Animal.objects.filter(id=instance.id_animal_id).update(date_modification=maintenant)
+
+
+@receiver([post_save, post_delete], sender=Piece)
+def toucher_parents_piece(sender, instance, created=False, **kwargs):
+    maintenant = timezone.now()
+    Foyer.objects.filter(id=instance.id_foyer_id).update(date_modification=maintenant)
+    if kwargs['signal'] is post_save and not created:
+        # Le nom de la pièce figure sur les cartes de tâches et d'animaux
+        Tache.objects.filter(id_piece=instance).update(date_modification=maintenant)
+        Animal.objects.filter(id_piece=instance).update(date_modification=maintenant)
+
+
+# === RÈGLEMENT DES DÉPENSES ===
+# Les parts dépendent des dépenses et de la composition du foyer
+@receiver([post_save, post_delete], sender=Depense)
+@receiver([post_save, post_delete], sender=Utilisateur)
+def invalider_reglement_foyer(sender, instance, **kwargs):
+    invalider_reglement(instance.id_foyer_id)
+
+
+# === CACHE DE L'UTILISATEUR AUTHENTIFIÉ ===
+@receiver([post_save, post_delete], sender=Utilisateur)
+def invalider_utilisateur(sender, instance, **kwargs):
+    invalider_utilisateurs([instance.id])
+
+
+@receiver(post_save, sender=Foyer)
+@receiver(pre_delete, sender=Foyer)
+def invalider_membres_foyer(sender, instance, **kwargs):
+    # pre_delete : les membres sont encore rattachés avant le SET_NULL
+    invalider_utilisateurs(Utilisateur.objects.filter(id_foyer=instance).values_list('id', flat=True))
@@ -0,0 +1,132 @@
+# maison_app/suppression.py
+from django.db import connections, models, router, transaction
+from django.db.models.deletion import ProtectedError, RestrictedError
+from django.utils import timezone
+
+from travaux.file import mettre_en_file
+
+from .backends import invalider_utilisateurs
+from .calendrier import invalider_calendrier
+from .models import Animal, Foyer, Piece, Tache, Utilisateur
+from .reglements import invalider_reglement
+
+
+# === SUPPRESSION ENSEMBLISTE ===
+def supprimer_lignes(lignes):
+    """
+    DELETE direct de `lignes`, sans Collector ni signaux post_delete : à n'appeler que sur
+    des lignes dont les dépendances sont déjà traitées. L'appelant invalide lui-même les
+    caches que les signaux auraient invalidés (calendrier, fragments, règlements).
+    """
+    modele = lignes.model
+    alias = router.db_for_write(modele)
+    connexion = connections[alias]
+    nom = connexion.ops.quote_name
+    sous_requete, params = lignes.order_by().values_list('pk').query.get_compiler(alias).as_sql()
+    # Table dérivée : MySQL refuse une sous-requête directe sur la table dont on supprime
+    sql = (
+        f'DELETE FROM {nom(modele._meta.db_table)} WHERE {nom(modele._meta.pk.column)} IN '
+        f'(SELECT * FROM ({sous_requete}) AS a_supprimer)'
+    )
+    with connexion.cursor() as curseur:
+        curseur.execute(sql, params)
+        return curseur.rowcount
+
+
+def _relations_inverses(modele):
+    # include_hidden : tables M2M auto-générées (groups, user_permissions...)
+    for relation in modele._meta.get_fields(include_hidden=True):
+        if relation.auto_created and not relation.concrete and (relation.one_to_many or relation.one_to_one):
+            yield relation
+
+
+def _valeurs_detachement(modele, champ, valeur):
+    valeurs = {champ.name: valeur}
+    # Les fragments en cache sont versionnés par date_modification : un UPDATE en masse doit l'avancer
+    if any(f.name == 'date_modification' for f in modele._meta.concrete_fields):
+        valeurs['date_modification'] = timezone.now()
+    return valeurs
+
+
+def supprimer_ensemble(modele, lignes, bilan, profondeur=0):
+    """
+    Équivalent de lignes.delete() sans Collector : aucune ligne n'est chargée
+    en mémoire, chaque table dépendante reçoit un seul DELETE ou UPDATE
+    (avec sous-requête), enfants avant parents.
+    """
+    if profondeur > 10:
+        raise RecursionError(f"Cascade trop profonde sur {modele.__name__}")
+
+    for relation in _relations_inverses(modele):
+        enfant, champ = relation.related_model, relation.field
+        on_delete = champ.remote_field.on_delete
+        dependants = enfant._base_manager.filter(**{f'{champ.name}__in': lignes.values('pk')})
+
+        if on_delete is models.CASCADE:
+            supprimer_ensemble(enfant, dependants, bilan, profondeur + 1)
+        elif on_delete is models.SET_NULL:
+            n = dependants.update(**_valeurs_detachement(enfant, champ, None))
+            bilan[f'{enfant._meta.db_table}.{champ.column}=NULL'] = n
+        elif on_delete is models.SET_DEFAULT:
+            dependants.update(**_valeurs_detachement(enfant, champ, champ.get_default()))
+        elif on_delete is models.DO_NOTHING:
+            continue
+        elif on_delete is models.PROTECT and dependants.exists():
+            raise ProtectedError(f"{enfant.__name__} protège {modele.__name__}", set())
+        elif on_delete is models.RESTRICT and dependants.exists():
+            raise RestrictedError(f"{enfant.__name__} restreint {modele.__name__}", set())
+
+    # Les dépendances viennent d'être traitées, le Collector n'a plus rien à faire
+    n = supprimer_lignes(lignes)
+    bilan[modele._meta.db_table] = bilan.get(modele._meta.db_table, 0) + n
+
+
+def supprimer_foyer(foyer_id):
+    """Supprime un foyer et ses pièces, invitations, etc. en une transaction, table par table."""
+    membres = list(Utilisateur.objects.filter(id_foyer_id=foyer_id).values_list('id', flat=True))
+    bilan = {}
+    with transaction.atomic():
+        supprimer_ensemble(Foyer, Foyer.tous.filter(id=foyer_id), bilan)
+    # Pas de signaux post_delete : on invalide explicitement les caches
+    invalider_utilisateurs(membres)
+    invalider_calendrier(foyer_id)
+    invalider_reglement(foyer_id)
+    return bilan
+
+
+def supprimer_utilisateur(utilisateur_id):
+    foyer_id = Utilisateur.objects.filter(id=utilisateur_id).values_list('id_foyer_id', flat=True).first()
+    # Les cartes de pièces et d'animaux affichent « Terminé par » : leurs versions doivent avancer
+    completees = list(Tache.objects.filter(complete_par_id=utilisateur_id).values_list('id_piece_id', 'id_animal_id'))
+    bilan = {}
+    with transaction.atomic():
+        supprimer_ensemble(Utilisateur, Utilisateur.objects.filter(id=utilisateur_id), bilan)
+        maintenant = timezone.now()
+        Piece.objects.filter(id__in={piece for piece, _ in completees if piece}).update(date_modification=maintenant)
+        Animal.objects.filter(id__in={animal for _, animal in completees if animal}).update(date_modification=maintenant)
+    invalider_utilisateurs([utilisateur_id])
+    invalider_reglement(foyer_id)
+    invalider_calendrier(foyer_id)
+    return bilan
+
+
+# === SUPPRESSION EN ARRIÈRE-PLAN ===
+def marquer_foyer_supprime(foyer_id):
+    """
+    Suppression logique immédiate (le foyer disparaît et ses membres en sont détachés),
+    la suppression physique est confiée à la file de travaux, dans la même transaction.
+    """
+    membres = list(Utilisateur.objects.filter(id_foyer_id=foyer_id).values_list('id', flat=True))
+    with transaction.atomic():
+        Foyer.tous.filter(id=foyer_id).update(supprime_le=timezone.now())
+        Utilisateur.objects.filter(id__in=membres).update(id_foyer=None, date_modification=timezone.now())
+        mettre_en_file(supprimer_foyer, foyer_id)
+    invalider_utilisateurs(membres)
+
+
+def purger_foyers_supprimes():
+    """Termine les suppressions interrompues (travail en échec, ou aucun travailleur lancé)."""
+    ids = list(Foyer.tous.filter(supprime_le__isnull=False).values_list('id', flat=True))
+    for foyer_id in ids:
+        supprimer_foyer(foyer_id)
+    return len(ids)
@@ -0,0 +1,11 @@
+from django import template
+
+from maison_app.permissions import a_permission
+
+register = template.Library()
+
+
+@register.filter
+def peut(user, capacite):
+    """{% if user|peut:'supprimer_taches' %} ... {% endif %}"""
+    return a_permission(user, capacite)
@@ -1,3 +1,509 @@
-from django.test import TestCase
+import asyncio
+import gzip
+import shutil
+import tempfile
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from gestion_taches_project.compression import CompressionMiddleware, brotli, compresser_flux
+from gestion_taches_project.minification import minifier_html
+from gestion_taches_project.statiques import CACHE_COURT, CACHE_IMMUABLE
+from maison_app.archivage import archiver_taches
+from maison_app.calendrier import entrees_fenetre, iter_occurrences
+from maison_app.courses import lire_quantite
+from maison_app.dispositifs import PiloteFactice, Planificateur, charger_pilotes
+from maison_app.durees import terminer_taches
+from maison_app.invitations import EmailDejaUtilise, InvitationInvalide, generer_invitations, utiliser_invitation
+from maison_app.journal import journal
+from maison_app.models import (
+    ActionDispositif, Animal, ChatMessage, ChatMessageArchive, Depense, Dispositif, Evenement, Foyer, HistoriqueTache,
+    HistoriqueTacheArchive, Invitation, Piece, Tache, TacheArchivee, TacheAssignee, TacheAssigneeArchivee,
+    TacheRecurrente, Utilisateur,
+)
+from maison_app.reglements import Virement, calculer_reglement, soldes_en_centimes, virements_minimaux
+from maison_app.suppression import supprimer_foyer, supprimer_utilisateur
+
+_patchs = []
+
+
+def setUpModule():
+    # Journal d'audit écrit immédiatement : pas de thread d'écriture sur la base de test
+    _patchs.append(mock.patch.object(journal, 'intervalle', 0))
+    for patch in _patchs:
+        patch.start()
+
+
+def tearDownModule():
+    for patch in _patchs:
+        patch.stop()
+
+
+# === CALENDRIER ===
+class OccurrencesTests(SimpleTestCase):
+    def test_pas_fixe_saute_a_la_fenetre(self):
+        jours = list(iter_occurrences('Hebdo', date(2026, 1, 1), date(2026, 3, 1), date(2026, 3, 20)))
+        self.assertEqual(jours, [date(2026, 3, 5), date(2026, 3, 12), date(2026, 3, 19)])
+
+    def test_mensuel_borne_au_dernier_jour(self):
+        jours = list(iter_occurrences('Mensuel', date(2026, 1, 31), date(2026, 1, 1), date(2026, 4, 30)))
+        self.assertEqual(jours, [date(2026, 1, 31), date(2026, 2, 28), date(2026, 3, 31), date(2026, 4, 30)])
+
+    def test_ancre_exclue(self):
+        jours = iter_occurrences('Quotidien', date(2026, 3, 5), date(2026, 3, 1), date(2026, 3, 7), inclure_ancre=False)
+        self.assertEqual(list(jours), [date(2026, 3, 6), date(2026, 3, 7)])
+        jours = iter_occurrences('Mensuel', date(2026, 1, 31), date(2026, 1, 1), date(2026, 3, 31), inclure_ancre=False)
+        self.assertEqual(list(jours), [date(2026, 2, 28), date(2026, 3, 31)])
+
+
+class CalendrierFoyerTests(TestCase):
+    def setUp(self):
+        cache.clear()  # calendrier mis en cache par mois
+        self.foyer = Foyer.objects.create(nom='Maison')
+
+    def entrees(self, type, debut, fin):
+        return [entree for entree in entrees_fenetre(self.foyer.id, debut, fin) if entree.type == type]
+
+    def recurrences(self, debut, fin):
+        return [entree.date for entree in self.entrees('recurrence', debut, fin)]
+
+    def test_derniere_execution_non_reaffichee(self):
+        tache = Tache.objects.create(titre='Poubelles', id_foyer=self.foyer)
+        TacheRecurrente.objects.create(id_tache=tache, frequence='Hebdo', dernier_execution=date(2026, 3, 2))
+        self.assertEqual(
+            self.recurrences(date(2026, 3, 1), date(2026, 3, 31)),
+            [date(2026, 3, 9), date(2026, 3, 16), date(2026, 3, 23), date(2026, 3, 30)],
+        )
+
+    def test_echeance_incluse(self):
+        tache = Tache.objects.create(titre='Loyer', id_foyer=self.foyer, date_limite=date(2026, 3, 5))
+        TacheRecurrente.objects.create(id_tache=tache, frequence='Mensuel')
+        self.assertEqual(self.recurrences(date(2026, 3, 1), date(2026, 4, 30)), [date(2026, 3, 5), date(2026, 4, 5)])
+
+    def test_evenement_a_cheval_sur_deux_mois(self):
+        Evenement.objects.create(
+            titre='Vacances', description='', id_foyer=self.foyer,
+            date_debut=date(2026, 3, 28), date_fin=date(2026, 4, 3),
+        )
+        self.assertEqual(len(self.entrees('evenement', date(2026, 3, 1), date(2026, 4, 30))), 1)
+
+
+# === PLANIFICATEUR DES DISPOSITIFS ===
+class PiloteArret(PiloteFactice):
+    """Arrête le planificateur dès sa première action."""
+
+    def __init__(self, arret, **options):
+        super().__init__(**options)
+        self.arret = arret
+
+    async def executer(self, action):
+        etat = await super().executer(action)
+        self.arret.set()
+        return etat
+
+
+class PlanificateurTests(TestCase):
+    def setUp(self):
+        foyer = Foyer.objects.create(nom='Maison')
+        self.tache = Tache.objects.create(titre='Éclairage', id_foyer=foyer)
+        self.lampe = Dispositif.objects.create(nom='Salon', type='lampe', id_foyer=foyer)
+        self.thermostat = Dispositif.objects.create(nom='Couloir', type='thermostat', id_foyer=foyer)
+
+    def action(self, dispositif, **champs):
+        return ActionDispositif.objects.create(
+            id_dispositif=dispositif, id_tache=self.tache, action='allumer', **champs,
+        )
+
+    def test_pas_de_pilote_factice_hors_debug(self):
+        with self.assertLogs('maison_app.dispositifs', 'WARNING'):
+            self.assertEqual(charger_pilotes(), {})
+        with override_settings(DEBUG=True):
+            self.assertEqual(set(charger_pilotes()), {'capteur', 'lampe', 'thermostat'})
+
+    def test_type_sans_pilote_reste_en_attente(self):
+        lampe, thermostat = self.action(self.lampe), self.action(self.thermostat)
+        planificateur = Planificateur(pilotes={'lampe': PiloteFactice()})
+
+        async def un_tour():
+            await planificateur.charger()
+            return await planificateur.executer_dues()
+
+        self.assertEqual(async_to_sync(un_tour)(), 1)
+        lampe.refresh_from_db()
+        thermostat.refresh_from_db()
+        self.assertEqual((lampe.statut, thermostat.statut), ('executee', 'en_attente'))
+
+    def test_action_urgente_chargee_tas_plein(self):
+        lointaine = timezone.now() + timedelta(days=30)
+        for _ in range(5):
+            self.action(self.lampe, date_prevue=lointaine)
+        arret = asyncio.Event()
+        planificateur = Planificateur(pilotes={'lampe': PiloteArret(arret)}, taille_lot=3)
+        self.assertEqual(async_to_sync(planificateur.charger)(), 5)
+        urgente = self.action(self.lampe)
+
+        async def tourner():
+            await asyncio.wait_for(planificateur.tourner(arret), timeout=5)
+
+        async_to_sync(tourner)()
+        urgente.refresh_from_db()
+        self.assertEqual(urgente.statut, 'executee')
+        self.assertEqual(ActionDispositif.objects.filter(statut='en_attente').count(), 5)
+
+    def test_journal_factice_borne(self):
+        pilote = PiloteFactice(taille_journal=2)
+        for _ in range(5):
+            pilote.journal.append(object())
+        self.assertEqual(len(pilote.journal), 2)
+
+
+# === INVITATIONS ===
+class ReclamationInvitationTests(TestCase):
+    def setUp(self):
+        self.foyer = Foyer.objects.create(nom='Maison')
+        self.admin = Utilisateur.objects.create_user(
+            username='admin@exemple.fr', email='admin@exemple.fr', password='x', role='admin', id_foyer=self.foyer,
+        )
+        self.invitation = generer_invitations(self.foyer, self.admin)[0]
+
+    def test_double_soumission_un_seul_gagnant(self):
+        utiliser_invitation(self.invitation.code, 'a@exemple.fr', 'A')
+        with self.assertRaises(InvitationInvalide):
+            utiliser_invitation(self.invitation.code, 'b@exemple.fr', 'B')
+        self.assertTrue(Utilisateur.objects.filter(email='a@exemple.fr', id_foyer=self.foyer).exists())
+        self.assertFalse(Utilisateur.objects.filter(email='b@exemple.fr').exists())
+
+    def test_email_deja_utilise_ne_consomme_pas_le_code(self):
+        with self.assertRaises(EmailDejaUtilise):
+            utiliser_invitation(self.invitation.code, 'admin@exemple.fr', 'Doublon')
+        self.invitation.refresh_from_db()
+        self.assertFalse(self.invitation.utilise)
+
+    def test_code_expire(self):
+        Invitation.objects.filter(id=self.invitation.id).update(date_creation=timezone.now() - timedelta(days=8))
+        with self.assertRaises(InvitationInvalide):
+            utiliser_invitation(self.invitation.code, 'a@exemple.fr', 'A')
+        self.assertFalse(Utilisateur.objects.filter(email='a@exemple.fr').exists())
+
+
+# === SUPPRESSION ENSEMBLISTE ===
+class SuppressionTests(TestCase):
+    def setUp(self):
+        self.foyer = Foyer.objects.create(nom='Maison')
+        voisins = Foyer.objects.create(nom='Voisins')
+        self.membre = Utilisateur.objects.create_user(
+            username='m@exemple.fr', email='m@exemple.fr', password='x', role='admin', id_foyer=self.foyer,
+        )
+        pieces = Piece.objects.bulk_create([Piece(nom=f'Pièce {i}', id_foyer=self.foyer) for i in range(3)])
+        Piece.objects.create(nom='Ailleurs', id_foyer=voisins)
+        Tache.objects.bulk_create([
+            Tache(titre=f'Tâche {i}', id_foyer=self.foyer, id_piece=pieces[i % 3], complete_par=self.membre)
+            for i in range(6)
+        ])
+        Animal.objects.create(nom='Rex', id_foyer=self.foyer, id_piece=pieces[0])
+        Invitation.objects.create(foyer=self.foyer, cree_par=self.membre)
+
+    def test_supprimer_foyer(self):
+        bilan = supprimer_foyer(self.foyer.id)
+        self.assertEqual(bilan['maison_app_foyer'], 1)
+        self.assertEqual((bilan['piece'], bilan['invitation']), (3, 1))
+        self.assertEqual((bilan['tache.id_piece_id=NULL'], bilan['tache.id_foyer_id=NULL']), (6, 6))
+        self.assertEqual((bilan['animal.id_piece_id=NULL'], bilan['utilisateur.id_foyer_id=NULL']), (1, 1))
+        self.assertFalse(Foyer.tous.filter(id=self.foyer.id).exists())
+        self.assertEqual(Piece.objects.get().nom, 'Ailleurs')
+        self.assertEqual(Tache.objects.filter(id_foyer__isnull=True, id_piece__isnull=True).count(), 6)
+        self.membre.refresh_from_db()
+        self.assertIsNone(self.membre.id_foyer_id)
+
+    def test_supprimer_utilisateur(self):
+        versions = dict(Piece.objects.filter(id_foyer=self.foyer).values_list('id', 'date_modification'))
+        bilan = supprimer_utilisateur(self.membre.id)
+        self.assertEqual((bilan['utilisateur'], bilan['invitation']), (1, 1))
+        self.assertEqual(bilan['tache.complete_par_id=NULL'], 6)
+        self.assertFalse(Utilisateur.objects.exists())
+        self.assertEqual(Tache.objects.filter(complete_par__isnull=True).count(), 6)
+        # « Terminé par » affiché sur les cartes de pièces : leurs versions avancent
+        for piece_id, version in Piece.objects.filter(id_foyer=self.foyer).values_list('id', 'date_modification'):
+            self.assertGreater(version, versions[piece_id])
+
+
+# === ARCHIVAGE ===
+class ArchivageTests(TestCase):
+    def setUp(self):
+        self.foyer = Foyer.objects.create(nom='Maison')
+        self.membre = Utilisateur.objects.create_user(
+            username='m@exemple.fr', email='m@exemple.fr', password='x', id_foyer=self.foyer,
+        )
+        self.piece = Piece.objects.create(nom='Cuisine', id_foyer=self.foyer)
+
+    def terminee(self, titre, il_y_a):
+        return Tache.objects.create(
+            titre=titre, id_foyer=self.foyer, id_piece=self.piece, terminee=True,
+            date_completion=timezone.now() - timedelta(days=il_y_a),
+        )
+
+    def test_archiver_taches(self):
+        anciennes = [self.terminee(f'Ancienne {i}', 40) for i in range(3)]
+        recurrente = self.terminee('Récurrente', 40)
+        TacheRecurrente.objects.create(id_tache=recurrente, frequence='Hebdo')
+        recente = self.terminee('Récente', 1)
+        ouverte = Tache.objects.create(titre='Ouverte', id_foyer=self.foyer)
+        TacheAssignee.objects.create(id_tache=anciennes[0], id_user=self.membre)
+        HistoriqueTache.objects.bulk_create([
+            HistoriqueTache(id_tache=tache, id_user=self.membre) for tache in anciennes
+        ])
+        ChatMessage.objects.create(id_user=self.membre, id_tache=anciennes[1], contenu='Fait !')
+        version = self.piece.date_modification
+
+        self.assertEqual(archiver_taches(jours=30, taille_lot=2), 3)
+        self.assertEqual(set(Tache.objects.values_list('id', flat=True)), {recurrente.id, recente.id, ouverte.id})
+        self.assertEqual(
+            set(TacheArchivee.objects.values_list('id', flat=True)), {tache.id for tache in anciennes},
+        )
+        self.assertEqual((TacheAssigneeArchivee.objects.count(), HistoriqueTacheArchive.objects.count()), (1, 3))
+        self.assertEqual(ChatMessageArchive.objects.get().contenu, 'Fait !')
+        for modele in (TacheAssignee, HistoriqueTache, ChatMessage):
+            self.assertFalse(modele.objects.exists())
+        self.piece.refresh_from_db()
+        self.assertGreater(self.piece.date_modification, version)
+        self.assertEqual(archiver_taches(jours=30), 0)
+
+
+# === TERMINAISON DES TÂCHES ===
+class TerminerTachesTests(TestCase):
+    def setUp(self):
+        self.foyer = Foyer.objects.create(nom='Maison')
+        self.membre = Utilisateur.objects.create_user(
+            username='m@exemple.fr', email='m@exemple.fr', password='x', role='admin', id_foyer=self.foyer,
+        )
+        self.tache = Tache.objects.create(titre='Vaisselle', id_foyer=self.foyer)
+
+    def test_double_soumission_un_seul_gagnant(self):
+        self.assertEqual(len(terminer_taches([self.tache.id], self.membre, self.foyer.id)), 1)
+        self.assertEqual(terminer_taches([self.tache.id], self.membre, self.foyer.id), [])
+        self.assertEqual(HistoriqueTache.objects.filter(id_tache=self.tache).count(), 1)
+
+    def test_tache_d_un_autre_foyer_ignoree(self):
+        ailleurs = Tache.objects.create(titre='Ailleurs', id_foyer=Foyer.objects.create(nom='Voisins'))
+        historiques = terminer_taches([self.tache.id, ailleurs.id], self.membre, self.foyer.id)
+        self.assertEqual([historique.id_tache_id for historique in historiques], [self.tache.id])
+        ailleurs.refresh_from_db()
+        self.assertFalse(ailleurs.terminee)
+
+    def test_double_clic_sur_les_vues(self):
+        self.client.force_login(self.membre)
+        self.client.get(reverse('terminer_tache', args=[self.tache.id]))
+        self.client.get(reverse('terminer_tache', args=[self.tache.id]))
+        self.client.post(reverse('terminer_taches'), {'taches': [self.tache.id]})
+        self.assertEqual(HistoriqueTache.objects.filter(id_tache=self.tache).count(), 1)
+        self.tache.refresh_from_db()
+        self.assertEqual(self.tache.complete_par, self.membre)
+
+    def test_utilisateur_sans_foyer(self):
+        orpheline = Tache.objects.create(titre='Orpheline')
+        sans_foyer = Utilisateur.objects.create_user(
+            username='s@exemple.fr', email='s@exemple.fr', password='x', role='admin',
+        )
+        self.client.force_login(sans_foyer)
+        for tache in (self.tache, orpheline):
+            reponse = self.client.get(reverse('terminer_tache', args=[tache.id]))
+            self.assertRedirects(reponse, reverse('liste_foyers'), fetch_redirect_response=False)
+            reponse = self.client.post(reverse('terminer_taches'), {'taches': [tache.id]})
+            self.assertRedirects(reponse, reverse('liste_foyers'), fetch_redirect_response=False)
+        self.assertFalse(Tache.objects.filter(terminee=True).exists())
+
+
+# === DÉPENSES ET RÈGLEMENTS ===
+class ReglementTests(SimpleTestCase):
+    def test_soldes_a_somme_nulle(self):
+        soldes = soldes_en_centimes({1: 1000}, [1, 2, 3])
+        self.assertEqual(soldes, {1: 666, 2: -333, 3: -333})
+        self.assertEqual(soldes_en_centimes({2: 1001}, [1, 2, 3]), {1: -334, 2: 667, 3: -333})
+
+    def test_ancien_membre_rembourse_sans_part(self):
+        self.assertEqual(soldes_en_centimes({9: 600}, [1, 2]), {9: 600, 1: -300, 2: -300})
+
+    def test_virements_soldent_tout(self):
+        soldes = {1: 500, 2: -200, 3: -300, 4: 0, 5: 100, 6: -100}
+        virements = virements_minimaux(soldes)
+        self.assertLessEqual(len(virements), 4)  # n - 1 membres non soldés
+        restes = dict(soldes)
+        for debiteur_id, creancier_id, montant in virements:
+            self.assertGreater(montant, 0)
+            restes[debiteur_id] += montant
+            restes[creancier_id] -= montant
+        self.assertEqual(set(restes.values()), {0})
+
+    def test_lire_quantite(self):
+        self.assertEqual(lire_quantite('12,5'), Decimal('12.50'))
+        self.assertEqual(lire_quantite('99999999.99'), Decimal('99999999.99'))
+        for valeur in ('nan', 'sNaN', 'Infinity', '-inf', '1e20', '100000000', '99999999.999', 'abc'):
+            with self.assertRaises(ValueError, msg=valeur):
+                lire_quantite(valeur)
+
+
+class DepensesTests(TestCase):
+    def setUp(self):
+        cache.clear()  # règlement mis en cache par foyer
+        self.foyer = Foyer.objects.create(nom='Maison')
+        self.membres = [
+            Utilisateur.objects.create_user(
+                username=f'{nom}@exemple.fr', email=f'{nom}@exemple.fr', password='x', role='admin',
+                id_foyer=self.foyer,
+            )
+            for nom in ('a', 'b', 'c')
+        ]
+
+    def depense(self, payeur, montant):
+        return Depense.objects.create(
+            description='Courses', montant=Decimal(montant), date_depense=date(2026, 1, 1),
+            id_foyer=self.foyer, id_user=payeur,
+        )
+
+    def test_calculer_reglement(self):
+        a, b, c = self.membres
+        self.depense(a, '30.00')
+        self.depense(b, '0.01')
+        reglement = calculer_reglement(self.foyer.id)
+        self.assertEqual(reglement['total'], Decimal('30.01'))
+        self.assertEqual(reglement['soldes'], {a.id: Decimal('19.99'), b.id: Decimal('-9.99'), c.id: Decimal('-10.00')})
+        self.assertCountEqual(reglement['virements'], [
+            Virement(c.id, a.id, Decimal('10.00')), Virement(b.id, a.id, Decimal('9.99')),
+        ])
+
+    def test_saisies_invalides(self):
+        self.client.force_login(self.membres[0])
+        for donnees in (
+            {'montant': 'nan'}, {'montant': 'Infinity'}, {'montant': '1e20'}, {'montant': '-5'},
+            {'montant': '10', 'payeur': 'abc'}, {'montant': '10', 'payeur': '0'},
+            {'montant': '10', 'date_depense': 'hier'}, {'montant': '10', 'date_depense': '2026-02-30'},
+        ):
+            reponse = self.client.post(reverse('depenses'), donnees, follow=True)
+            self.assertContains(reponse, 'invalide', msg_prefix=str(donnees))
+        self.assertFalse(Depense.objects.exists())
+        donnees = {'montant': '10', 'payeur': str(self.membres[1].id), 'date_depense': '2026-02-28'}
+        self.client.post(reverse('depenses'), donnees)
+        self.assertEqual(Depense.objects.get().id_user, self.membres[1])
+
+
+# === MÉTRIQUES ===
+class MetriquesTests(TestCase):
+    def test_staff_seulement(self):
+        url = reverse('metriques')
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.client.force_login(Utilisateur.objects.create_user(username='m', email='m@exemple.fr', password='x'))
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.client.force_login(
+            Utilisateur.objects.create_user(username='s', email='s@exemple.fr', password='x', is_staff=True),
+        )
+        reponse = self.client.get(url)
+        self.assertEqual(reponse.status_code, 200)
+        self.assertContains(reponse, '# TYPE')
+
+    @override_settings(METRIQUES_IPS=['127.0.0.1'])
+    def test_collecteur_autorise_sans_requete_sql(self):
+        self.client.force_login(Utilisateur.objects.create_user(username='m', email='m@exemple.fr', password='x'))
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(reverse('metriques')).status_code, 200)
+        self.assertEqual(self.client.get(reverse('metriques'), REMOTE_ADDR='10.0.0.1').status_code, 403)
+
+
+# === MINIFICATION ET COMPRESSION ===
+class MinificationTests(SimpleTestCase):
+    def test_zones_protegees_intactes(self):
+        proteges = [
+            '{% if  a %}', '{{ valeur|default:"  a  b  " }}', '{# note   #}', '<pre>  a\n    b  </pre>',
+            '<textarea>  x  </textarea>', '<script>var a = "  b  ";  if (a) {}</script>',
+        ]
+        source = '<div>\n    <p>  texte   libre  </p>\n' + '\n'.join(proteges) + '\n</div>\n'
+        resultat = minifier_html(source)
+        for zone in proteges:
+            self.assertIn(zone, resultat)
+        self.assertIn('<div>\n<p> texte libre </p>\n', resultat)
+        # Numéros de ligne des erreurs de template inchangés
+        self.assertEqual(resultat.count('\n'), source.count('\n'))
+
+    def test_css_chaines_preservees(self):
+        resultat = minifier_html('<style>\n  /* ; */ .a::after { content: "a ; b , {c}" ; }\n</style>')
+        self.assertEqual(resultat, '<style>\n .a::after{content: "a ; b , {c}";}\n</style>')
+
+    def test_commentaires_html_retires(self):
+        self.assertEqual(minifier_html('a<!-- x\n y -->b<!--[if IE]>c<![endif]-->'), 'a\nb<!--[if IE]>c<![endif]-->')
+
+
+class CompressionTests(SimpleTestCase):
+    def compresser(self, contenu, type_contenu, accept_encoding):
+        middleware = CompressionMiddleware(lambda request: HttpResponse(contenu, content_type=type_contenu))
+        return middleware(RequestFactory().get('/', HTTP_ACCEPT_ENCODING=accept_encoding))
+
+    def test_html_en_gzip_seulement(self):
+        contenu = '<p>bonjour</p>' * 100
+        reponse = self.compresser(contenu, 'text/html; charset=utf-8', 'gzip, br')
+        self.assertEqual(reponse['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(reponse.content).decode(), contenu)
+        reponse = self.compresser('{"a": 1}' * 100, 'application/json', 'gzip, br')
+        self.assertEqual(reponse['Content-Encoding'], 'gzip' if brotli is None else 'br')
+        self.assertFalse(self.compresser(contenu, 'text/html', 'identity').has_header('Content-Encoding'))
+
+    def test_flux_gzip_valide(self):
+        morceaux = [b'<p>bonjour</p>' * 100, b'', b'<p>fin</p>']
+        self.assertEqual(gzip.decompress(b''.join(compresser_flux('gzip', morceaux))), b''.join(morceaux))
+
+
+# === FICHIERS STATIQUES ===
+class StatiquesTests(SimpleTestCase):
+    CONTENU = b'body { color: red; }\n' * 50
+    EMPREINTE = 'css/site.0123456789ab.css'
+
+    def setUp(self):
+        racine = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, racine)
+        (racine / 'css').mkdir()
+        for nom in (self.EMPREINTE, 'css/site.css'):
+            (racine / nom).write_bytes(self.CONTENU)
+            (racine / f'{nom}.gz').write_bytes(gzip.compress(self.CONTENU))
+            if brotli is not None:
+                (racine / f'{nom}.br').write_bytes(brotli.compress(self.CONTENU))
+        # Le middleware lit STATIC_ROOT à sa création, au premier appel du client de test
+        reglages = override_settings(STATIC_ROOT=str(racine))
+        reglages.enable()
+        self.addCleanup(reglages.disable)
+
+    def test_variante_selon_accept_encoding(self):
+        cas = [('gzip, br;q=0', 'gzip', gzip.decompress), ('identity', None, bytes)]
+        if brotli is not None:
+            cas.append(('gzip, deflate, br', 'br', brotli.decompress))
+        for accept_encoding, encodage, decompresser in cas:
+            reponse = self.client.get(f'/static/{self.EMPREINTE}', HTTP_ACCEPT_ENCODING=accept_encoding)
+            self.assertEqual(reponse.status_code, 200)
+            self.assertEqual(reponse.get('Content-Encoding'), encodage)
+            self.assertEqual(decompresser(b''.join(reponse.streaming_content)), self.CONTENU)
+            self.assertEqual(reponse['Content-Type'], 'text/css')
+            self.assertIn('Accept-Encoding', reponse['Vary'])
+            # Servi après SecurityMiddleware
+            self.assertEqual(reponse['X-Content-Type-Options'], 'nosniff')
+
+    def test_cache_control(self):
+        self.assertEqual(self.client.get(f'/static/{self.EMPREINTE}')['Cache-Control'], CACHE_IMMUABLE)
+        reponse = self.client.get('/static/css/site.css')
+        self.assertEqual(reponse['Cache-Control'], CACHE_COURT)
+        reponse = self.client.get('/static/css/site.css', HTTP_IF_MODIFIED_SINCE=reponse['Last-Modified'])
+        self.assertEqual(reponse.status_code, 304)
+
+    def test_head_sans_corps(self):
+        reponse = self.client.head(f'/static/{self.EMPREINTE}', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(reponse['Content-Encoding'], 'gzip')
+        self.assertEqual(int(reponse['Content-Length']), len(gzip.compress(self.CONTENU)))
+        self.assertEqual(reponse.content, b'')
+
+    def test_hors_racine_non_servi(self):
+        self.assertEqual(self.client.get('/static/../manage.py').status_code, 404)
+        self.assertEqual(self.client.get('/static/css/absent.css').status_code, 404)
@@ -1,11 +1,42 @@
-from django.shortcuts import render, redirect, get_object_or_404
+import csv
+import io
+import json
+from datetime import date, timedelta
+from pathlib import Path
+
+from django.conf import settings
 from django.contrib import messages
+from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
-from .models import Tache, Foyer, Utilisateur, StatutTache, Invitation, Piece, Animal  # ← IMPORTS COMPLETS
-from django.contrib.auth import authenticate, login
+from django.core.cache import caches
+from django.db.models import Count, prefetch_related_objects
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django.views.decorators.http import require_POST
+
+from gestion_taches_project.metriques import TYPE_CONTENU, registre
+from gestion_taches_project.profilage import generer_jeton, lire_profil, lister_profils
+
+from .annuaire import annuaire, page_annuaire
+from .calendrier import bornes_du_mois, entrees_fenetre
+from .courses import enregistrer_lignes, lire_quantite, marquer_achetee
+from .durees import demarrer_tache as demarrer, terminer_taches
 from .forms import LoginForm
-from django.contrib.auth import logout
-from .models import ROLE_CHOICES  # ← AJOUTEZ CET IMPORT
+from .invitations import EmailDejaUtilise, InvitationInvalide, generer_invitations, utiliser_invitation
+from .journal import journal, journaliser
+from .models import (
+    ROLE_CHOICES, Aliment, Animal, Depense, Foyer, ListeCourses, Piece, StatutTache, Tache, Utilisateur,
+)
+from .permissions import Capacite, a_permission, permission_requise
+from .previsions import HORIZON_ACHAT, completer_liste, previsions_du_foyer
+from .provisionnement import MAX_MEMBRES_REQUETE, provisionner_membres
+from .reglements import reglement_du_foyer
+from .suppression import marquer_foyer_supprime, supprimer_utilisateur
+from .suppression import supprimer_foyer as supprimer_foyer_et_contenu
+
+MAX_INVITATIONS = 100
 
 
 # === CONNEXION PERSONNALISÉE ===
@@ -29,13 +60,13 @@ def custom_login(request):
 # === VUES PROTÉGÉES ===
 @login_required
 def liste_taches(request):
-    taches = Tache.objects.all()
+    taches = Tache.objects.select_related('id_piece', 'id_statut')
     return render(request, 'maison_app/liste_taches.html', {'taches': taches})
 
 @login_required
 def liste_foyers(request):
     if request.method == 'POST' and 'foyer_id' in request.POST:
-        if request.user.role != 'admin':
+        if not a_permission(request.user, Capacite.GERER_PIECES):
             messages.error(request, "Accès refusé.")
             return redirect('liste_foyers')
 
@@ -47,15 +78,20 @@ def liste_foyers(request):
         messages.success(request, f"Pièce '{nom_piece}' ajoutée !")
         return redirect('liste_foyers')
 
-    foyers = Foyer.objects.prefetch_related('pieces', 'animaux')  # ← AJOUTÉ prefetch_related
+    foyers = Foyer.objects.all()  # cartes en cache : les pièces ne sont comptées qu'au rendu d'une carte modifiée
     return render(request, 'maison_app/liste_foyers.html', {'foyers': foyers})
 
 @login_required
 def liste_utilisateurs(request):
-    utilisateurs = Utilisateur.objects.all()
-    return render(request, 'maison_app/liste_utilisateurs.html', {'utilisateurs': utilisateurs})
+    recherche = request.GET.get('q', '')
+    utilisateurs = annuaire(recherche).order_by('email')
+    return render(request, 'maison_app/liste_utilisateurs.html', {
+        'page': page_annuaire(utilisateurs, request.GET.get('page')),
+        'recherche': recherche,
+    })
 
 @login_required
+@permission_requise(Capacite.AJOUTER_TACHES, "Votre rôle ne permet pas d'ajouter une tâche.", 'liste_taches')
 def ajouter_tache(request):
     if request.method == 'POST':
         titre = request.POST['titre']
@@ -81,6 +117,7 @@ def ajouter_tache(request):
             id_animal=animal
         )
         tache.save()
+        journaliser('tache_creee', request.user, tache.id_foyer_id, tache, titre=titre)
         messages.success(request, "Tâche ajoutée avec succès !")
         return redirect('liste_taches')
 
@@ -94,11 +131,8 @@ def ajouter_tache(request):
     })
 
 @login_required
+@permission_requise(Capacite.GERER_FOYER)
 def creer_foyer(request):
-    if request.user.role != 'admin':
-        messages.error(request, "Accès refusé.")
-        return redirect('liste_foyers')
-
     if request.method == 'POST':
         nom = request.POST['nom']
         foyer = Foyer(nom=nom)
@@ -114,11 +148,8 @@ def creer_foyer(request):
     return render(request, 'maison_app/creer_foyer.html')
 
 @login_required
+@permission_requise(Capacite.GERER_PIECES, "Votre rôle ne permet pas d'ajouter une pièce.")
 def ajouter_piece(request):
-    if request.user.role != 'admin':
-        messages.error(request, "Seuls les administrateurs peuvent ajouter une pièce.")
-        return redirect('liste_foyers')
-
     if not request.user.id_foyer:
         messages.error(request, "Vous devez d'abord créer un foyer.")
         return redirect('creer_foyer')
@@ -133,11 +164,8 @@ def ajouter_piece(request):
     return render(request, 'maison_app/ajouter_piece.html')
 
 @login_required
+@permission_requise(Capacite.GERER_ANIMAUX, "Votre rôle ne permet pas d'ajouter un animal.")
 def ajouter_animal(request):
-    if request.user.role != 'admin':
-        messages.error(request, "Seuls les administrateurs peuvent ajouter un animal.")
-        return redirect('liste_foyers')
-
     if not request.user.id_foyer:
         messages.error(request, "Vous devez d'abord créer un foyer.")
         return redirect('creer_foyer')
@@ -162,52 +190,57 @@ def ajouter_animal(request):
     return render(request, 'maison_app/ajouter_animal.html', {'pieces': pieces})
 
 @login_required
+@permission_requise(Capacite.SUPPRIMER_TACHES, "Votre rôle ne permet pas de supprimer une tâche.", 'liste_taches')
 def supprimer_tache(request, tache_id):
     tache = get_object_or_404(Tache, id=tache_id, id_foyer=request.user.id_foyer)
 
-    if request.user.role != 'admin':
-        messages.error(request, "Seuls les administrateurs peuvent supprimer une tâche.")
-        return redirect('liste_taches')
-    
     if request.method == 'POST':
+        tache_id, titre = tache.id, tache.titre
         tache.delete()
+        journaliser('tache_supprimee', request.user, request.user.id_foyer_id, tache_id, titre=titre)
         messages.success(request, "Tâche supprimée avec succès !")
         return redirect('liste_taches')
     
     return render(request, 'maison_app/supprimer_tache.html', {'tache': tache})
 
 @login_required
+@permission_requise(Capacite.GERER_FOYER, "Votre rôle ne permet pas de supprimer un foyer.")
 def supprimer_foyer(request, foyer_id):
-    if request.user.role != 'admin':
-        messages.error(request, "Seuls les administrateurs peuvent supprimer un foyer.")
-        return redirect('liste_foyers')
-
     foyer = get_object_or_404(Foyer, id=foyer_id)
 
     if request.method == 'POST':
         nom = foyer.nom
-        foyer.delete()
+        if settings.SUPPRESSION_FOYER_ARRIERE_PLAN:
+            marquer_foyer_supprime(foyer.id)
+        else:
+            supprimer_foyer_et_contenu(foyer.id)
         messages.success(request, f"Foyer '{nom}' supprimé avec succès !")
         return redirect('liste_foyers')
 
     return render(request, 'maison_app/supprimer_foyer.html', {'foyer': foyer})
 
 @login_required
+@permission_requise(Capacite.INVITER, "Accès refusé. Votre rôle ne permet pas d'inviter.")
 def generer_invitation(request, foyer_id):
-    if request.user.role != 'admin':
-        messages.error(request, "Accès refusé. Seuls les administrateurs peuvent inviter.")
-        return redirect('liste_foyers')
-
     foyer = get_object_or_404(Foyer, id=foyer_id)
     if request.method == 'POST':
         role = request.POST.get('role', 'membre')
-        invitation = Invitation.objects.create(
-            foyer=foyer,
-            role=role,
-            cree_par=request.user
-        )
-        messages.success(request, f"Code d'invitation : <strong>{invitation.code}</strong>")
-        return redirect('liste_foyers')
+        try:
+            nombre = min(max(int(request.POST.get('nombre', 1)), 1), MAX_INVITATIONS)
+        except ValueError:
+            nombre = 1
+
+        invitations = generer_invitations(foyer, request.user, role, nombre)
+        if nombre == 1:
+            messages.success(request, f"Code d'invitation : <strong>{invitations[0].code}</strong>")
+            return redirect('liste_foyers')
+
+        messages.success(request, f"{nombre} codes d'invitation générés.")
+        return render(request, 'maison_app/generer_invitation.html', {
+            'foyer': foyer,
+            'ROLE_CHOICES': ROLE_CHOICES,
+            'invitations': invitations,
+        })
 
     # ← ENVOYEZ ROLE_CHOICES AU TEMPLATE
     return render(request, 'maison_app/generer_invitation.html', {
@@ -216,24 +249,27 @@ def generer_invitation(request, foyer_id):
     })
 
 @login_required
+@permission_requise(Capacite.VOIR_MEMBRES, "Accès refusé. Votre rôle ne permet pas de voir cette page.", 'liste_taches')
 def liste_utilisateurs_par_foyer(request):
-    if request.user.role != 'admin':
-        messages.error(request, "Accès refusé. Seuls les administrateurs peuvent voir cette page.")
-        return redirect('liste_taches')
-
-    foyers = Foyer.objects.all().prefetch_related('utilisateur_set')  # Charge les utilisateurs
-    return render(request, 'maison_app/liste_utilisateurs_par_foyer.html', {'foyers': foyers})
+    # Une page de membres triés par foyer, regroupés dans le template
+    recherche = request.GET.get('q', '')
+    utilisateurs = annuaire(recherche).filter(id_foyer__isnull=False).order_by('id_foyer__nom', 'id_foyer_id', 'email')
+    return render(request, 'maison_app/liste_utilisateurs_par_foyer.html', {
+        'page': page_annuaire(utilisateurs, request.GET.get('page')),
+        'recherche': recherche,
+    })
 
 @login_required
 def detail_foyer(request, foyer_id):
-    foyer = get_object_or_404(Foyer, id=foyer_id)
-    if foyer != request.user.id_foyer:
+    if foyer_id != request.user.id_foyer_id:
+        get_object_or_404(Foyer, id=foyer_id)
         messages.error(request, "Accès refusé.")
         return redirect('liste_foyers')
+    foyer = request.user.id_foyer  # déjà chargé avec l'utilisateur
 
     # === AJOUT DE PIÈCE (POST) ===
     if request.method == 'POST' and 'nom_piece' in request.POST:
-        if request.user.role != 'admin':
+        if not a_permission(request.user, Capacite.GERER_PIECES):
             messages.error(request, "Accès refusé.")
             return redirect('detail_foyer', foyer_id=foyer_id)
 
@@ -243,9 +279,27 @@ def detail_foyer(request, foyer_id):
         messages.success(request, f"Pièce '{nom}' ajoutée !")
         return redirect('detail_foyer', foyer_id=foyer_id)
 
-    # Charge les pièces et animaux
-    foyer = Foyer.objects.prefetch_related('pieces', 'animaux').get(id=foyer_id)
-    return render(request, 'maison_app/detail_foyer.html', {'foyer': foyer})
+    # Charge les pièces, animaux et membres
+    prefetch_related_objects([foyer], 'pieces', 'animaux__id_piece', 'utilisateur_set')
+    durees = foyer.durees_moyennes.select_related('id_piece').order_by('id_piece__nom')
+    return render(request, 'maison_app/detail_foyer.html', {'foyer': foyer, 'durees': durees})
+
+@login_required
+def statistiques_cache(request):
+    if not request.user.is_staff:
+        return JsonResponse({'erreur': "Accès refusé."}, status=403)
+    return JsonResponse({'fragments': caches['fragments'].statistiques(), 'journal': journal.statistiques()})
+
+
+def metriques(request):
+    # Collecteur Prometheus (IP autorisée) ou membre du staff connecté
+    if request.META.get('REMOTE_ADDR') not in settings.METRIQUES_IPS:
+        # Session et utilisateur lus seulement ici : une collecte autorisée ne coûte aucune requête SQL
+        if not (request.user.is_authenticated and request.user.is_staff):
+            return HttpResponse("Accès refusé.", status=403, content_type='text/plain')
+    return HttpResponse(registre.exposer(), content_type=TYPE_CONTENU)
+
+
 @login_required
 def custom_logout(request):
     logout(request)
@@ -253,21 +307,23 @@ def custom_logout(request):
     return redirect('/taches/')  # ou '/' si vous voulez la page d'accueil
 
 @login_required
+@permission_requise(Capacite.GERER_MEMBRES)
 def supprimer_membre(request, user_id):
-    if request.user.role != 'admin':
-        messages.error(request, "Accès refusé.")
-        return redirect('liste_foyers')
-
     membre = get_object_or_404(Utilisateur, id=user_id, id_foyer=request.user.id_foyer)
 
     if request.method == 'POST':
-        membre.delete()
+        supprimer_utilisateur(membre.id)
+        journaliser('membre_supprime', request.user, request.user.id_foyer_id, membre.id, email=membre.email)
         messages.success(request, f"Membre {membre.email} supprimé !")
         return redirect('detail_foyer', foyer_id=request.user.id_foyer.id)
 
     return render(request, 'maison_app/supprimer_membre.html', {'membre': membre})
 
 
+# Plusieurs backends configurés : login() sans authenticate() doit nommer le sien
+BACKEND_CONNEXION = 'maison_app.backends.UtilisateurFoyerBackend'
+
+
 def rejoindre_foyer(request):
     if request.method == 'POST':
         code = request.POST['code']
@@ -275,49 +331,67 @@ def rejoindre_foyer(request):
         email = request.POST['email']
 
         try:
-            invitation = Invitation.objects.get(code=code, utilise=False)
-            if invitation.est_valide():
-                # Vérifie si l'email existe déjà
-                if Utilisateur.objects.filter(email=email).exists():
-                    messages.error(request, "Cet email est déjà utilisé.")
-                    return render(request, 'maison_app/rejoindre.html')
-
-                # Crée l'utilisateur avec username = email
-                utilisateur = Utilisateur(
-                    username=email,  # ← AJOUTÉ
-                    email=email,
-                    nom=nom,
-                    role=invitation.role,
-                    id_foyer=invitation.foyer
-                )
-                utilisateur.set_password('temporary123')  # Mot de passe temporaire
-                utilisateur.save()
-
-                invitation.utilise = True
-                invitation.save()
-
-                messages.success(request, f"Bienvenue {nom} dans le foyer {invitation.foyer.nom} !")
-                login(request, utilisateur)  # Connexion automatique
-                return redirect('liste_taches')
-            else:
-                messages.error(request, "Code expiré ou déjà utilisé.")
-        except Invitation.DoesNotExist:
-            messages.error(request, "Code invalide.")
-    
+            utilisateur, invitation = utiliser_invitation(code, email, nom)
+        except (InvitationInvalide, EmailDejaUtilise) as exc:
+            messages.error(request, str(exc))
+        else:
+            journaliser('invitation_utilisee', utilisateur, invitation.foyer_id, invitation.id, role=invitation.role)
+            messages.success(request, f"Bienvenue {nom} dans le foyer {invitation.foyer.nom} !")
+            login(request, utilisateur, backend=BACKEND_CONNEXION)  # Connexion automatique
+            return redirect('liste_taches')
+
     return render(request, 'maison_app/rejoindre.html')
 
 @login_required
+@permission_requise(Capacite.TERMINER_TACHES, "Votre rôle ne permet pas de démarrer une tâche.", 'liste_taches')
+def demarrer_tache(request, tache_id):
+    if request.user.id_foyer_id is None:
+        messages.error(request, "Vous devez d'abord rejoindre un foyer.")
+        return redirect('liste_foyers')
+    tache = get_object_or_404(Tache, id=tache_id, id_foyer_id=request.user.id_foyer_id)
+    if demarrer(tache):
+        messages.success(request, "Tâche démarrée !")
+    else:
+        messages.error(request, "Tâche déjà démarrée ou terminée.")
+    return redirect('detail_foyer', foyer_id=tache.id_foyer_id)
+
+@login_required
+@permission_requise(Capacite.TERMINER_TACHES, "Votre rôle ne permet pas de terminer une tâche.", 'liste_taches')
 def terminer_tache(request, tache_id):
-    tache = get_object_or_404(Tache, id=tache_id, id_foyer=request.user.id_foyer)
-    if tache.terminee:
+    foyer_id = request.user.id_foyer_id
+    if foyer_id is None:
+        # Sans foyer, aucun filtre ne s'appliquerait : on refuse avant toute écriture
+        messages.error(request, "Vous devez d'abord rejoindre un foyer.")
+        return redirect('liste_foyers')
+    historiques = terminer_taches([tache_id], request.user, foyer_id=foyer_id)
+    if not historiques:
+        get_object_or_404(Tache, id=tache_id, id_foyer_id=foyer_id)
         messages.error(request, "Tâche déjà terminée.")
-        return redirect('detail_foyer', foyer_id=tache.id_foyer.id)
+        return redirect('detail_foyer', foyer_id=foyer_id)
 
-    tache.terminee = True
-    tache.complete_par = request.user
-    tache.save()
+    duree = historiques[0].duree
+    journaliser('tache_terminee', request.user, foyer_id, tache_id, duree=duree.total_seconds() if duree else None)
     messages.success(request, "Tâche terminée !")
-    return redirect('detail_foyer', foyer_id=tache.id_foyer.id)
+    return redirect('detail_foyer', foyer_id=foyer_id)
+
+@login_required
+@require_POST
+@permission_requise(Capacite.TERMINER_TACHES, "Votre rôle ne permet pas de terminer une tâche.", 'liste_taches')
+def terminer_taches_selection(request):
+    if request.user.id_foyer_id is None:
+        messages.error(request, "Vous devez d'abord rejoindre un foyer.")
+        return redirect('liste_foyers')
+    ids = {int(pk) for pk in request.POST.getlist('taches') if pk.isdigit()}
+    historiques = terminer_taches(ids, request.user, foyer_id=request.user.id_foyer_id)
+    for historique in historiques:
+        journaliser('tache_terminee', request.user, request.user.id_foyer_id, historique.id_tache_id,
+                    duree=historique.duree.total_seconds() if historique.duree else None)
+
+    if historiques:
+        messages.success(request, f"{len(historiques)} tâche(s) terminée(s) !")
+    if len(historiques) < len(ids):
+        messages.warning(request, f"{len(ids) - len(historiques)} tâche(s) déjà terminée(s) ou introuvable(s).")
+    return redirect('liste_taches')
 # === INSCRIPTION (NOUVELLE PAGE) ===
 def inscription(request):
     if request.method == 'POST':
@@ -341,8 +415,316 @@ def inscription(request):
             password=password,
             role='membre'
         )
-        login(request, user)
+        login(request, user, backend=BACKEND_CONNEXION)
         messages.success(request, f"Bienvenue {nom} ! Votre compte est créé.")
         return redirect('liste_taches')
 
-    return render(request, 'registration/inscription.html')
\ No newline at end of file
+    return render(request, 'registration/inscription.html')
+
+# === CALENDRIER ===
+def _fenetre_calendrier(request):
+    """Fenêtre demandée : ?debut=&fin= (ISO) ou ?annee=&mois=, sinon le mois courant."""
+    try:
+        if 'debut' in request.GET and 'fin' in request.GET:
+            debut = date.fromisoformat(request.GET['debut'])
+            fin = date.fromisoformat(request.GET['fin'])
+        else:
+            aujourd_hui = timezone.localdate()
+            annee = int(request.GET.get('annee', aujourd_hui.year))
+            mois = int(request.GET.get('mois', aujourd_hui.month))
+            debut, fin = bornes_du_mois(annee, mois)
+    except ValueError:
+        return None
+    if fin < debut or (fin - debut).days > 366:
+        return None
+    return debut, fin
+
+@login_required
+def calendrier(request):
+    if not request.user.id_foyer_id:
+        messages.error(request, "Vous devez d'abord rejoindre un foyer.")
+        return redirect('liste_foyers')
+
+    fenetre = _fenetre_calendrier(request)
+    if fenetre is None:
+        messages.error(request, "Période invalide.")
+        fenetre = bornes_du_mois(timezone.localdate().year, timezone.localdate().month)
+    debut, fin = fenetre
+    return render(request, 'maison_app/calendrier.html', {
+        'debut': debut,
+        'fin': fin,
+        'entrees': entrees_fenetre(request.user.id_foyer_id, debut, fin),
+    })
+
+@login_required
+def calendrier_api(request):
+    if not request.user.id_foyer_id:
+        return JsonResponse({'erreur': "Aucun foyer."}, status=400)
+
+    fenetre = _fenetre_calendrier(request)
+    if fenetre is None:
+        return JsonResponse({'erreur': "Période invalide."}, status=400)
+    debut, fin = fenetre
+    return JsonResponse({
+        'debut': debut.isoformat(),
+        'fin': fin.isoformat(),
+        'entrees': [entree.as_dict() for entree in entrees_fenetre(request.user.id_foyer_id, debut, fin)],
+    })
+
+
+# === LISTES DE COURSES ===
+@login_required
+def listes_courses(request):
+    if not request.user.id_foyer_id:
+        messages.error(request, "Vous devez d'abord rejoindre un foyer.")
+        return redirect('liste_foyers')
+
+    if request.method == 'POST':
+        if not a_permission(request.user, Capacite.GERER_COURSES):
+            messages.error(request, "Votre rôle ne permet pas de modifier les courses.")
+            return redirect('listes_courses')
+
+        nom = request.POST['nom']
+        liste = ListeCourses.objects.create(nom=nom, id_foyer_id=request.user.id_foyer_id)
+        messages.success(request, f"Liste '{nom}' créée !")
+        return redirect('detail_liste_courses', liste_id=liste.id)
+
+    listes = (
+        ListeCourses.objects
+        .filter(id_foyer_id=request.user.id_foyer_id)
+        .annotate(nb_aliments=Count('aliment'))
+        .order_by('-date_creation')
+    )
+    return render(request, 'maison_app/listes_courses.html', {'listes': listes})
+
+def _lignes_formulaire(post):
+    """Lit les lignes du formulaire : champs parallèles id / nom / quantite / unite."""
+    ajouts, modifications = [], []
+    for pk, nom, quantite, unite in zip(
+        post.getlist('id'), post.getlist('nom'), post.getlist('quantite'), post.getlist('unite')
+    ):
+        ligne = {'nom': nom, 'quantite': quantite, 'unite': unite}
+        if pk:
+            modifications.append(dict(ligne, id=pk))
+        elif nom.strip():
+            ajouts.append(ligne)
+    return ajouts, modifications
+
+@login_required
+def detail_liste_courses(request, liste_id):
+    if request.user.id_foyer_id is None:
+        messages.error(request, "Vous devez d'abord rejoindre un foyer.")
+        return redirect('liste_foyers')
+    liste = get_object_or_404(ListeCourses, id=liste_id, id_foyer_id=request.user.id_foyer_id)
+
+    if request.method == 'POST':
+        if not a_permission(request.user, Capacite.GERER_COURSES):
+            messages.error(request, "Votre rôle ne permet pas de modifier les courses.")
+            return redirect('detail_liste_courses', liste_id=liste.id)
+        if liste.statut != 'En cours':
+            messages.error(request, "Cette liste est déjà clôturée.")
+            return redirect('detail_liste_courses', liste_id=liste.id)
+
+        ajouts, modifications = _lignes_formulaire(request.POST)
+        try:
+            bilan = enregistrer_lignes(liste, ajouts, modifications, request.POST.getlist('supprimer'))
+        except ValueError as exc:
+            messages.error(request, str(exc))
+        else:
+            messages.success(
+                request,
+                f"{bilan['ajoutes']} ajouté(s), {bilan['modifies']} modifié(s), {bilan['supprimes']} supprimé(s).",
+            )
+        return redirect('detail_liste_courses', liste_id=liste.id)
+
+    aliments = Aliment.objects.filter(id_liste=liste).order_by('archive', 'nom')
+    return render(request, 'maison_app/detail_liste_courses.html', {
+        'liste': liste,
+        'aliments': aliments,
+        'lignes_vides': range(3),
+    })
+
+@login_required
+@require_POST
+def liste_courses_api(request, liste_id):
+    if not a_permission(request.user, Capacite.GERER_COURSES):
+        return JsonResponse({'erreur': "Accès refusé."}, status=403)
+    if request.user.id_foyer_id is None:
+        return JsonResponse({'erreur': "Vous devez d'abord rejoindre un foyer."}, status=403)
+    liste = get_object_or_404(ListeCourses, id=liste_id, id_foyer_id=request.user.id_foyer_id)
+    if liste.statut != 'En cours':
+        return JsonResponse({'erreur': "Liste déjà clôturée."}, status=409)
+
+    try:
+        donnees = json.loads(request.body)
+        bilan = enregistrer_lignes(
+            liste,
+            donnees.get('ajouter', []),
+            donnees.get('modifier', []),
+            donnees.get('supprimer', []),
+        )
+    except (ValueError, KeyError, TypeError, AttributeError) as exc:
+        return JsonResponse({'erreur': str(exc) or "Requête invalide."}, status=400)
+
+    aliments = Aliment.objects.filter(id_liste=liste, archive=False).order_by('nom')
+    return JsonResponse(dict(bilan, aliments=list(aliments.values('id', 'nom', 'quantite', 'unite'))))
+
+@login_required
+@require_POST
+@permission_requise(Capacite.GERER_COURSES, "Votre rôle ne permet pas de modifier les courses.", 'listes_courses')
+def completer_liste_courses(request, liste_id):
+    if request.user.id_foyer_id is None:
+        messages.error(request, "Vous devez d'abord rejoindre un foyer.")
+        return redirect('liste_foyers')
+    liste = get_object_or_404(ListeCourses, id=liste_id, id_foyer_id=request.user.id_foyer_id, statut='En cours')
+    ajoutes = completer_liste(liste)
+    messages.success(request, f"{ajoutes} article(s) bientôt épuisé(s) ajouté(s).")
+    return redirect('detail_liste_courses', liste_id=liste.id)
+
+@login_required
+@require_POST
+@permission_requise(Capacite.GERER_COURSES, "Votre rôle ne permet pas de modifier les courses.", 'listes_courses')
+def liste_courses_achetee(request, liste_id):
+    if request.user.id_foyer_id is None:
+        messages.error(request, "Vous devez d'abord rejoindre un foyer.")
+        return redirect('liste_foyers')
+    liste = get_object_or_404(ListeCourses, id=liste_id, id_foyer_id=request.user.id_foyer_id)
+    if marquer_achetee(liste):
+        messages.success(request, f"Liste '{liste.nom}' marquée comme achetée !")
+    else:
+        messages.error(request, "Cette liste est déjà clôturée.")
+    return redirect('listes_courses')
+
+
+# === PROVISIONNEMENT EN MASSE ===
+@login_required
+@require_POST
+def provisionner_membres_foyer(request, foyer_id):
+    """Import de membres : fichier CSV (email, nom, mot_de_passe) ou JSON {"role": ..., "membres": [...]}."""
+    if not a_permission(request.user, Capacite.GERER_MEMBRES):
+        return JsonResponse({'erreur': "Accès refusé."}, status=403)
+    if foyer_id != request.user.id_foyer_id:
+        return JsonResponse({'erreur': "Foyer introuvable."}, status=404)
+
+    try:
+        if 'fichier' in request.FILES:
+            role = request.POST.get('role', 'membre')
+            membres = list(csv.DictReader(io.TextIOWrapper(request.FILES['fichier'], encoding='utf-8')))
+        else:
+            donnees = json.loads(request.body)
+            if not isinstance(donnees, dict):
+                raise ValueError
+            role = donnees.get('role', 'membre')
+            membres = donnees['membres']
+    except (ValueError, KeyError, UnicodeDecodeError):
+        return JsonResponse({'erreur': "Requête invalide."}, status=400)
+    if not isinstance(membres, list) or not all(isinstance(membre, dict) for membre in membres):
+        return JsonResponse({'erreur': "« membres » doit être une liste d'objets."}, status=400)
+    if not isinstance(role, str) or not all(
+        isinstance(membre.get(champ), (str, type(None))) for membre in membres for champ in ('email', 'nom', 'mot_de_passe')
+    ):
+        return JsonResponse({'erreur': "Requête invalide."}, status=400)
+    if role not in dict(ROLE_CHOICES):
+        return JsonResponse({'erreur': "Rôle inconnu."}, status=400)
+    if len(membres) > MAX_MEMBRES_REQUETE:
+        # Le hachage se fait dans la requête : les gros imports passent par la commande
+        return JsonResponse(
+            {'erreur': f"{MAX_MEMBRES_REQUETE} membres maximum par import (au-delà : manage.py provisionner_membres)."},
+            status=400,
+        )
+
+    bilan = provisionner_membres(membres, request.user.id_foyer, role)
+    return JsonResponse(bilan, status=201)
+
+# === DÉPENSES ET RÈGLEMENTS ===
+@login_required
+@permission_requise(Capacite.VOIR_BUDGET, "Votre rôle ne permet pas de voir les dépenses.", 'liste_taches')
+def depenses(request):
+    foyer_id = request.user.id_foyer_id
+    if foyer_id is None:
+        messages.error(request, "Rejoignez un foyer pour suivre ses dépenses.")
+        return redirect('liste_foyers')
+
+    if request.method == 'POST':
+        if not a_permission(request.user, Capacite.GERER_BUDGET):
+            messages.error(request, "Votre rôle ne permet pas d'ajouter une dépense.")
+            return redirect('depenses')
+        try:
+            montant = lire_quantite(request.POST.get('montant'))
+        except ValueError:
+            messages.error(request, "Montant invalide.")
+            return redirect('depenses')
+        try:
+            payeur_id = int(request.POST.get('payeur') or request.user.id)
+        except ValueError:
+            payeur_id = None
+        try:
+            # parse_date : None si le format est faux, ValueError si la date n'existe pas (ex. 30 février)
+            date_depense = parse_date(request.POST['date_depense']) if request.POST.get('date_depense') else timezone.localdate()
+        except ValueError:
+            date_depense = None
+        if (montant is None or montant <= 0 or payeur_id is None or date_depense is None
+                or not Utilisateur.objects.filter(id=payeur_id, id_foyer_id=foyer_id).exists()):
+            messages.error(request, "Dépense invalide.")
+            return redirect('depenses')
+        Depense.objects.create(
+            description=request.POST.get('description', '').strip()[:100] or "Dépense",
+            montant=montant,
+            date_depense=date_depense,
+            id_foyer_id=foyer_id,
+            id_user_id=payeur_id,
+        )
+        messages.success(request, "Dépense ajoutée !")
+        return redirect('depenses')
+
+    reglement = reglement_du_foyer(foyer_id)
+    noms = {
+        utilisateur.id: str(utilisateur)
+        for utilisateur in Utilisateur.objects.filter(id__in=reglement['soldes']).only('nom', 'email')
+    }
+    membres = Utilisateur.objects.filter(id_foyer_id=foyer_id).only('nom', 'email').order_by('email')
+    return render(request, 'maison_app/depenses.html', {
+        'total': reglement['total'],
+        'soldes': sorted(((noms.get(i, '—'), solde) for i, solde in reglement['soldes'].items()), key=lambda s: s[1]),
+        'virements': [(noms.get(v.debiteur_id, '—'), noms.get(v.creancier_id, '—'), v.montant) for v in reglement['virements']],
+        'dernieres': Depense.objects.filter(id_foyer_id=foyer_id).select_related('id_user').order_by('-date_depense', '-id')[:20],
+        'membres': membres,
+    })
+
+# === INVENTAIRE ===
+@login_required
+def inventaire(request):
+    if not request.user.id_foyer_id:
+        messages.error(request, "Vous devez d'abord rejoindre un foyer.")
+        return redirect('liste_foyers')
+    # Prévisions précalculées par `manage.py calculer_previsions`
+    return render(request, 'maison_app/inventaire.html', {
+        'articles': previsions_du_foyer(request.user.id_foyer_id),
+        'limite': timezone.localdate() + timedelta(days=HORIZON_ACHAT),
+    })
+
+# === PROFILS (STAFF) ===
+@login_required
+def profils(request):
+    if not request.user.is_staff:
+        messages.error(request, "Accès réservé à l'équipe technique.")
+        return redirect('liste_taches')
+    return render(request, 'maison_app/profils.html', {
+        'profils': lister_profils(),
+        'jeton': generer_jeton(),
+    })
+
+@login_required
+def detail_profil(request, nom):
+    if not request.user.is_staff:
+        messages.error(request, "Accès réservé à l'équipe technique.")
+        return redirect('liste_taches')
+    profil = lire_profil(nom)
+    if profil is None:
+        raise Http404("Profil introuvable.")
+    if 'telecharger' in request.GET and profil['mode'] == 'cprofile':
+        fichier = Path(settings.PROFILAGE_DOSSIER) / f'{nom}.prof'
+        if not fichier.is_file():  # élagué entre-temps
+            raise Http404("Profil introuvable.")
+        return FileResponse(fichier.open('rb'), as_attachment=True)
+    return render(request, 'maison_app/profil.html', {'profil': profil})
@@ -0,0 +1,11 @@
+from django.contrib import admin
+
+from .models import Travail
+
+
+@admin.register(Travail)
+class TravailAdmin(admin.ModelAdmin):
+    list_display = ('id', 'fonction', 'statut', 'tentatives', 'executer_apres', 'battement', 'date_fin')
+    list_filter = ('statut',)
+    search_fields = ('fonction',)
+    show_full_result_count = False
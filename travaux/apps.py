@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+class TravauxConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'travaux'
+    verbose_name = "Travaux en arrière-plan"
@@ -0,0 +1,148 @@
+# travaux/file.py
+import logging
+import os
+import random
+import socket
+import traceback
+import uuid
+from datetime import timedelta
+
+from django.db import close_old_connections, connections, router, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import ECHEC, EN_ATTENTE, EN_COURS, REUSSI, Travail
+
+logger = logging.getLogger(__name__)
+
+DELAI_BASE = 10           # secondes avant la 1re nouvelle tentative, doublé ensuite
+DELAI_MAX = 60 * 60
+INTERVALLE_BATTEMENT = 30  # secondes entre deux signes de vie d'un travailleur sur ses travaux
+BATTEMENT_PERDU = 5 * 60   # un travail « en cours » sans signe de vie depuis plus longtemps est abandonné
+CONSERVATION_JOURS = 7    # travaux terminés gardés pour consultation
+
+
+# === MISE EN FILE ===
+def chemin_fonction(fonction):
+    if isinstance(fonction, str):
+        return fonction
+    return f'{fonction.__module__}.{fonction.__qualname__}'
+
+
+def mettre_en_file(fonction, *args, delai=0, max_tentatives=3, **kwargs):
+    """
+    Enregistre l'appel `fonction(*args, **kwargs)` pour un travailleur (`manage.py worker`).
+    Écrit dans la transaction courante : annulée avec elle, visible après son commit.
+    Les arguments doivent être sérialisables en JSON (identifiants plutôt qu'objets).
+    """
+    return Travail.objects.create(
+        fonction=chemin_fonction(fonction),
+        arguments=list(args),
+        arguments_nommes=kwargs,
+        max_tentatives=max_tentatives,
+        executer_apres=timezone.now() + timedelta(seconds=delai),
+    )
+
+
+# === RÉSERVATION ===
+def identifiant_travailleur():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def reserver(nombre, travailleur=None):
+    """
+    Réserve jusqu'à `nombre` travaux échus et renvoie leurs ids.
+    PostgreSQL / MySQL : SELECT ... FOR UPDATE SKIP LOCKED, les travailleurs concurrents
+    se partagent la file sans s'attendre. SQLite (une seule écriture à la fois) :
+    UPDATE conditionnel sur statut, les gagnants sont relus par leur verrou.
+    """
+    if nombre <= 0:
+        return []
+    maintenant = timezone.now()
+    verrou = f'{travailleur or identifiant_travailleur()}/{uuid.uuid4().hex[:12]}'
+    dus = Travail.objects.filter(statut=EN_ATTENTE, executer_apres__lte=maintenant).order_by('executer_apres', 'id')
+    reservation = dict(
+        statut=EN_COURS, verrou=verrou, date_debut=maintenant, battement=maintenant, tentatives=F('tentatives') + 1,
+    )
+
+    alias = router.db_for_write(Travail)
+    with transaction.atomic(using=alias):
+        if connections[alias].features.has_select_for_update_skip_locked:
+            ids = list(dus.select_for_update(skip_locked=True).values_list('id', flat=True)[:nombre])
+            Travail.objects.filter(id__in=ids).update(**reservation)
+            return ids
+        candidats = list(dus.values_list('id', flat=True)[:nombre])
+        Travail.objects.filter(id__in=candidats, statut=EN_ATTENTE).update(**reservation)
+        return list(Travail.objects.filter(verrou=verrou, statut=EN_COURS).values_list('id', flat=True))
+
+
+# === EXÉCUTION ===
+def delai_nouvelle_tentative(tentatives):
+    # Attente exponentielle, avec gigue pour ne pas relancer tous les échecs au même instant
+    return min(DELAI_BASE * 2 ** (tentatives - 1), DELAI_MAX) * random.uniform(0.5, 1.5)
+
+
+def _terminer(travail_id, **valeurs):
+    Travail.objects.filter(id=travail_id, statut=EN_COURS).update(date_fin=timezone.now(), **valeurs)
+
+
+def executer_travail(travail_id):
+    """Exécute un travail réservé (dans un thread ou un processus du travailleur) et enregistre son issue."""
+    close_old_connections()
+    try:
+        travail = Travail.objects.get(id=travail_id)
+        try:
+            resultat = import_string(travail.fonction)(*travail.arguments, **travail.arguments_nommes)
+        except Exception:
+            erreur = traceback.format_exc()
+            logger.warning("Travail %s (%s) en échec, tentative %s/%s",
+                           travail.id, travail.fonction, travail.tentatives, travail.max_tentatives)
+            if travail.tentatives < travail.max_tentatives:
+                Travail.objects.filter(id=travail.id, statut=EN_COURS).update(
+                    statut=EN_ATTENTE,
+                    erreur=erreur,
+                    executer_apres=timezone.now() + timedelta(seconds=delai_nouvelle_tentative(travail.tentatives)),
+                )
+            else:
+                _terminer(travail.id, statut=ECHEC, erreur=erreur)
+            return ECHEC
+
+        try:
+            _terminer(travail.id, statut=REUSSI, resultat=resultat, erreur='')
+        except TypeError:
+            # Résultat non sérialisable en JSON : on garde sa représentation
+            _terminer(travail.id, statut=REUSSI, resultat=repr(resultat), erreur='')
+        return REUSSI
+    finally:
+        close_old_connections()
+
+
+# === ENTRETIEN ===
+def battre(travail_ids):
+    """Signe de vie du travailleur sur les travaux qu'il exécute encore (un long travail n'est pas relancé)."""
+    if not travail_ids:
+        return 0
+    return Travail.objects.filter(id__in=travail_ids, statut=EN_COURS).update(battement=timezone.now())
+
+
+def liberer_travaux_bloques(silence_max=BATTEMENT_PERDU):
+    """
+    Remet en file les travaux dont le travailleur ne donne plus signe de vie (arrêté en
+    cours de route), ou les clôt s'ils ont épuisé leurs tentatives. Un travail long dont
+    le travailleur bat encore n'est pas touché, quelle que soit sa durée.
+    """
+    limite = timezone.now() - timedelta(seconds=silence_max)
+    bloques = Travail.objects.filter(
+        Q(battement__lt=limite) | Q(battement__isnull=True, date_debut__lt=limite),  # réservés avant la colonne
+        statut=EN_COURS,
+    )
+    abandonnes = bloques.filter(tentatives__gte=F('max_tentatives')).update(
+        statut=ECHEC, erreur="Abandonné : travailleur arrêté pendant l'exécution.", date_fin=timezone.now(),
+    )
+    return abandonnes + bloques.update(statut=EN_ATTENTE, executer_apres=timezone.now())
+
+
+def purger_travaux_termines(jours=CONSERVATION_JOURS):
+    limite = timezone.now() - timedelta(days=jours)
+    return Travail.objects.filter(Q(statut=REUSSI) | Q(statut=ECHEC), date_fin__lt=limite).delete()[0]
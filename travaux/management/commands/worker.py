@@ -0,0 +1,27 @@
+import threading
+
+from django.core.management.base import BaseCommand
+
+from travaux.travailleur import Travailleur
+
+
+class Command(BaseCommand):
+    help = "Exécute les travaux en arrière-plan (file en base, voir travaux.file.mettre_en_file)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrence', type=int, default=4, help="Travaux exécutés en parallèle.")
+        parser.add_argument('--mode', choices=['threads', 'processus'], default='threads')
+        parser.add_argument('--intervalle', type=float, default=1.0, help="Secondes entre deux scrutations de la file.")
+        parser.add_argument('--une-fois', action='store_true', help="Vide la file échue puis s'arrête.")
+
+    def handle(self, *args, **options):
+        travailleur = Travailleur(options['concurrence'], options['mode'], options['intervalle'])
+        arret = threading.Event()
+        if not options['une_fois']:
+            self.stdout.write(f"Travailleur {travailleur.identifiant} démarré (Ctrl+C pour arrêter).")
+        try:
+            total = travailleur.tourner(arret, une_fois=options['une_fois'])
+        except KeyboardInterrupt:
+            arret.set()
+            total = travailleur.traites
+        self.stdout.write(self.style.SUCCESS(f"{total} travail(aux) traité(s)."))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('travaux', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='travail',
+            name='battement',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,39 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+EN_ATTENTE, EN_COURS, REUSSI, ECHEC = 'en_attente', 'en_cours', 'reussi', 'echec'
+
+
+# === TRAVAIL ===
+class Travail(models.Model):
+    fonction = models.CharField(max_length=200)  # chemin pointé, ex. 'maison_app.suppression.supprimer_foyer'
+    arguments = models.JSONField(default=list, encoder=DjangoJSONEncoder)
+    arguments_nommes = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    statut = models.CharField(max_length=20, default=EN_ATTENTE, choices=[
+        (EN_ATTENTE, 'En attente'),
+        (EN_COURS, 'En cours'),
+        (REUSSI, 'Réussi'),
+        (ECHEC, 'Échec'),
+    ])
+    tentatives = models.PositiveIntegerField(default=0)
+    max_tentatives = models.PositiveIntegerField(default=3)
+    executer_apres = models.DateTimeField(default=timezone.now)
+    verrou = models.CharField(max_length=100, blank=True)  # travailleur qui l'a réservé
+    resultat = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    erreur = models.TextField(blank=True)
+    date_creation = models.DateTimeField(auto_now_add=True)
+    date_debut = models.DateTimeField(null=True, blank=True)
+    date_fin = models.DateTimeField(null=True, blank=True)
+    battement = models.DateTimeField(null=True, blank=True)  # avancé par le travailleur tant qu'il l'exécute
+
+    class Meta:
+        db_table = 'travail'
+        indexes = [
+            # Réservation : seuls les travaux en attente sont parcourus, par échéance
+            models.Index(fields=['executer_apres'], condition=models.Q(statut=EN_ATTENTE), name='travail_attente_idx'),
+            models.Index(fields=['statut', 'date_debut'], name='travail_statut_debut_idx'),
+        ]
+
+    def __str__(self):
+        return f"#{self.id} {self.fonction} ({self.statut})"
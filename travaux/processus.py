@@ -0,0 +1,15 @@
+# travaux/processus.py
+# Points d'entrée des processus du pool (mode « spawn ») : aucun import de modèle au
+# chargement du module, Django doit d'abord être configuré par initialiser().
+
+
+def initialiser():
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+
+
+def executer(travail_id):
+    from .file import executer_travail
+    return executer_travail(travail_id)
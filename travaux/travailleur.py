@@ -0,0 +1,81 @@
+# travaux/travailleur.py
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from django.db import connections
+
+from . import processus
+from .file import (
+    INTERVALLE_BATTEMENT, battre, executer_travail, identifiant_travailleur, liberer_travaux_bloques,
+    purger_travaux_termines, reserver,
+)
+
+logger = logging.getLogger(__name__)
+
+INTERVALLE_ENTRETIEN = 60  # secondes entre deux libérations / purges
+
+
+class Travailleur:
+    """
+    Réserve des travaux par lots et les exécute dans un pool de threads
+    (travaux surtout en base ou en E/S) ou de processus (travaux liés au CPU).
+    """
+
+    def __init__(self, concurrence=4, mode='threads', intervalle=1.0):
+        self.concurrence = concurrence
+        self.mode = mode
+        self.intervalle = intervalle
+        self.identifiant = identifiant_travailleur()
+        self.traites = 0
+
+    def _pool(self):
+        if self.mode == 'processus':
+            # « spawn » : aucun processus n'hérite de la connexion base du parent
+            return ProcessPoolExecutor(
+                max_workers=self.concurrence,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=processus.initialiser,
+            )
+        return ThreadPoolExecutor(max_workers=self.concurrence, thread_name_prefix='travail')
+
+    def _entretenir(self):
+        liberes = liberer_travaux_bloques()
+        purges = purger_travaux_termines()
+        if liberes or purges:
+            logger.info("%s travail(aux) remis en file, %s purgé(s)", liberes, purges)
+
+    def tourner(self, arret=None, une_fois=False):
+        """Boucle jusqu'à `arret` ; `une_fois` : s'arrête dès que la file échue est vide."""
+        arret = arret or threading.Event()
+        prochain_entretien = prochain_battement = 0
+        en_cours = {}  # future -> id du travail
+        with self._pool() as pool:
+            while not arret.is_set():
+                if time.monotonic() >= prochain_entretien:
+                    self._entretenir()
+                    prochain_entretien = time.monotonic() + INTERVALLE_ENTRETIEN
+
+                executer = processus.executer if self.mode == 'processus' else executer_travail
+                for travail_id in reserver(self.concurrence - len(en_cours), self.identifiant):
+                    en_cours[pool.submit(executer, travail_id)] = travail_id
+                if time.monotonic() >= prochain_battement:
+                    battre(list(en_cours.values()))
+                    prochain_battement = time.monotonic() + INTERVALLE_BATTEMENT
+
+                if not en_cours:
+                    if une_fois:
+                        break
+                    arret.wait(self.intervalle)
+                    continue
+                termines, _ = wait(en_cours, timeout=self.intervalle, return_when=FIRST_COMPLETED)
+                for future in termines:
+                    del en_cours[future]
+                    if future.exception():
+                        logger.error("Travail interrompu : %s", future.exception())
+                self.traites += len(termines)
+            # Sortie : les travaux déjà lancés se terminent (with pool), la connexion du thread principal est rendue
+        connections.close_all()
+        return self.traites